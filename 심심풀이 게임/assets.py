@@ -0,0 +1,152 @@
+import pygame
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 에셋 레지스트리 ---
+# 각 (파일, 크기) 조합은 디스크에서 한 번만 읽고 변환/스케일한 뒤, 같은 Surface를 모든 스프라이트가 공유합니다.
+# 공유 Surface는 읽기 전용으로 취급해야 합니다. (직접 그리기가 필요하면 copy() 후 사용)
+# preload()로 파일 디코딩을 워커 스레드에서 미리 시작해 둘 수 있고, 실제로 필요할 때 결과를 받아 메인 스레드에서 변환합니다.
+# 없는 파일은 예외 대신 존재 확인으로 걸러내고, 경고는 모아서 한 번에 출력합니다.
+SOUND_EXTENSIONS = ('.wav', '.ogg')
+
+class AssetManager:
+    def __init__(self, folder=IMAGE_FOLDER):
+        self.folder = folder
+        self.sources = {} # 파일명 -> 디코딩된 원본 Surface 또는 Sound (없는 파일은 None)
+        self.futures = {} # 파일명 -> 워커 스레드에서 디코딩 중인 작업
+        self.executor = None
+        self.missing = [] # 없거나 읽지 못한 파일 (Fallback 사용)
+        self.timings = {} # 파일명 -> {'decode_ms', 'wait_ms', 'convert_ms', 'scale_ms'} (시작 시간 분석용)
+        self.images = {} # (파일명, 크기) -> 스케일된 Surface
+        self.fallbacks = {} # 임의의 키 -> 코드로 생성한 Fallback Surface
+        self.disk_reads, self.cache_hits, self.fallback_builds = 0, 0, 0 # 카운터
+        self.startup_disk_reads = None # mark_startup_complete() 시점의 disk_reads
+        self.version = 0 # 새 이미지/Fallback이 생길 때마다 증가 (텍스처 아틀라스 동기화용)
+
+    def _convert(self, surf):
+        # 디스플레이가 없으면(헤드리스 등) convert_alpha를 할 수 없으므로 원본을 그대로 사용
+        return surf.convert_alpha() if pygame.display.get_surface() is not None else surf
+
+    def _path(self, filename): return os.path.join(self.folder, filename)
+
+    def _timing(self, filename, key, start):
+        timing = self.timings.setdefault(filename, {})
+        timing[key] = timing.get(key, 0.0) + (time.perf_counter() - start) * 1000
+
+    # 파일 디코딩 (워커 스레드에서도 실행됨). 디스플레이 형식 변환은 하지 않습니다.
+    def _decode(self, filename):
+        start = time.perf_counter()
+        try: data = pygame.mixer.Sound(self._path(filename)) if filename.endswith(SOUND_EXTENSIONS) else pygame.image.load(self._path(filename))
+        except pygame.error: data = None # 손상된 파일 등
+        self._timing(filename, 'decode_ms', start)
+        return data
+
+    def _mark_missing(self, filename):
+        self.sources[filename] = None # 없는 파일도 기록해 두어 다시 디스크를 찾지 않음
+        if filename not in self.missing: self.missing.append(filename)
+        return None
+
+    # 파일들의 디코딩을 워커 스레드에서 시작합니다. (결과는 _load_source에서 필요할 때 받음)
+    def preload(self, filenames):
+        for filename in filenames:
+            if filename in self.sources or filename in self.futures: continue
+            if not os.path.isfile(self._path(filename)): self._mark_missing(filename); continue
+            if self.executor is None: self.executor = ThreadPoolExecutor(max_workers=ASSET_WORKERS, thread_name_prefix='assets')
+            self.disk_reads += 1
+            self.futures[filename] = self.executor.submit(self._decode, filename)
+
+    def _load_source(self, filename):
+        if filename in self.sources: return self.sources[filename]
+        future = self.futures.pop(filename, None)
+        if future is not None: # 미리 디코딩 중인 파일은 끝날 때까지 기다림
+            start = time.perf_counter(); data = future.result(); self._timing(filename, 'wait_ms', start)
+        elif os.path.isfile(self._path(filename)):
+            self.disk_reads += 1; data = self._decode(filename)
+        else: return self._mark_missing(filename)
+        if data is None: return self._mark_missing(filename)
+        if isinstance(data, pygame.Surface):
+            start = time.perf_counter(); data = self._convert(data); self._timing(filename, 'convert_ms', start)
+        self.sources[filename] = data
+        return data
+
+    def load_image(self, filename, size):
+        key = (filename, tuple(size))
+        image = self.images.get(key)
+        if image is not None:
+            self.cache_hits += 1
+            return image
+        source = self._load_source(filename)
+        if source is None: image = pygame.Surface(size, pygame.SRCALPHA) # 투명한 Surface (Fallback)
+        else:
+            start = time.perf_counter(); image = pygame.transform.scale(source, size); self._timing(filename, 'scale_ms', start)
+        self.images[key] = image; self.version += 1
+        return image
+
+    def is_missing(self, filename): return self._load_source(filename) is None
+
+    # 사운드 파일 (없으면 None)
+    def load_sound(self, filename): return self._load_source(filename)
+
+    # 코드로 그리는 Fallback 이미지도 키별로 한 번만 생성합니다. builder는 Surface를 반환하는 함수입니다.
+    def fallback(self, key, builder):
+        image = self.fallbacks.get(key)
+        if image is None:
+            self.fallback_builds += 1
+            image = self.fallbacks[key] = builder(); self.version += 1
+        else: self.cache_hits += 1
+        return image
+
+    # 크기 종류별 폭발 애니메이션 프레임 목록 (처음 요청할 때 한 번만 만들고 모든 Explosion이 공유)
+    # expl{i}.png가 있으면 해당 크기로 스케일하고, 없으면 노란 원 프레임을 그려 사용합니다.
+    def explosion_frames(self, size):
+        return self.fallback(('explosion', size), lambda: [self._explosion_frame(size, i) for i in range(EXPLOSION_FRAMES)])
+
+    def _explosion_frame(self, size, i):
+        base, step = EXPLOSION_SIZES[size]
+        dim = (i*step + base, i*step + base)
+        filename = f'expl{i}.png'
+        if not self.is_missing(filename): return self.load_image(filename, dim)
+        ref = i*15 + 30 # 원 모양 기준 크기 ('lg'와 같은 비율)
+        img = pygame.Surface((ref, ref), pygame.SRCALPHA)
+        pygame.draw.circle(img, YELLOW, (ref//2, ref//2), i*7 + 15)
+        if dim != (ref, ref): img = pygame.transform.smoothscale(img, dim)
+        return self._convert(img)
+
+    def mark_startup_complete(self):
+        self.startup_disk_reads = self.disk_reads
+        if self.executor is not None: self.executor.shutdown(wait=False); self.executor = None
+        if self.missing: print(f"Warning: {len(self.missing)} asset(s) not found, using fallbacks: {', '.join(self.missing)}")
+
+    # 에셋별 시작 시간 분석 (decode: 워커 스레드 디코딩, wait: 메인 스레드가 기다린 시간, convert/scale: 메인 스레드 처리)
+    def startup_report(self):
+        lines = [f"{'asset':<20}{'decode':>9}{'wait':>9}{'convert':>9}{'scale':>9}  (ms)"]
+        for filename, timing in sorted(self.timings.items(), key=lambda item: -sum(item[1].values())):
+            lines.append(f"{filename:<20}" + ''.join(f"{timing.get(key, 0.0):9.2f}" for key in ('decode_ms', 'wait_ms', 'convert_ms', 'scale_ms')))
+        if self.missing: lines.append("missing: " + ', '.join(self.missing))
+        return lines
+
+    def stats(self):
+        after_startup = None if self.startup_disk_reads is None else self.disk_reads - self.startup_disk_reads
+        return {'disk_reads': self.disk_reads, 'disk_reads_after_startup': after_startup, 'cache_hits': self.cache_hits,
+                'fallback_builds': self.fallback_builds, 'images': len(self.images), 'fallbacks': len(self.fallbacks)}
+
+assets = AssetManager() # 게임 전체에서 공유하는 레지스트리
+
+# 시스템 글꼴 경로를 찾습니다. match_font는 시스템 글꼴 전체를 검색하므로 결과를 파일에 저장해 두고 다음 실행부터 재사용합니다.
+# 캐시 형식: "글꼴 이름<탭>경로" (찾은 경우에만 저장, 시스템에 없는 글꼴은 pygame 기본 글꼴을 쓰고 다음 실행에서 다시 검색)
+def find_font(name, cache_file=FONT_CACHE_FILE):
+    try:
+        with open(cache_file, encoding='utf-8') as f: cached_name, path = f.read().rstrip('\n').split('\t')
+        if cached_name == name and path and os.path.isfile(path): return path
+    except (OSError, ValueError): pass # 캐시가 없거나 형식이 다르면 다시 검색
+    path = pygame.font.match_font(name)
+    if not path: return pygame.font.get_default_font() # 못 찾은 결과는 캐시하지 않음 (나중에 글꼴을 설치하면 다시 찾음)
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f: f.write(f"{name}\t{path}\n")
+    except OSError: pass
+    return path
+
+# 기존 코드와 같은 이름으로 사용할 수 있도록 제공하는 함수
+def load_image(filename, size): return assets.load_image(filename, size)
@@ -0,0 +1,60 @@
+import pygame
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 텍스처 아틀라스 ---
+# 게임이 쓰는 공유 이미지(에셋 레지스트리의 PNG와 Fallback)를 큰 Surface 하나에 선반(shelf) 방식으로 모아 둡니다.
+# 원본 Surface -> 아틀라스 안의 영역(Rect) 표를 가지고 있어, 스프라이트는 기존처럼 자기 image를 가지되
+# 그릴 때는 (아틀라스, 위치, 영역)으로 한 Surface에서 모두 blit 합니다.
+class TextureAtlas:
+    def __init__(self, size=ATLAS_SIZE, padding=1):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None: self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        self.padding = padding
+        self.regions = {} # 원본 Surface -> 아틀라스 안의 Rect
+        self.shelf_x = self.shelf_y = self.shelf_h = 0 # 현재 선반의 다음 빈 칸 위치와 선반 높이
+        self.rejected = 0 # 공간이 모자라 넣지 못한 이미지 수 (그 이미지는 원본으로 그림)
+        self.version = None # 마지막으로 동기화한 에셋 레지스트리 버전
+
+    def add(self, image):
+        rect = self.regions.get(image)
+        if rect is not None: return rect
+        w, h = image.get_size()
+        width, height = self.surface.get_size()
+        if w == 0 or h == 0 or w > width: return None
+        if self.shelf_x + w > width: # 현재 선반이 가득 차면 아래에 새 선반
+            self.shelf_x, self.shelf_y, self.shelf_h = 0, self.shelf_y + self.shelf_h + self.padding, 0
+        if self.shelf_y + h > height: self.rejected += 1; return None
+        rect = pygame.Rect(self.shelf_x, self.shelf_y, w, h)
+        self.surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_ADD) # 투명한 빈 칸에 더하면 알파 포함 픽셀이 그대로 복사됨
+        self.shelf_x += w + self.padding; self.shelf_h = max(self.shelf_h, h)
+        self.regions[image] = rect
+        return rect
+
+    # 에셋 레지스트리에 새로 생긴 이미지를 추가합니다. (시작할 때 한 번, 이후에는 새 Fallback이 생겼을 때만)
+    # 선반 방식은 높이가 큰 것부터 넣을 때 빈 공간이 적습니다.
+    def sync(self, assets):
+        images = list(assets.images.values())
+        for value in assets.fallbacks.values(): images.extend(value if isinstance(value, list) else [value]) # 폭발처럼 프레임 목록인 것도 포함
+        for image in sorted(images, key=lambda image: -image.get_height()): self.add(image)
+        self.version = assets.version
+
+# --- 레이어 정렬 + 일괄 그리기 그룹 ---
+# LayeredUpdates라서 스프라이트는 _layer(클래스 속성) 순서, 같은 레이어 안에서는 추가된 순서로 정렬되어 있습니다.
+# draw_batched는 모든 스프라이트를 Surface.blits 한 번으로 그립니다.
+class RenderGroup(pygame.sprite.LayeredUpdates):
+    # alpha는 렌더링 보간 비율 (마지막 두 시뮬레이션 스텝 사이), doreturn=False면 그린 영역 목록을 만들지 않습니다.
+    def draw_batched(self, surf, atlas=None, alpha=1.0, doreturn=True):
+        regions = atlas.regions if atlas is not None else {}
+        atlas_surf = atlas.surface if atlas is not None else None
+        blit_list = []
+        for sprite in self.sprites():
+            x, y = sprite.rect.topleft
+            prev = getattr(sprite, 'prev_pos', None)
+            # 이번 스텝에 생성되었거나 순간 이동(숨기기 등)한 스프라이트는 현재 위치에 그대로 그림
+            if prev is not None and abs(x - prev[0]) < INTERP_MAX_JUMP and abs(y - prev[1]) < INTERP_MAX_JUMP:
+                x, y = prev[0] + (x - prev[0]) * alpha, prev[1] + (y - prev[1]) * alpha
+            region = regions.get(sprite.image)
+            if region is not None: blit_list.append((atlas_surf, (x, y), region))
+            else: blit_list.append((sprite.image, (x, y)))
+        return surf.blits(blit_list, doreturn) or []
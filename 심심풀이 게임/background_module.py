@@ -2,41 +2,124 @@ import pygame
 import random
 from settings import * # settings.py의 상수들을 사용합니다.
 
+try: import numpy as np # 선택 의존성: 없으면 별 배경을 파이썬 루프로 그립니다.
+except ImportError: np = None
+
+# --- 벡터화된 별 배경 ---
+# 별의 상태(x, y, 깊이)를 배열에 두고, 원근 투영/크기/밝기를 한 번에 계산한 뒤 surfarray로 픽셀을 일괄 기록합니다.
+# 계산식과 그려지는 모양(크기 1~3px 정사각형, 회색조)은 기존 별 배경 루프와 같습니다.
+class Starfield:
+    def __init__(self, count=STAR_COUNT, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.x, self.y = self.rng.uniform(-1, 1, count), self.rng.uniform(-1, 1, count)
+        self.z = self.rng.uniform(0.1, 5, count)
+
+    # surf에 별을 그리고, dirty_rects=True면 그린 영역(Rect) 목록을 반환합니다.
+    def update_and_draw(self, surf, dirty_rects=True):
+        self.z -= 0.03 # 별이 플레이어에게 다가오는 듯한 효과 (깊이 값 감소)
+        reborn = self.z <= 0 # 화면을 벗어난 별은 다시 맨 뒤에서 생성
+        n = int(np.count_nonzero(reborn))
+        if n:
+            self.x[reborn], self.y[reborn], self.z[reborn] = self.rng.uniform(-1, 1, n), self.rng.uniform(-1, 1, n), self.rng.uniform(4, 5, n)
+
+        # 원근감 계산, 별의 크기와 밝기 조절
+        k = 128.0 / self.z
+        screen_x, screen_y = self.x * k + SCREEN_WIDTH / 2, self.y * k + SCREEN_HEIGHT / 2
+        shade = ((5 - self.z) * 50).astype(np.int32)
+        size = ((5 - self.z) * 0.8).astype(np.int32) # pygame.Rect처럼 소수점 이하 버림
+        visible = (shade > 0) & (shade < 255) & (screen_x > 0) & (screen_x < SCREEN_WIDTH) & (screen_y > 0) & (screen_y < SCREEN_HEIGHT) & (size > 0)
+        xs, ys = screen_x[visible].astype(np.int32), screen_y[visible].astype(np.int32)
+        size, shade = size[visible], shade[visible]
+        if len(xs) == 0: return []
+
+        if surf.get_bitsize() in (24, 32):
+            # 별마다 size x size 픽셀 좌표를 만들고, 겹치는 픽셀은 기존 루프처럼 나중 별이 덮도록 별 순서로 정렬하여 한 번에 기록
+            width, height = surf.get_size()
+            order = np.arange(len(xs))
+            px, py, color, idx = [], [], [], []
+            for dx in range(int(size.max())):
+                for dy in range(int(size.max())):
+                    m = (size > dx) & (size > dy) & (xs + dx < width) & (ys + dy < height)
+                    px.append(xs[m] + dx); py.append(ys[m] + dy); color.append(shade[m]); idx.append(order[m])
+            sort = np.argsort(np.concatenate(idx), kind='stable')
+            pixels = pygame.surfarray.pixels3d(surf) # surf를 잠그고 픽셀 배열에 직접 기록
+            pixels[np.concatenate(px)[sort], np.concatenate(py)[sort]] = np.concatenate(color)[sort, None]
+            del pixels # 잠금 해제
+        else: # 픽셀 배열을 쓸 수 없는 Surface 형식이면 개별 사각형으로 그림
+            for x, y, sz, c in zip(xs.tolist(), ys.tolist(), size.tolist(), shade.tolist()): pygame.draw.rect(surf, (c, c, c), (x, y, sz, sz))
+
+        if not dirty_rects: return []
+        return [pygame.Rect(x, y, sz, sz) for x, y, sz in zip(xs.tolist(), ys.tolist(), size.tolist())]
+
+# --- 미리 합성한 구름 레이어 (패럴랙스) ---
+# 구름 count개를 화면 폭 x (화면 높이 + 여유) 크기의 띠 Surface에 한 번만 합성해 두고,
+# 매 프레임 띠를 speed만큼 내려 두 번 blit합니다 (위아래로 이어지도록 감싸기).
+# 구름이 몇 개든 레이어당 비용은 blit 2번으로 일정합니다.
+# 띠 안의 구름 위치를 기억해 두어, 더티 렉트로는 구름이 움직인 영역(이전 위치 + 현재 위치)만 보고합니다.
+class CloudLayer:
+    def __init__(self, images, speed, count):
+        self.speed = speed
+        self.height = SCREEN_HEIGHT + 2 * max(img.get_height() for img in images) # 띠가 화면보다 길어야 반복이 덜 보임
+        self.strip = pygame.Surface((SCREEN_WIDTH, self.height), pygame.SRCALPHA)
+        self.clouds = [] # 띠 좌표계의 구름 영역 (이번 프레임에서 speed만큼 위로 늘려 이전 위치까지 포함)
+        for _ in range(count):
+            img = random.choice(images)
+            x, y = random.randrange(-img.get_width(), SCREEN_WIDTH), random.randrange(self.height)
+            self.strip.blit(img, (x, y))
+            self.clouds.append(pygame.Rect(x, y - speed, img.get_width(), img.get_height() + speed))
+            if y + img.get_height() > self.height: # 아래로 넘친 부분은 띠 맨 위에 이어 그림
+                self.strip.blit(img, (x, y - self.height))
+                self.clouds.append(pygame.Rect(x, y - self.height - speed, img.get_width(), img.get_height() + speed))
+        if pygame.display.get_surface() is not None: self.strip = self.strip.convert_alpha() # 화면 형식으로 변환해 두면 blit이 빠름
+        self.offset = random.uniform(0, self.height) # 레이어마다 시작 위치를 다르게
+
+    # 띠를 그리고, dirty_rects=True면 구름이 지나간 영역(Rect) 목록을 반환합니다.
+    def update_and_draw(self, surf, dirty_rects=True):
+        self.offset = (self.offset + self.speed) % self.height
+        y = int(self.offset)
+        surf.blit(self.strip, (0, y))
+        surf.blit(self.strip, (0, y - self.height))
+        if not dirty_rects: return []
+        screen = surf.get_rect()
+        dirty = []
+        for top in (y, y - self.height):
+            for cloud in self.clouds:
+                rect = screen.clip(cloud.move(0, top))
+                if rect: dirty.append(rect)
+        return dirty
+
 class Background:
-    def __init__(self, game): # game 인자 추가
+    # use_clouds=False면 구름 이미지가 있어도 별 배경을 사용합니다. (벤치마크 등)
+    def __init__(self, game, use_clouds=True): # game 인자 추가
         self.game = game
         # game.load_data에서 로드된 이미지들을 참조
         self.cloud_images = [self.game.cloud_img1, self.game.cloud_img2, self.game.cloud_img3] 
         
         # 실제 로드된 구름 이미지가 있는지 확인 (어떤 이미지든 폭이 0보다 크면 유효하다고 판단)
-        if any(img.get_width() > 0 for img in self.cloud_images):
+        if use_clouds and any(img.get_width() > 0 for img in self.cloud_images):
             self.use_clouds = True
-            self.clouds = []
-            for _ in range(10): self.spawn_cloud()
+            valid_clouds = [c for c in self.cloud_images if c.get_width() > 0] # 실제로 유효한 구름 이미지만 사용
+            # 느린(먼) 레이어부터 그림
+            self.cloud_layers = [CloudLayer(valid_clouds, speed, count) for speed, count in sorted(CLOUD_LAYERS)]
         else: # 구름 이미지가 없으면 별 배경 사용
-            print("Warning: Cloud images not found. Using starfield background.")
+            if use_clouds: print("Warning: Cloud images not found. Using starfield background.")
             self.use_clouds = False
-            self.stars = [[random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(0.1, 5)] for _ in range(200)]
-
-    def spawn_cloud(self):
-        if self.use_clouds:
-            # 실제로 유효한 구름 이미지만 선택
-            valid_clouds = [c for c in self.cloud_images if c.get_width() > 0]
-            if valid_clouds:
-                img = random.choice(valid_clouds)
-                # 구름 이미지의 크기는 이미 로드 시 결정되었으므로 그대로 사용
-                self.clouds.append({'image': img, 'rect': img.get_rect(topleft=(random.randrange(-img.get_width(), SCREEN_WIDTH), random.randrange(-img.get_height()*2, -img.get_height()//2))), 'speed': random.randrange(1, 3)})
+            if np is not None: self.starfield = Starfield() # NumPy 벡터화 별 배경
+            else:
+                self.starfield = None
+                self.stars = [[random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(0.1, 5)] for _ in range(STAR_COUNT)]
 
-    def update_and_draw(self, surf):
-        surf.fill(BLACK) # 배경색을 블랙으로 변경하여 별이 잘 보이도록
+    # 화면을 지우고 배경을 그린 뒤, 그린 영역(Rect) 목록을 반환합니다. (더티 렉트 렌더링용)
+    # dirty_rects=False면 영역 목록을 만들지 않습니다.
+    def update_and_draw(self, surf, dirty_rects=True):
+        dirty = []
+        surf.fill(BLACK) # 배경색을 블랙으로 변경하여 별이 잘 보이도록 (매 프레임 같은 색이므로 더티 렉트로 보고하지 않음)
 
         if self.use_clouds:
-            for cloud in self.clouds[:]: # 리스트를 순회하면서 수정할 때는 슬라이싱 사용
-                cloud['rect'].y += cloud['speed']
-                surf.blit(cloud['image'], cloud['rect'])
-                if cloud['rect'].top > SCREEN_HEIGHT:
-                    self.clouds.remove(cloud)
-                    self.spawn_cloud()
+            for layer in self.cloud_layers: dirty.extend(layer.update_and_draw(surf, dirty_rects))
+            return dirty
+        if self.starfield is not None:
+            dirty = self.starfield.update_and_draw(surf, dirty_rects)
         else:
             # Starfield fallback (별 배경)
             center_x, center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
@@ -54,4 +137,5 @@ class Background:
                 shade = int((5 - star[2]) * 50)
                 
                 if 0 < shade < 255 and 0 < screen_x < SCREEN_WIDTH and 0 < screen_y < SCREEN_HEIGHT:
-                    pygame.draw.rect(surf, (shade, shade, shade), (screen_x, screen_y, size, size))
\ No newline at end of file
+                    dirty.append(pygame.draw.rect(surf, (shade, shade, shade), (screen_x, screen_y, size, size)))
+        return dirty
\ No newline at end of file
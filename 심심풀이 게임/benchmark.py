@@ -0,0 +1,201 @@
+import pygame
+import random
+import sys
+import os
+import gc
+import json
+import math
+import time
+import platform
+import argparse
+import tracemalloc
+from settings import * # settings.py의 상수들을 사용합니다.
+
+from main import Game
+from sprites import Mob, Powerup
+from background_module import Background, Starfield
+from input_sources import RandomInput
+from projectiles import OWNER_PLAYER, np
+
+# --- 벤치마크 ---
+# 시드를 고정한 시나리오를 헤드리스 Game으로 실행하며, 실제 Game.step(update) + Game.draw 한 프레임의 시간을 잽니다.
+# 시나리오 훅(몹/총알 채우기 등)은 측정 구간 밖에서 실행됩니다.
+# 결과(p50/p95/p99 프레임 시간, 프레임당 할당량, 스프라이트 수)는 JSON으로 저장되므로 릴리스 간에 비교할 수 있습니다.
+#   python benchmark.py --out before.json
+#   python benchmark.py --out after.json --compare before.json
+
+# 플레이어가 죽지 않도록 (시나리오 도중 게임 오버 방지)
+def immortal(g): g.player.lives = 10**6
+
+# 배경을 시나리오에 맞게 다시 만듭니다. (별 배경은 시드 고정)
+def set_background(g, use_clouds, seed):
+    g.background = Background(g, use_clouds)
+    if not use_clouds and np is not None: g.background.starfield = Starfield(seed=seed)
+
+def enemy_bullet_count(g): return g.mob_bullet_count()
+def player_bullet_count(g): return len(g.bullets) + (g.projectiles.count_owner(OWNER_PLAYER) if g.projectiles is not None else 0)
+
+def add_mob(g):
+    mob = Mob(g); g.all_sprites.add(mob); g.mobs.add(mob)
+
+# --- 시나리오: setup(g, rng) 은 reset 직후 한 번, frame(g, i, rng) 는 매 프레임 측정 전에 호출 ---
+
+# 일반 몹 웨이브가 계속되는 상태 (보스가 나오지 않도록 점수를 스테이지 보스 점수 미만으로 유지)
+def no_boss_frame(g, i, rng): g.score = min(g.score, g.waves.stage_start_score + g.waves.boss_points - 1)
+def waves_setup(g, rng): g.waves.start_stage(2) # 여러 대형과 몹 종류가 섞인 스테이지
+# 수백 마리가 한꺼번에 나오는 물량 스테이지
+def horde_setup(g, rng): g.waves.start_stage(3)
+
+# 보스전 + 화면 가득한 적 총알
+BOSS_BULLETS = 400
+def boss_setup(g, rng): g.score = g.waves.boss_points # 다음 update에서 보스 등장
+def boss_frame(g, i, rng):
+    if g.boss is None: g.score = max(g.score, g.waves.stage_start_score + g.waves.boss_points); return
+    g.boss.hp = max(g.boss.hp, 100) # 보스가 죽지 않도록
+    for _ in range(BOSS_BULLETS - enemy_bullet_count(g)):
+        target = g.player if rng.random() < 0.5 else None # 절반은 플레이어 조준, 절반은 아래로
+        g.spawn_mob_bullet(rng.randrange(SCREEN_WIDTH), g.boss.rect.bottom, target, rng.uniform(3, 7))
+
+# 스트레스 모드 보스의 마지막 페이즈 탄막 (패턴 엔진이 상한까지 수천 발을 유지)
+def stress_setup(g, rng): g.stress = True; g.score = g.waves.boss_points
+def stress_frame(g, i, rng):
+    if g.boss is None: g.score = max(g.score, g.waves.stage_start_score + g.waves.boss_points); return
+    if not g.boss.is_active: g.boss.rect.centery = 149 # 등장 연출 생략
+    g.boss.hp = int(g.boss.max_hp * BOSS_PHASES[-1][0]) # 마지막 페이즈에 고정 (죽지 않도록)
+
+# 몹으로 가득 찬 화면에서 주기적으로 폭탄 사용 (폭탄 프레임은 p99에 나타남)
+BOMB_MOBS, BOMB_INTERVAL = 60, 30
+def bomb_setup(g, rng): g.max_mobs = 0
+def bomb_frame(g, i, rng):
+    for _ in range(BOMB_MOBS - len(g.mobs)): add_mob(g)
+    if i % BOMB_INTERVAL == BOMB_INTERVAL - 1: g.activate_bomb()
+
+# 자석이 켜진 상태에서 많은 파워업을 끌어당김
+MAGNET_POWERUPS = 150
+def magnet_setup(g, rng): g.max_mobs = 0
+def magnet_frame(g, i, rng):
+    g.player.is_magnet_active, g.player.magnet_timer = True, g.sim_clock.get_ticks()
+    for _ in range(MAGNET_POWERUPS - len(g.powerups)):
+        powerup = Powerup(g, (rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT // 2)))
+        g.all_sprites.add(powerup); g.powerups.add(powerup)
+
+# 배경만 (몹 없음)
+def empty_setup(g, rng): g.max_mobs = 0
+def no_frame(g, i, rng): pass
+
+# 이름 -> (구름 배경 사용 여부, setup, frame)
+SCENARIOS = {
+    'mob_waves': (True, waves_setup, no_boss_frame),
+    'mob_horde': (True, horde_setup, no_boss_frame),
+    'boss_bullets': (True, boss_setup, boss_frame),
+    'boss_stress': (True, stress_setup, stress_frame),
+    'bomb': (True, bomb_setup, bomb_frame),
+    'magnet': (True, magnet_setup, magnet_frame),
+    'background_stars': (False, empty_setup, no_frame),
+    'background_clouds': (True, empty_setup, no_frame),
+}
+
+# 정렬된 값에서 pct(0~100) 백분위 값 (nearest-rank)
+def percentile(values, pct):
+    if not values: return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(pct * len(values) / 100) - 1))]
+
+def start_scenario(g, name, seed):
+    use_clouds, setup, frame = SCENARIOS[name]
+    random.seed(seed) # 배경 등 게임 로직 밖의 무작위 요소 고정
+    rng = random.Random(seed) # 시나리오 훅 전용
+    g.input = RandomInput(seed, bomb_chance=0) # 폭탄은 시나리오에서 직접 사용
+    set_background(g, use_clouds, seed)
+    g.stress = False # 스트레스 모드는 해당 시나리오의 setup에서만 켬
+    g.reset(seed); immortal(g); setup(g, rng) # 게임 로직은 Game.rng (시드 고정)
+    return rng, frame
+
+def run_scenario(g, name, frames, warmup, alloc_frames, seed):
+    rng, frame = start_scenario(g, name, seed)
+    for i in range(warmup):
+        frame(g, i, rng); g.step(); g.draw()
+
+    # 1) 시간 측정 (tracemalloc 없이)
+    times, counts = [], {'all_sprites': [], 'mobs': [], 'enemy_bullets': [], 'player_bullets': [], 'powerups': []}
+    gc_before = sum(stat['collections'] for stat in gc.get_stats())
+    blocks_before = sys.getallocatedblocks()
+    for i in range(warmup, warmup + frames):
+        frame(g, i, rng)
+        start = time.perf_counter()
+        g.step(); g.draw()
+        times.append((time.perf_counter() - start) * 1000)
+        counts['all_sprites'].append(len(g.all_sprites)); counts['mobs'].append(len(g.mobs))
+        counts['enemy_bullets'].append(enemy_bullet_count(g)); counts['player_bullets'].append(player_bullet_count(g))
+        counts['powerups'].append(len(g.powerups))
+    net_blocks = sys.getallocatedblocks() - blocks_before
+    gc_collections = sum(stat['collections'] for stat in gc.get_stats()) - gc_before
+
+    # 2) 할당량 측정: 같은 시드로 다시 실행하며 프레임마다 새로 할당된 메모리의 최고치를 잼 (tracemalloc은 느리므로 따로 실행)
+    rng, frame = start_scenario(g, name, seed)
+    for i in range(warmup):
+        frame(g, i, rng); g.step(); g.draw()
+    alloc = []
+    tracemalloc.start()
+    for i in range(warmup, warmup + alloc_frames):
+        frame(g, i, rng)
+        tracemalloc.reset_peak(); base = tracemalloc.get_traced_memory()[0]
+        g.step(); g.draw()
+        alloc.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    ordered = sorted(times)
+    return {
+        'frames': frames,
+        'frame_ms': {'mean': sum(times) / len(times), 'p50': percentile(ordered, 50), 'p95': percentile(ordered, 95), 'p99': percentile(ordered, 99), 'max': ordered[-1]},
+        'alloc_bytes_per_frame': {'mean': sum(alloc) / len(alloc) if alloc else 0, 'max': max(alloc, default=0)},
+        'net_blocks_per_frame': net_blocks / frames,
+        'gc_collections': gc_collections,
+        'sprites': {key: {'mean': sum(v) / len(v), 'max': max(v)} for key, v in counts.items()},
+    }
+
+def metadata(args):
+    return {
+        'python': platform.python_version(), 'pygame': pygame.version.ver, 'numpy': np.__version__ if np is not None else None,
+        'platform': platform.platform(), 'seed': args.seed, 'frames': args.frames, 'warmup': args.warmup, 'alloc_frames': args.alloc_frames,
+        'projectile_engine': USE_PROJECTILE_ENGINE and np is not None, 'dirty_rects': USE_DIRTY_RECTS,
+    }
+
+# 이전 결과와 비교하여 시나리오별 주요 지표의 변화를 출력
+def compare(old, new):
+    print(f"{'scenario':<20}{'metric':<12}{'old':>10}{'new':>10}{'change':>10}")
+    for name, result in new['scenarios'].items():
+        before = old.get('scenarios', {}).get(name)
+        if before is None: continue
+        rows = [(f"{p} ms", before['frame_ms'][p], result['frame_ms'][p]) for p in ('p50', 'p95', 'p99')]
+        rows.append(('alloc KB', before['alloc_bytes_per_frame']['mean'] / 1024, result['alloc_bytes_per_frame']['mean'] / 1024))
+        for metric, a, b in rows:
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "-"
+            print(f"{name:<20}{metric:<12}{a:>10.3f}{b:>10.3f}{change:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=f"{TITLE} 벤치마크")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help="실행할 시나리오 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument('--frames', type=int, default=600, help="시나리오마다 측정할 프레임 수")
+    parser.add_argument('--warmup', type=int, default=120, help="측정 전에 버리는 프레임 수")
+    parser.add_argument('--alloc-frames', type=int, default=120, help="할당량 측정에 쓰는 프레임 수")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', default='benchmark.json', help="결과 JSON 파일 경로")
+    parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    g = Game(headless=True)
+    results = {'meta': metadata(args), 'scenarios': {}}
+    for name in args.scenario or list(SCENARIOS):
+        result = results['scenarios'][name] = run_scenario(g, name, args.frames, args.warmup, args.alloc_frames, args.seed)
+        ms = result['frame_ms']
+        print(f"{name:<20} p50 {ms['p50']:7.3f} ms  p95 {ms['p95']:7.3f} ms  p99 {ms['p99']:7.3f} ms  "
+              f"alloc {result['alloc_bytes_per_frame']['mean'] / 1024:8.1f} KB/frame  sprites {result['sprites']['all_sprites']['max']}")
+
+    with open(args.out, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {os.path.abspath(args.out)}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f: compare(json.load(f), results)
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
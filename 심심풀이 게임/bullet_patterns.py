@@ -0,0 +1,83 @@
+import math
+from settings import * # settings.py의 상수들을 사용합니다.
+from projectiles import round_half_away
+
+# --- 보스 탄막 패턴 엔진 ---
+# BOSS_PHASES 표의 패턴(ring, spiral, fan, aimed)을 실행해 적 총알을 발사합니다.
+#  - 페이즈는 보스 HP 비율(hp / max_hp)로 정해지고, 페이즈가 바뀌면 그 페이즈의 패턴 타이머를 처음부터 시작
+#  - 총알 방향은 미리 계산한 각도 표(COS/SIN)에서 찾음 (총알마다 atan2/cos/sin을 계산하지 않음, aimed는 발사마다 atan2 한 번)
+#  - 한 스텝에 발사되는 모든 총알을 모아 Game.spawn_mob_bullets 한 번으로 추가 (투사체 엔진에서는 spawn_many 한 번)
+#  - 화면의 적 총알 수가 상한을 넘지 않도록 넘치는 총알은 발사하지 않음
+# 스트레스 모드는 발사마다 총알 수를 BOSS_STRESS_SCALE배로 늘리고 상한을 BOSS_STRESS_MAX_BULLETS로 높입니다. (탄막 성능 측정용)
+COS = [math.cos(2 * math.pi * i / BULLET_ANGLE_STEPS) for i in range(BULLET_ANGLE_STEPS)]
+SIN = [math.sin(2 * math.pi * i / BULLET_ANGLE_STEPS) for i in range(BULLET_ANGLE_STEPS)]
+DOWN = BULLET_ANGLE_STEPS // 4 # 아래 방향 (90도)
+
+def angle_step(degrees): return round(degrees * BULLET_ANGLE_STEPS / 360)
+
+# 패턴 하나의 실행 상태. 총알들의 각도 오프셋(각도 표 칸 단위)은 만들 때 한 번만 계산합니다.
+class Pattern:
+    def __init__(self, spec, start, scale=1):
+        self.shape, self.guns, self.interval, count, self.speed, spread, rotation, self.burst = spec
+        count *= scale
+        if self.shape in ('ring', 'spiral'): self.offsets = [angle_step(360 * i / count) for i in range(count)]
+        elif count == 1: self.offsets = [0]
+        else: self.offsets = [angle_step(-spread / 2 + spread * i / (count - 1)) for i in range(count)]
+        self.rotation = angle_step(rotation)
+        self.turn = 0 # 지금까지 회전한 각도 (칸)
+        self.shot = 0 # 이번 연사에서 발사한 횟수
+        self.next_time = start + self.interval
+
+    def fire(self, boss, target, xs, ys, vxs, vys):
+        speed = self.speed
+        for dx, dy in self.guns:
+            x, y = round_half_away(boss.rect.centerx + dx), round_half_away(boss.rect.bottom + dy)
+            if self.shape != 'aimed': base = DOWN
+            elif target is not None and target.alive(): base = angle_step(math.degrees(math.atan2(target.rect.centery - y, target.rect.centerx - x)))
+            else: base = DOWN
+            base += self.turn
+            for offset in self.offsets:
+                i = (base + offset) % BULLET_ANGLE_STEPS
+                vxs.append(speed * COS[i]); vys.append(speed * SIN[i])
+            xs.extend([x] * len(self.offsets)); ys.extend([y] * len(self.offsets))
+        self.turn += self.rotation
+        self.shot += 1
+        if self.shot < self.burst: return BOSS_BURST_GAP
+        self.shot = 0
+        return self.interval
+
+class BulletPatterns:
+    def __init__(self, boss, phases=BOSS_PHASES, stress=False):
+        self.boss, self.game, self.phases = boss, boss.game, phases
+        self.scale = BOSS_STRESS_SCALE if stress else 1
+        self.max_bullets = BOSS_STRESS_MAX_BULLETS if stress else BOSS_MAX_BULLETS
+        self.phase, self.patterns = -1, []
+        self.stats = {'volleys': 0, 'emitted': 0, 'capped': 0}
+
+    # 보스 HP 비율에 맞는 페이즈 번호 (표의 뒤쪽일수록 HP가 낮을 때)
+    def phase_for(self, ratio):
+        phase = 0
+        for i, (threshold, _) in enumerate(self.phases):
+            if ratio <= threshold: phase = i
+        return phase
+
+    def update(self, now):
+        phase = self.phase_for(self.boss.hp / self.boss.max_hp)
+        if phase != self.phase:
+            if self.phase >= 0: self.game.player.show_pop_up("보스 패턴 변화!")
+            self.phase = phase
+            self.patterns = [Pattern(spec, now, self.scale) for spec in self.phases[phase][1]]
+        xs, ys, vxs, vys = [], [], [], []
+        for pattern in self.patterns:
+            if now >= pattern.next_time:
+                pattern.next_time = now + pattern.fire(self.boss, self.game.player, xs, ys, vxs, vys)
+                self.stats['volleys'] += 1
+        if not xs: return
+        room = self.max_bullets - self.game.mob_bullet_count()
+        if room < len(xs):
+            self.stats['capped'] += len(xs) - max(0, room)
+            if room <= 0: return
+            del xs[room:], ys[room:], vxs[room:], vys[room:]
+        self.game.spawn_mob_bullets(xs, ys, vxs, vys)
+        self.stats['emitted'] += len(xs)
+        self.game.sounds.play('enemy_shoot') # 같은 스텝의 발사음은 한 번만
@@ -0,0 +1,79 @@
+import pygame
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 히트 모양 (충돌 판정 모양) ---
+# 스프라이트 클래스마다 hit_shape 속성으로 충돌 모양을 선언합니다.
+#  - HIT_RECT: rect 그대로 (기본값)
+#  - HIT_CIRCLE: rect 중심, radius 반지름의 원 (원은 rect 안에 들어가야 함)
+#  - HIT_MASK: 이미지의 불투명 픽셀 (마스크는 이미지마다 한 번만 만들어 MaskCache에서 공유)
+# 모든 모양은 rect 안에 있으므로 검사는 싼 것부터: rect 겹침 -> 원 -> 마스크 순서로 하고, 앞 단계에서 떨어져 있으면 바로 끝냅니다.
+HIT_RECT, HIT_CIRCLE, HIT_MASK = 'rect', 'circle', 'mask'
+
+class MaskCache:
+    def __init__(self):
+        self.images = {} # 이미지 Surface -> Mask
+        self.circles = {} # 반지름 -> 원 Mask
+        self.rects = {} # (너비, 높이) -> 가득 찬 Mask
+        self.hits, self.misses = 0, 0 # 캐시 적중/미스 횟수 (프로파일링용)
+
+    def get(self, image):
+        mask = self.images.get(image)
+        if mask is None:
+            self.misses += 1
+            mask = self.images[image] = pygame.mask.from_surface(image)
+        else: self.hits += 1
+        return mask
+
+    def circle(self, radius):
+        mask = self.circles.get(radius)
+        if mask is None:
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, WHITE, (radius, radius), radius)
+            mask = self.circles[radius] = pygame.mask.from_surface(surf)
+        return mask
+
+    def rect(self, size):
+        mask = self.rects.get(size)
+        if mask is None: mask = self.rects[size] = pygame.mask.Mask(size, fill=True)
+        return mask
+
+masks = MaskCache()
+
+def hit_shape(sprite): return getattr(sprite, 'hit_shape', HIT_RECT)
+
+# pygame.sprite.collide_circle과 같이 radius가 없으면 rect 대각선의 절반을 사용
+def hit_radius(sprite):
+    radius = getattr(sprite, 'radius', None)
+    return radius if radius is not None else 0.5 * (sprite.rect.width ** 2 + sprite.rect.height ** 2) ** 0.5
+
+def circle_hits_rect(cx, cy, radius, rect):
+    dx = cx - max(rect.left, min(cx, rect.right)); dy = cy - max(rect.top, min(cy, rect.bottom)) # 원 중심에서 rect까지 가장 가까운 점
+    return dx * dx + dy * dy <= radius * radius
+
+# 스프라이트의 모양이 사각형 rect와 겹치는지 (플레이어 총알 등)
+def hits_rect(sprite, rect):
+    if not sprite.rect.colliderect(rect): return False
+    shape = hit_shape(sprite)
+    if shape == HIT_RECT: return True
+    if shape == HIT_CIRCLE: return circle_hits_rect(sprite.rect.centerx, sprite.rect.centery, hit_radius(sprite), rect)
+    return masks.get(sprite.image).overlap(masks.rect(rect.size), (rect.x - sprite.rect.x, rect.y - sprite.rect.y)) is not None
+
+# 스프라이트의 모양이 (cx, cy) 중심, radius 반지름의 원과 겹치는지 (적 총알 등)
+def hits_circle(sprite, cx, cy, radius):
+    shape = hit_shape(sprite)
+    if shape == HIT_CIRCLE:
+        dx, dy, r = sprite.rect.centerx - cx, sprite.rect.centery - cy, hit_radius(sprite) + radius
+        return dx * dx + dy * dy <= r * r
+    if not circle_hits_rect(cx, cy, radius, sprite.rect): return False
+    if shape == HIT_RECT: return True
+    r = max(1, round(radius))
+    return masks.get(sprite.image).overlap(masks.circle(r), (round(cx) - r - sprite.rect.x, round(cy) - r - sprite.rect.y)) is not None
+
+# pygame.sprite.spritecollide 등의 collided 인자로 쓰는 충돌 함수
+def collide(a, b):
+    if not a.rect.colliderect(b.rect): return False
+    shape = hit_shape(b)
+    if shape == HIT_RECT: return hits_rect(a, b.rect)
+    if shape == HIT_CIRCLE: return hits_circle(a, b.rect.centerx, b.rect.centery, hit_radius(b))
+    if hit_shape(a) != HIT_MASK: return collide(b, a) # 한쪽만 마스크면 반대쪽 모양으로 먼저 걸러냄
+    return masks.get(a.image).overlap(masks.get(b.image), (b.rect.x - a.rect.x, b.rect.y - a.rect.y)) is not None
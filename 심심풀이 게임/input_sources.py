@@ -0,0 +1,46 @@
+import pygame
+import random
+
+# --- 입력 소스 ---
+# Player는 키보드를 직접 읽지 않고 Game.keys(매 업데이트마다 input.poll()로 갱신)를 사용합니다.
+# poll()은 pygame.key.get_pressed()처럼 keys[pygame.K_LEFT] 형태로 조회할 수 있는 객체를 반환해야 합니다.
+
+GAME_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE) # 게임플레이에 쓰이는 키
+
+class KeyState:
+    # 눌린 키 집합을 get_pressed() 결과처럼 인덱싱할 수 있게 감싼 객체
+    __slots__ = ('pressed',)
+    def __init__(self, pressed=()): self.pressed = frozenset(pressed)
+    def __getitem__(self, key): return key in self.pressed
+
+class KeyboardInput:
+    # 실제 키보드 (기본값)
+    def poll(self): return pygame.key.get_pressed()
+
+class NullInput:
+    # 아무 키도 누르지 않는 입력 (헤드리스 기본값)
+    def __init__(self): self.state = KeyState()
+    def poll(self): return self.state
+
+class ScriptedInput:
+    # script(frame) -> 눌린 키들의 iterable 을 반환하는 함수로 입력을 재생합니다.
+    def __init__(self, script):
+        self.script, self.frame = script, 0
+    def poll(self):
+        state = KeyState(self.script(self.frame) or ())
+        self.frame += 1
+        return state
+
+class RandomInput:
+    # 소크 테스트용: 무작위 키 조합을 무작위 길이만큼 유지합니다. seed가 같으면 같은 입력이 나옵니다.
+    def __init__(self, seed=None, hold_frames=(5, 40), bomb_chance=0.02):
+        self.rng = random.Random(seed)
+        self.hold_frames, self.bomb_chance = hold_frames, bomb_chance
+        self.state, self.remaining = KeyState(), 0
+    def poll(self):
+        if self.remaining <= 0:
+            pressed = [key for key in GAME_KEYS[:4] if self.rng.random() < 0.3]
+            if self.rng.random() < self.bomb_chance: pressed.append(pygame.K_SPACE)
+            self.state, self.remaining = KeyState(pressed), self.rng.randint(*self.hold_frames)
+        self.remaining -= 1
+        return self.state
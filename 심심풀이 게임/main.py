@@ -3,40 +3,81 @@ import random
 import sys
 import math
 import os
+import time
+import argparse
 
 # settings.py, ui_elements.py, sprites.py, background_module.py에서 필요한 것들을 임포트합니다.
 from settings import *
-from ui_elements import Button
+from ui_elements import TextCache
 from sprites import Player, Mob, Bullet, MobBullet, Powerup, Explosion
 from background_module import Background
 from sprites import *
-
-# 리소스 로드 함수 (Fallback 처리 포함)
-# 이미지가 없으면 투명한 Surface를 반환하여 오류 대신 기본 도형을 사용하도록
-def load_image(filename, size):
-    full_path = os.path.join(IMAGE_FOLDER, filename)
-    try:
-        image = pygame.image.load(full_path).convert_alpha()
-        return pygame.transform.scale(image, size)
-    except (pygame.error, FileNotFoundError):
-        print(f"Warning: Image '{filename}' not found or could not be loaded. Using fallback.")
-        return pygame.Surface(size, pygame.SRCALPHA) # 투명한 Surface 반환
+from input_sources import KeyboardInput, NullInput, RandomInput
+from sim_clock import SimClock
+from pools import SpritePool
+from spatial_hash import SpatialHash
+from hitshapes import collide, masks
+from renderer import DirtyRectRenderer
+from profiler import FrameProfiler
+from atlas import TextureAtlas, RenderGroup
+from sound import SoundManager
+from score_store import ScoreStore
+from waves import WaveScheduler
+from scenes import SceneStack, StartScene, GameScene
+from replay import InputRecorder, Replay, ReplayInput, state_checksum
+from projectiles import ProjectileSystem, OWNER_PLAYER, OWNER_ENEMY, np, round_half_away
+
+from assets import assets, load_image, find_font # 이미지 로드는 에셋 레지스트리에서 (파일/크기별 1회 로드)
+
+# 시작할 때 워커 스레드에서 미리 디코딩할 파일들 (메뉴에 쓰는 구름이 먼저)
+MENU_IMAGE_FILES = ['cloud1.png', 'cloud2.png', 'cloud3.png']
+GAME_IMAGE_FILES = ['player_fly1.png', 'player_fly2.png', 'player_fly3.png', 'bullet.png', 'mob.png', 'mob_fast.png', 'boss.png',
+                    'shield.png', 'twin_shot.png', 'speed.png', 'hp.png', 'bomb.png', 'magnet.png'] + [f'expl{i}.png' for i in range(EXPLOSION_FRAMES)]
+SOUND_FILES = [filename for files, *_ in SOUNDS.values() for filename in files]
 
 # --- Game 클래스 시작 ---
 class Game:
-    def __init__(self):
+    # headless=True 이면 창/오디오 없이 오프스크린 Surface만 사용합니다. (CI 소크 테스트용)
+    # input_source는 poll() 메서드를 가진 입력 객체이며, 없으면 키보드(헤드리스는 NullInput)를 사용합니다.
+    # profile=True면 프레임 단계별 프로파일러를 켠 상태로 시작합니다. (F3: 오버레이 켜기/끄기, F4: CSV 저장)
+    # seed를 주면 게임마다의 시드가 정해지고(재현 가능), record에 경로를 주면 게임의 입력을 리플레이 파일로 저장합니다.
+    def __init__(self, headless=False, input_source=None, profile=False, seed=None, record=None, stress=False):
+        self.startup_start = time.perf_counter()
+        self.startup_phases = {} # 시작 단계별 경과 시간 (ms, 시작 시점 기준)
+        self.headless = headless
+        if self.headless:
+            # 디스플레이/오디오 장치가 없는 환경에서도 pygame.init()이 동작하도록 더미 드라이버 사용
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy'); os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
         pygame.init()
-        pygame.mixer.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(TITLE)
-        self.clock = pygame.time.Clock()
+        if self.headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)) # 화면 대신 오프스크린 Surface
+        else:
+            pygame.mixer.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(TITLE)
+        self.input = input_source or (NullInput() if self.headless else KeyboardInput())
+        self.keys = None # 이번 업데이트의 키 상태 (Game.update에서 입력 소스로부터 갱신)
+        self.clock = pygame.time.Clock() # 실제 시간 (렌더링 프레임 제한)
+        self.sim_clock = SimClock() # 시뮬레이션 시간 (모든 스프라이트 타이머가 사용)
         self.running = True
-        self.font_name = pygame.font.match_font('malgungothic')
-        if not self.font_name:
-            self.font_name = pygame.font.get_default_font()
-        self.paused = False
+        self.startup_phases['display_ms'] = (time.perf_counter() - self.startup_start) * 1000
+        self.font_name = find_font(FONT_NAME) # 찾은 글꼴 경로는 파일에 캐시 (다음 실행부터 시스템 글꼴 검색 생략)
+        self.startup_phases['font_ms'] = (time.perf_counter() - self.startup_start) * 1000
+        self.text_cache = TextCache(self.font_name) # 폰트/텍스트 렌더링 캐시
+        self.renderer = DirtyRectRenderer(headless=self.headless) # 화면 갱신 (더티 렉트 또는 전체 flip)
+        self.profiler = FrameProfiler(enabled=profile) # 프레임 단계별 시간 측정 (꺼져 있으면 비용 거의 없음)
+        self.seed_source = random.Random(seed) # 게임마다 새 시드를 뽑는 용도
+        self.seed, self.rng = None, random.Random() # 게임 로직의 모든 무작위 요소는 self.rng 사용 (reset에서 시드 설정)
+        self.recorder = InputRecorder(record) if record else None # 입력 기록 (리플레이)
+        self.scenes = SceneStack() # 화면 장면 스택 (Game.run의 단일 루프가 맨 위 장면을 실행)
+        self.scene_cache = {} # 장면 종류 -> 장면 객체 (버튼 등은 한 번만 생성)
+        self.playing = False # 게임 한 판이 진행 중인지
+        self.quit_on_game_over = False # True면 게임 오버 시 메인 메뉴 대신 종료 (리플레이 재생)
+        self.stress = stress # 보스 탄막 스트레스 모드 (발사마다 총알 수 BOSS_STRESS_SCALE배)
+        self.player = None
         
-        self.load_data() # 리소스 로드는 게임 객체 생성 시 한 번만
+        self.load_data() # 시작 메뉴에 필요한 리소스만 먼저 (나머지는 워커 스레드에서 디코딩 시작, ensure_loaded에서 마무리)
+        self.loaded = False # 게임용 리소스 준비 여부
         self.player_has_bomb = False # 플레이어가 폭탄 아이템을 가지고 있는지 여부
         self.boss = None # 보스 객체 초기화
         self.boss_spawned = False # 보스가 이미 스폰되었는지 확인하는 플래그
@@ -44,28 +85,33 @@ class Game:
         # 배경 모듈 초기화
         self.background = Background(self) # Background 객체 생성 시 game 인스턴스 전달
 
+        # 충돌 검사용 공간 해시 (매 스텝 그룹별로 다시 구성)
+        self.bullet_grid = SpatialHash()
+        self.mob_bullet_grid = SpatialHash(circle=True)
+        self.mob_grid = SpatialHash(circle=True)
+        self.powerup_grid = SpatialHash()
+
+        # 총알이 많으면 NumPy 투사체 엔진으로 처리 (NumPy가 없거나 꺼져 있으면 항상 Bullet/MobBullet 스프라이트 사용)
+        # 엔진과 스프라이트 총알은 같은 궤적/충돌 규칙을 따르므로 한 화면에 섞여 있어도 됩니다.
+        self.projectiles = ProjectileSystem() if USE_PROJECTILE_ENGINE and np is not None else None
+        self.engine_threshold = PROJECTILE_ENGINE_THRESHOLD
+        self.startup_phases['menu_ready_ms'] = (time.perf_counter() - self.startup_start) * 1000
+
     # 텍스트 그리기 함수 (이동하지 않고 여기에 유지)
     def draw_text(self, surf, text, size, x, y, color, align="midtop", shadow=False):
-        font = pygame.font.Font(self.font_name, size)
-        text_surface = font.render(text, True, color)
+        # 캐시에서 텍스트(+그림자) Surface를 가져옵니다. 값이 바뀐 경우에만 새로 렌더링됩니다.
+        text_surface, shadow_surface = self.text_cache.render(text, size, color, shadow)
         text_rect = text_surface.get_rect()
-        
-        if align == "midtop": text_rect.midtop = (x, y)
-        elif align == "topleft": text_rect.topleft = (x, y)
-        elif align == "center": text_rect.center = (x, y)
-        elif align == "midbottom": text_rect.midbottom = (x, y)
-
-        if shadow:
-            shadow_surface = font.render(text, True, SHADOW)
-            shadow_rect = shadow_surface.get_rect()
+        setattr(text_rect, align, (x, y)) # "midtop", "topleft", "topright", "center", "midbottom" 등 Rect 속성 이름 사용
+
+        if shadow_surface is not None:
             shadow_offset = 2
-            if align == "midtop": shadow_rect.midtop = (x + shadow_offset, y + shadow_offset)
-            elif align == "topleft": shadow_rect.topleft = (x + shadow_offset, y + shadow_offset)
-            elif align == "center": shadow_rect.center = (x + shadow_offset, y + shadow_offset)
-            elif align == "midbottom": shadow_rect.midbottom = (x + shadow_offset, y + shadow_offset)
-            surf.blit(shadow_surface, shadow_rect)
+            surf.blit(shadow_surface, text_rect.move(shadow_offset, shadow_offset))
+            text_rect = text_rect.union(text_rect.move(shadow_offset, shadow_offset))
             
-        surf.blit(text_surface, text_rect)
+        surf.blit(text_surface, text_rect.topleft)
+        if surf is self.screen: self.renderer.add(text_rect) # 화면에 그린 영역 기록
+        return text_rect
         
     # HP 바 그리기 함수 (이동하지 않고 여기에 유지)
     def draw_hp_bar(self, surf, x, y, pct):
@@ -78,21 +124,37 @@ class Game:
         pygame.draw.rect(surf, color, fill_rect)
         pygame.draw.rect(surf, WHITE, outline_rect, 2)
     
+    # 시작 메뉴에 필요한 것(최고 점수, 구름 이미지, BGM 확인)만 바로 준비합니다.
+    # 나머지 이미지/사운드는 워커 스레드에서 디코딩을 시작해 두고, 첫 게임 시작 때 ensure_loaded()에서 받아 씁니다.
     def load_data(self):
-        # 최고 점수 로드
-        try:
-            with open(HIGHSCORE_FILE, 'r') as f:
-                self.highscore = int(f.read())
-        except:
-            self.highscore = 0
+        assets.preload(MENU_IMAGE_FILES + GAME_IMAGE_FILES + ([] if self.headless else SOUND_FILES)) # 없는 파일은 존재 확인만
+
+        # 점수 기록 저장소 (상위 기록 인덱스만 읽음, 헤드리스는 파일 없이 메모리에서만)
+        self.scores = ScoreStore(None if self.headless else SCORE_LOG_FILE)
+        self.highscore = self.scores.best()
         
+        # 구름 이미지 로드 (없으면 Fallback은 Background 클래스에서 처리)
+        self.cloud_img1 = load_image('cloud1.png', (random.randrange(100,200), random.randrange(50,100)))
+        self.cloud_img2 = load_image('cloud2.png', (random.randrange(100,200), random.randrange(50,100)))
+        self.cloud_img3 = load_image('cloud3.png', (random.randrange(100,200), random.randrange(50,100)))
+
+        # BGM은 재생할 때 mixer.music이 파일에서 읽으므로, 여기서는 파일이 있는지만 확인 (bgm.ogg, menu_bgm.ogg는 제공됨)
+        self.bgm_loaded = not self.headless and os.path.isfile(os.path.join(IMAGE_FOLDER, 'bgm.ogg'))
+        self.menu_bgm_loaded = not self.headless and os.path.isfile(os.path.join(IMAGE_FOLDER, 'menu_bgm.ogg'))
+        if not self.headless and not self.bgm_loaded: print("Warning: 'bgm.ogg' not found. Game will run without game BGM.")
+        if not self.headless and not self.menu_bgm_loaded: print("Warning: 'menu_bgm.ogg' not found. Menu will run without menu BGM.")
+
+    # 게임에 필요한 나머지 리소스를 준비합니다. 첫 게임이 시작될 때(reset) 한 번만 실행되며,
+    # 디코딩은 대부분 메뉴가 떠 있는 동안 워커 스레드에서 끝나 있으므로 여기서는 변환/스케일만 합니다.
+    def ensure_loaded(self):
+        if self.loaded: return
+        start = time.perf_counter()
         # --- 이미지 로드 ---
         # 제공된 이미지만 로드, 없는 이미지는 빈 Surface로 Fallback 처리
-        self.mob_img_normal = load_image('mob.png', (40, 40))
-        self.mob_img_fast = load_image('mob_fast.png', (30, 30))
+        self.mob_images = {kind: load_image(filename, size) for kind, (filename, size, *_) in MOB_TYPES.items()} # 몹 종류별 이미지
         # self.mob_img_bomber = load_image('mob_bomber.png', (50, 50)) # 현재 사용하지 않으므로 주석 처리
         # self.shooter_img = load_image('shooter.png', (50, 40)) # 현재 사용하지 않으므로 주석 처리
-        # self.boss_img = load_image('boss.png', (200, 150)) # 보스는 나중에 추가 (이미지는 제공됨)
+        self.boss_img = load_image('boss.png', (200, 150)) # 보스 이미지 (Boss 스프라이트가 공유)
 
         self.shield_img = load_image('shield.png', (30, 30))
         self.twin_shot_img = load_image('twin_shot.png', (30, 30))
@@ -101,63 +163,85 @@ class Game:
         self.bomb_img = load_image('bomb.png', (30, 30)) # bomb.png는 제공됨
         self.magnet_img = load_image('magnet.png', (30, 30)) # magnet.png는 제공됨
 
-        # 구름 이미지 로드 (없으면 Fallback은 Background 클래스에서 처리)
-        self.cloud_img1 = load_image('cloud1.png', (random.randrange(100,200), random.randrange(50,100)))
-        self.cloud_img2 = load_image('cloud2.png', (random.randrange(100,200), random.randrange(50,100)))
-        self.cloud_img3 = load_image('cloud3.png', (random.randrange(100,200), random.randrange(50,100)))
+        # 마스크로 판정하는 이미지(플레이어, 보스)는 미리 마스크를 만들어 둠 (게임 중 from_surface 비용 없음)
+        for image in [self.boss_img] + [load_image(f'player_fly{i}.png', (60, 50)) for i in range(1, 4)]:
+            if image.get_width() > 0: masks.get(image)
 
-        # Explosion animation Fallback
-        self.explosion_anim = {'lg': [], 'sm': []}
-        found_expl_images = False
-        try:
-            for i in range(9):
-                img = load_image(f'expl{i}.png', (i*15 + 30, i*15 + 30))
-                if img.get_width() > 0: 
-                    self.explosion_anim['lg'].append(img)
-                    img_sm = pygame.transform.scale(img, (i*8 + 15, i*8 + 15))
-                    self.explosion_anim['sm'].append(img_sm)
-                    found_expl_images = True
-            if not found_expl_images: raise FileNotFoundError # 실제 이미지가 하나도 없으면 Fallback
-        except FileNotFoundError:
-            print("Warning: Explosion animation images not found. Using fallback shapes.")
-            for i in range(9):
-                img = pygame.Surface((i*15 + 30, i*15 + 30), pygame.SRCALPHA)
-                pygame.draw.circle(img, YELLOW, (img.get_width()//2, img.get_height()//2), i*7 + 15)
-                self.explosion_anim['lg'].append(img)
-                img_sm = pygame.transform.scale(img, (i*8 + 15, i*8 + 15))
-                self.explosion_anim['sm'].append(img_sm)
+        # 폭발 애니메이션: 크기 종류별로 한 번만 만들어 모든 Explosion이 공유 (이미지가 없으면 원 모양 Fallback)
+        self.explosion_anim = {size: assets.explosion_frames(size) for size in EXPLOSION_SIZES}
         
         # --- 사운드 로드 ---
-        # 사운드 파일이 없으면 더미 사운드 객체로 대체하여 오류 방지
-        class DummySound:
-            def play(self): pass
-
-        try: self.shoot_sound = pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'shoot.wav'))
-        except: self.shoot_sound = DummySound(); print("Warning: 'shoot.wav' not found.")
-        try: self.powerup_sound = pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'powerup.wav'))
-        except: self.powerup_sound = DummySound(); print("Warning: 'powerup.wav' not found.")
-        try: self.expl_sounds = [pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'expl1.wav')), pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'expl2.wav'))]
-        except: self.expl_sounds = [DummySound(), DummySound()]; print("Warning: Explosion sounds not found.")
-        try: self.enemy_shoot_sound = pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'enemy_shoot.wav'))
-        except: self.enemy_shoot_sound = DummySound(); print("Warning: 'enemy_shoot.wav' not found.")
-        try: self.player_hit_sound = pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'player_hit.wav'))
-        except: self.player_hit_sound = DummySound(); print("Warning: 'player_hit.wav' not found.")
-        try: self.bomb_sound = pygame.mixer.Sound(os.path.join(IMAGE_FOLDER, 'bomb.wav'))
-        except: self.bomb_sound = DummySound(); print("Warning: 'bomb.wav' not found.")
-        
-        # BGM 로드 (bgm.ogg, menu_bgm.ogg는 제공됨)
-        self.bgm_loaded = False; self.menu_bgm_loaded = False
-        try: pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, 'bgm.ogg')); self.bgm_loaded = True
-        except: print("Warning: 'bgm.ogg' not found. Game will run without game BGM.")
-        try: 
-            pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, 'menu_bgm.ogg')); self.menu_bgm_loaded = True
-            pygame.mixer.music.stop() # Ensure menu_bgm is not playing initially
-        except: print("Warning: 'menu_bgm.ogg' not found. Menu will run without menu BGM.")
-
-    def new(self):
-        self.score, self.stage = 0, 1 # 스테이지는 일단 단순화
+        # 채널 그룹/동시 재생 제한을 관리하는 사운드 매니저. 없는 사운드는 DummySound로 대체되고, 헤드리스 모드는 오디오를 전혀 사용하지 않음
+        self.sounds = SoundManager(enabled=not self.headless)
+        self.sounds.load_all()
+
+        # 게임 중 스프라이트가 쓰는 이미지를 미리 로드해 두어, 시작 이후에는 디스크 읽기가 없도록 합니다.
+        load_image('bullet.png', (15, 30))
+        for i in range(1, 4): load_image(f'player_fly{i}.png', (60, 50))
+
+        # 자주 생성/제거되는 스프라이트는 미리 만들어 둔 풀에서 재사용합니다.
+        self.bullet_pool = SpritePool(lambda: Bullet(0, 0, YELLOW), BULLET_POOL_SIZE)
+        self.mob_bullet_pool = SpritePool(lambda: MobBullet(self, 0, 0), MOB_BULLET_POOL_SIZE)
+        self.explosion_pool = SpritePool(lambda: Explosion(self, (0, 0), 'sm'), EXPLOSION_POOL_SIZE)
+
+        # 시작 시 로드한 모든 스프라이트 이미지를 텍스처 아틀라스 하나에 모음 (이후 새 Fallback은 그릴 때 추가)
+        self.atlas = TextureAtlas() if USE_ATLAS else None
+        if self.atlas is not None: self.atlas.sync(assets)
+        assets.mark_startup_complete()
+        self.loaded = True
+        self.startup_phases['game_load_ms'] = (time.perf_counter() - start) * 1000 # 첫 게임 시작 시 기다린 시간
+        self.write_startup_log()
+
+    # 시작 시간 분석을 파일에 기록합니다. (단계별 경과 시간 + 에셋별 디코딩/대기/변환/스케일 시간)
+    # 헤드리스 실행(소크 테스트, 벤치마크)에서는 파일을 남기지 않습니다.
+    def write_startup_log(self):
+        if self.headless: return
+        phases = ', '.join(f"{name} {ms:.0f}" for name, ms in self.startup_phases.items())
+        try:
+            with open(STARTUP_LOG_FILE, 'w', encoding='utf-8') as f: f.write('\n'.join([f"startup (ms): {phases}"] + assets.startup_report()) + '\n')
+        except OSError: pass
+        print(f"Startup (ms): {phases}")
+
+    # 새 게임을 시작하고 게임 장면으로 전환합니다.
+    def new(self, seed=None):
+        self.reset(seed)
+        self.play_music('bgm.ogg', self.bgm_loaded)
+        self.show_scene(GameScene)
+
+    # 게임 한 판이 끝났을 때 (게임 오버, 리플레이 종료, 일시정지 메뉴에서 재시작/메인 메뉴)
+    def finish_game(self):
+        self.playing = False
+        self.save_replay()
+        if self.bgm_loaded: pygame.mixer.music.fadeout(500) # BGM 페이드아웃
+
+    # BGM 반복 재생 (파일이 있을 때만)
+    def play_music(self, filename, available):
+        if not available: return
+        try: pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, filename))
+        except pygame.error: return
+        pygame.mixer.music.play(loops=-1)
+
+    # 장면 객체는 종류별로 한 번만 만들어 재사용합니다.
+    def get_scene(self, scene_class):
+        scene = self.scene_cache.get(scene_class)
+        if scene is None: scene = self.scene_cache[scene_class] = scene_class(self)
+        return scene
+
+    def show_scene(self, scene_class): self.scenes.replace(self.get_scene(scene_class)) # 스택을 비우고 전환
+    def push_scene(self, scene_class): self.scenes.push(self.get_scene(scene_class)) # 현재 장면 위에 쌓음 (pop으로 돌아옴)
+
+    # 새 게임 상태 초기화 (창 모드/헤드리스 공통). seed가 없으면 새 시드를 뽑습니다.
+    def reset(self, seed=None):
+        self.ensure_loaded() # 첫 게임이면 게임용 리소스 준비
+        self.sim_clock.reset() # 새 게임은 시뮬레이션 시간 0부터 시작
+        self.seed = seed if seed is not None else self.seed_source.randrange(2**32)
+        self.rng.seed(self.seed)
+        if self.recorder is not None: self.recorder.start(self.seed)
+        for sprite in getattr(self, 'all_sprites', ()): sprite.kill() # 이전 게임의 스프라이트 정리 (풀 스프라이트는 풀로 반납)
+        if self.projectiles is not None: self.projectiles.clear()
+        self.score = 0
         # 모든 스프라이트 그룹 초기화
-        self.all_sprites = pygame.sprite.Group()
+        self.all_sprites = RenderGroup() # 레이어 순서로 정렬, 아틀라스에서 한 번에 그림
         self.mobs = pygame.sprite.Group()
         self.bullets = pygame.sprite.Group()
         self.mob_bullets = pygame.sprite.Group() # 적 총알 그룹 (보스 활성화 시 사용)
@@ -168,35 +252,58 @@ class Game:
         self.player = Player(self) # Player 객체 생성 시 game 인스턴스 전달
         self.all_sprites.add(self.player)
 
-        # 몹 스폰 로직 단순화
-        self.max_mobs = 8 # 한 화면에 최대로 나올 몹 수
-        self.mob_spawn_delay = 1000 # 몹 스폰 간격 (ms)
-        self.last_mob_spawn_time = pygame.time.get_ticks()
-
         self.player_has_bomb = False # 게임 시작 시 폭탄 아이템 초기화
         self.boss = None # 보스 객체 초기화
         self.boss_spawned = False # 보스가 이미 스폰되었는지 확인하는 플래그 (new 게임 시작 시 초기화)
+        self.waves = WaveScheduler(self) # 스테이지 1부터 몹 웨이브 시작 (stage, max_mobs 설정)
 
         self.player_has_bomb = False # 게임 시작 시 폭탄 아이템 초기화
+        self.playing = True
 
-        if self.bgm_loaded: 
-            pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, 'bgm.ogg'))
-            pygame.mixer.music.play(loops=-1)
-        self.run()
-
+    # 단일 메인 루프: 이벤트는 장면 스택 맨 위 장면에만 전달하고, 그 장면의 update/draw를 실행합니다.
+    # 창 닫기와 프로파일러 키(F3: 오버레이 켜기/끄기, F4: CSV 저장)는 모든 장면에서 공통으로 처리합니다.
     def run(self):
-        self.playing = True
-        while self.playing:
-            self.clock.tick(FPS)
-            self.events() # 이벤트 처리
-            if not self.paused: # 일시정지 상태가 아닐 때만 업데이트
-                self.update()
-            self.draw() # 화면 그리기
-        if self.bgm_loaded: pygame.mixer.music.fadeout(500) # 게임 오버 시 BGM 페이드아웃
+        while self.running and self.scenes.top is not None:
+            real_ms = self.clock.tick(FPS)
+            self.profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: self.running = False
+                elif event.type == pygame.KEYUP and event.key == pygame.K_F3: self.profiler.toggle()
+                elif event.type == pygame.KEYUP and event.key == pygame.K_F4 and self.profiler.rows: print(f"Profile saved: {self.profiler.dump_csv()}")
+                else: self.scenes.top.handle_event(event)
+            self.profiler.mark('events')
+            scene = self.scenes.top
+            scene.update(real_ms)
+            self.profiler.mark('scene.update')
+            self.scenes.top.draw() # update 중에 장면이 바뀌었으면 새 장면을 그림
+            self.profiler.mark('scene.draw')
+            self.profiler.end_frame(self.entity_counts, type(scene).__name__)
+        if self.playing: self.save_replay() # 게임 도중에 창을 닫음
+
+    # 헤드리스 실행: 이벤트/렌더링/프레임 제한 없이 Game.update만 최대한 빠르게 반복합니다.
+    # 게임 오버가 되면 restart=True일 때 새 게임을 시작합니다. 실행 통계를 dict로 반환합니다.
+    def run_headless(self, frames, restart=True, seed=None):
+        self.reset(seed)
+        games, start = 1, time.perf_counter()
+        for frame in range(frames):
+            self.profiler.begin_frame()
+            self.step() # 실제 시간과 무관하게 스텝 진행 (실시간보다 빠르게 실행)
+            self.profiler.end_frame(self.entity_counts)
+            if not self.playing:
+                self.save_replay()
+                if not restart: frames = frame + 1; break
+                games += 1; self.reset()
+        elapsed = time.perf_counter() - start
+        if self.playing: self.save_replay()
+        return {'frames': frames, 'games': games, 'seconds': elapsed, 'fps': frames / elapsed if elapsed > 0 else float('inf'), 'checksum': state_checksum(self)}
+
+    # 마지막 게임의 입력 기록을 저장합니다. (기록 중일 때만, 같은 경로에 덮어씀)
+    def save_replay(self):
+        if self.recorder is not None and self.recorder.frames: self.recorder.save(state_checksum(self))
     
     def player_hit(self):
         if not self.player.hidden: # 플레이어가 숨겨진(무적) 상태가 아닐 때만
-            self.player_hit_sound.play()
+            self.sounds.play('player_hit')
             if self.player.shield > 0: # 쉴드가 있다면 쉴드 먼저 감소
                 self.player.shield -= 1
                 self.player.show_pop_up("쉴드 파괴!")
@@ -209,171 +316,141 @@ class Game:
                 self.player.hide()
 
     def activate_bomb(self):
-        self.bomb_sound.play() # 폭탄 사운드
+        self.sounds.play('bomb') # 폭탄 사운드
         self.player.show_pop_up("폭탄 사용!")
         for mob in self.mobs: # 모든 몹 제거
-            self.all_sprites.add(Explosion(self, mob.rect.center, 'sm'))
-            random.choice(self.expl_sounds).play()
+            self.all_sprites.add(self.explosion_pool.acquire(mob.rect.center, 'sm'))
+            self.sounds.play('explosion') # 같은 순간의 폭발음은 사운드 매니저가 한 번으로 합침
             self.score += 50
             mob.kill()
-        for bullet in self.mob_bullets: bullet.kill() # 모든 적 총알 제거
+        self.clear_mob_bullets() # 모든 적 총알 제거
+
+    def clear_mob_bullets(self):
+        for bullet in self.mob_bullets: bullet.kill()
+        if self.projectiles is not None: self.projectiles.clear(OWNER_ENEMY)
+
+    # 고정 시뮬레이션 스텝 하나: 보간용 이전 위치를 기록하고 시계를 진행한 뒤 update
+    def step(self):
+        for sprite in self.all_sprites: sprite.prev_pos = sprite.rect.topleft
+        self.sim_clock.step()
+        self.update()
 
     def update(self):
+        self.keys = self.input.poll() # 입력 소스에서 이번 프레임의 키 상태를 읽음
+        if self.recorder is not None: self.recorder.record(self.keys)
+        if self.projectiles is not None: self.projectiles.step() # 기존 투사체 이동 (이번 스텝에 새로 쏜 총알은 다음 스텝부터 이동)
         self.all_sprites.update()
+        self.profiler.mark('update.sprites')
         
-        # 몹 스폰 로직 (수정됨: 보스가 활성화되지 않았고, 특정 점수(예: 2000점)에 도달하지 않았으면 일반 몹 스폰)
-        now = pygame.time.get_ticks()
-        if not self.boss_spawned and self.score < 2000 and now - self.last_mob_spawn_time > self.mob_spawn_delay and len(self.mobs) < self.max_mobs:
-            self.last_mob_spawn_time = now
-            self.spawn_mob()
-
-        # 보스 스폰 조건 (수정됨: 특정 점수 도달 시 보스 스폰)
-        if self.score >= 2000 and not self.boss_spawned: # 2000점 도달 시 보스 스폰
-            self.spawn_boss()
-            self.boss_spawned = True # 보스 스폰 플래그 설정
-            for mob in self.mobs: mob.kill() # 보스 등장 시 기존 몹 제거 (화면 정리)
+        # 몹 웨이브 스폰 (보스가 나오기 전까지), 스테이지의 보스 점수에 도달하면 보스 스폰
+        if not self.boss_spawned:
+            if self.waves.boss_due():
+                for mob in self.mobs: mob.kill() # 보스 등장 시 기존 몹 제거 (화면 정리, 보스가 mobs에 들어가기 전에)
+                self.spawn_boss()
+                self.boss_spawned = True # 보스 스폰 플래그 설정
+            else: self.waves.update(self.sim_clock.get_ticks())
+        self.profiler.mark('update.spawn')
 
         # 플레이어 총알과 몹 충돌 (보스와 일반 몹 모두) (수정됨: 보스 체력 처리 추가)
-        hits = pygame.sprite.groupcollide(self.mobs, self.bullets, False, True) # 몹 제거는 체력 감소 후 결정
+        # 모든 충돌 검사는 공간 해시로 후보를 좁힌 뒤, 스프라이트마다 선언된 히트 모양(hitshapes)으로 검사합니다.
+        self.bullet_grid.build(self.bullets)
+        hits = self.bullet_grid.groupcollide(self.mobs, True, collide)
+        if self.projectiles is not None and self.projectiles.count: # 엔진 총알 (몹 제거는 체력 감소 후 결정)
+            engine_hits = self.projectiles.collide_mobs(self.mobs)
+            if hits and engine_hits: hits = [mob for mob in self.mobs if mob in hits or mob in engine_hits] # 몹 그룹 순서로 합침
+            elif engine_hits: hits = engine_hits
         for mob_hit in hits:
             if mob_hit == self.boss: # 충돌한 것이 보스라면
                 self.boss.hp -= 10 # 보스 체력 감소 (총알 피해)
                 if self.player_has_bomb: # 플레이어가 폭탄 아이템을 가지고 있으면 더 큰 피해
                     self.boss.hp -= 30 # 폭탄 총알 효과 (기본 총알보다 강함)
                 if self.boss.hp <= 0: # 보스 사망
-                    self.all_sprites.add(Explosion(self, self.boss.rect.center, 'lg')) # 큰 폭발
-                    if random.choice(self.expl_sounds): random.choice(self.expl_sounds).play()
+                    self.all_sprites.add(self.explosion_pool.acquire(self.boss.rect.center, 'lg')) # 큰 폭발
+                    self.sounds.play('explosion')
                     self.score += 1000 # 보스 처치 점수
                     self.boss.kill() # 보스 제거
                     self.boss = None
-                    self.boss_spawned = False # 다음 게임을 위해 리셋
+                    self.boss_spawned = False # 다음 스테이지의 보스를 위해 리셋
+                    self.waves.start_stage(self.stage + 1) # 다음 스테이지 웨이브 시작
                     self.player.show_pop_up("보스 처치!")
                     # 보스가 죽으면 화면의 모든 적 총알 제거
-                    for bullet in self.mob_bullets: bullet.kill()
+                    self.clear_mob_bullets()
                 else:
-                    if self.game_hit_sound: self.game_hit_sound.play() # 보스 피격 사운드 (선택 사항)
-            else: # 일반 몹 사망 처리
-                mob_hit.kill() # 일반 몹은 바로 제거
-                if random.choice(self.expl_sounds): random.choice(self.expl_sounds).play()
-                self.all_sprites.add(Explosion(self, mob_hit.rect.center, 'sm'))
-                self.score += 50
-                if random.random() > 0.9: 
+                    self.sounds.play('boss_hit') # 보스 피격 사운드
+            else: # 일반 몹 피격 (HP가 0이 되면 제거)
+                mob_hit.hp -= 1
+                if mob_hit.hp > 0: continue
+                mob_hit.kill()
+                self.sounds.play('explosion')
+                self.all_sprites.add(self.explosion_pool.acquire(mob_hit.rect.center, 'sm'))
+                self.score += mob_hit.points # 몹 종류별 처치 점수
+                if self.rng.random() > 0.9: 
                     powerup = Powerup(self, mob_hit.rect.center)
                     self.all_sprites.add(powerup)
                     self.powerups.add(powerup)
-                if not self.boss: self.spawn_mob() # 보스가 살아있지 않을 때만 일반 몹 스폰
-
+        self.profiler.mark('update.collide_bullets')
 
         # 몹 총알과 플레이어 충돌 (수정됨: mob_bullets 그룹 활성화 및 보스 총알 처리)
         # 보스 총알과 일반 몹 총알이 모두 이 그룹에 들어갑니다.
-        hits = pygame.sprite.spritecollide(self.player, self.mob_bullets, True, pygame.sprite.collide_circle)
+        self.mob_bullet_grid.build(self.mob_bullets)
+        hits = self.mob_bullet_grid.spritecollide(self.player, True, collide)
+        if self.projectiles is not None and self.projectiles.count:
+            if self.projectiles.collide_player(self.player): hits = True
         if hits: self.player_hit()
+        self.profiler.mark('update.collide_mob_bullets')
 
         # 몹과 플레이어 충돌 (수정됨: 보스 포함)
-        hits = pygame.sprite.spritecollide(self.player, self.mobs, False, pygame.sprite.collide_circle) # 몹 제거는 체력 감소 후 결정
+        self.mob_grid.build(self.mobs)
+        hits = self.mob_grid.spritecollide(self.player, False, collide) # 몹 제거는 체력 감소 후 결정
         for mob_hit in hits:
             if mob_hit == self.boss: # 보스와 충돌
                 self.player_hit()
                 # 보스는 플레이어와 충돌해도 사라지지 않고 체력만 깎이도록 (선택 사항)
                 self.boss.hp -= 20 # 플레이어와 충돌 시 보스 체력 감소
                 if self.boss.hp <= 0:
-                    self.all_sprites.add(Explosion(self, self.boss.rect.center, 'lg'))
-                    if random.choice(self.expl_sounds): random.choice(self.expl_sounds).play()
+                    self.all_sprites.add(self.explosion_pool.acquire(self.boss.rect.center, 'lg'))
+                    self.sounds.play('explosion')
                     self.score += 1000
                     self.boss.kill()
                     self.boss = None
                     self.boss_spawned = False
+                    self.waves.start_stage(self.stage + 1)
                     self.player.show_pop_up("보스 처치!")
-                    for bullet in self.mob_bullets: bullet.kill()
+                    self.clear_mob_bullets()
                 else:
-                    if self.game_hit_sound: self.game_hit_sound.play()
+                    self.sounds.play('boss_hit')
             else: # 일반 몹과 충돌
                 mob_hit.kill() # 일반 몹은 바로 제거
-                self.all_sprites.add(Explosion(self, mob_hit.rect.center, 'sm'))
-                if random.choice(self.expl_sounds): random.choice(self.expl_sounds).play()
+                self.all_sprites.add(self.explosion_pool.acquire(mob_hit.rect.center, 'sm'))
+                self.sounds.play('explosion')
                 self.player_hit()
-                if not self.boss: self.spawn_mob()
+        self.profiler.mark('update.collide_mobs')
 
-        # 파워업 아이템과 플레이어 충돌
-        hits = pygame.sprite.spritecollide(self.player, self.powerups, True)
+        # 파워업 아이템과 플레이어 충돌 (아이템 획득은 넉넉하게 rect로 판정)
+        self.powerup_grid.build(self.powerups)
+        hits = self.powerup_grid.spritecollide(self.player, True)
         for powerup_item in hits: # powerup_item은 충돌한 Powerup 객체
             self.player.powerup(powerup_item.type)
+        self.profiler.mark('update.collide_powerups')
 
         if self.score > self.highscore: self.highscore = self.score
 
-    def events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.playing, self.running = False, False
-            if event.type == pygame.KEYUP and event.key == pygame.K_p:
-                self.paused = not self.paused
-                if self.paused:
-                    if pygame.mixer.music.get_busy(): pygame.mixer.music.pause()
-                    self.show_pause_menu() # 일시정지 메뉴 표시
-                else:
-                    pygame.mixer.music.unpause()
-            
-            # 마우스 이벤트 처리 - 시작 화면, 게임 오버 화면, 퍼즈 메뉴, 게임 방법, 크레딧 화면
-            mouse_pos = pygame.mouse.get_pos()
-            
-            # 시작 화면 버튼의 색상 업데이트 (게임이 실행 중이 아닐 때)
-            if hasattr(self, 'start_buttons') and not self.playing:
-                for button in self.start_buttons: button.update_color(mouse_pos)
-                if hasattr(self, 'credits_button'): self.credits_button.update_color(mouse_pos)
-            
-            # 게임 오버 화면 버튼의 색상 업데이트 (게임이 실행 중이 아니고, 플레이어 생명이 없을 때)
-            if hasattr(self, 'go_buttons') and not self.playing and self.player and not self.player.lives > 0:
-                for button in self.go_buttons: button.update_color(mouse_pos)
-            
-            # 일시정지 메뉴 버튼의 색상 업데이트 (일시정지 상태일 때)
-            if self.paused and hasattr(self, 'pause_buttons'):
-                for button in self.pause_buttons: button.update_color(mouse_pos)
-            
-            # 게임 방법 화면 버튼의 색상 업데이트
-            if hasattr(self, '_how_to_play_active') and self._how_to_play_active and hasattr(self, 'how_to_play_buttons'):
-                for button in self.how_to_play_buttons: button.update_color(mouse_pos)
-            
-            # 크레딧 화면 버튼의 색상 업데이트
-            if hasattr(self, '_credits_active') and self._credits_active and hasattr(self, 'credits_buttons'):
-                for button in self.credits_buttons: button.update_color(mouse_pos)
-
-
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                # 시작 화면 버튼 클릭
-                if hasattr(self, 'start_buttons') and not self.playing:
-                    for button in self.start_buttons:
-                        if button.handle_event(event, button.callback): break
-                    if hasattr(self, 'credits_button') and self.credits_button.handle_event(event, self.credits_button.callback):
-                        pass
-                # 게임 오버 화면 버튼 클릭
-                if hasattr(self, 'go_buttons') and not self.playing and self.player and not self.player.lives > 0:
-                    for button in self.go_buttons:
-                        if button.handle_event(event, button.callback): break
-                # 일시정지 메뉴 버튼 클릭
-                if self.paused and hasattr(self, 'pause_buttons'):
-                    for button in self.pause_buttons:
-                        if button.handle_event(event, button.callback): break
-                # 게임 방법 화면 버튼 클릭
-                if hasattr(self, '_how_to_play_active') and self._how_to_play_active and hasattr(self, 'how_to_play_buttons'):
-                    for button in self.how_to_play_buttons:
-                        if button.handle_event(event, button.callback): break
-                # 크레딧 화면 버튼 클릭
-                if hasattr(self, '_credits_active') and self._credits_active and hasattr(self, 'credits_buttons'):
-                    for button in self.credits_buttons:
-                        if button.handle_event(event, button.callback): break
-
-
-    def draw(self):
+    # present=False이면 화면에 보내지 않고 그리기만 합니다
+    def draw(self, present=True):
         # 배경 그리기
-        self.background.update_and_draw(self.screen)
-        self.all_sprites.draw(self.screen)
-        self.player.draw_magnet_aura(self.screen) # 자석 아우라 그리기
+        self.renderer.add_many(self.background.update_and_draw(self.screen, self.renderer.enabled))
+        self.profiler.mark('draw.background')
+        self.renderer.add_many(self.draw_sprites(self.screen, self.sim_clock.alpha))
+        if self.projectiles is not None: self.renderer.add_many(self.projectiles.draw(self.screen, self.sim_clock.alpha)) # 모든 총알을 한 번에 그림
+        self.renderer.add(self.player.draw_magnet_aura(self.screen)) # 자석 아우라 그리기
         # 보스 체력 바 그리기 (수정됨)
         if self.boss and self.boss.is_active: # 보스가 존재하고 활성화 상태일 때만 그립니다.
-            self.draw_boss_hp_bar(self.screen, self.boss)
+            self.renderer.add(self.draw_boss_hp_bar(self.screen, self.boss))
+        self.profiler.mark('draw.sprites')
 
         # UI 텍스트 그리기 (수정됨: 우측 정렬 및 X좌표 조정)
         self.draw_text(self.screen, f"생명: {self.player.lives}", 24, 60, 10, WHITE, align="topleft")
+        self.draw_text(self.screen, f"스테이지: {self.stage}", 24, 60, 40, WHITE, align="topleft")
         self.draw_text(self.screen, f"점수: {self.score}", 24, SCREEN_WIDTH / 2, 10, WHITE, shadow=True)
         self.draw_text(self.screen, f"최고 점수: {self.highscore}", 24, SCREEN_WIDTH / 2, 40, WHITE, shadow=True)
 
@@ -385,23 +462,66 @@ class Game:
 
         if self.player.pop_up_message: # 팝업 메시지 표시
             self.draw_text(self.screen, self.player.pop_up_message, 30, SCREEN_WIDTH / 2, SCREEN_HEIGHT - 50, CYAN, align="center", shadow=True)
+        self.profiler.mark('draw.hud')
+        self.renderer.add(self.profiler.draw(self.screen, self.text_cache)) # 프로파일러 오버레이 (켜져 있을 때만)
+        self.profiler.mark('draw.overlay')
 
-        pygame.display.flip() # 화면 업데이트
+        if present:
+            self.renderer.present() # 화면 업데이트 (바뀐 영역만 또는 전체)
+            self.profiler.mark('flip')
     
-    def spawn_mob(self):
-        self.all_sprites.add(Mob(self)) # Mob 객체 생성 시 game 인스턴스 전달
-        self.mobs.add(self.all_sprites.sprites()[-1])
+    # 그룹별 개체 수 (프로파일러 표시용). 투사체 엔진을 쓰면 엔진 안의 총알 수를 더합니다.
+    def entity_counts(self):
+        if self.player is None: return {} # 아직 게임을 시작하지 않음
+        bullets = len(self.bullets) + (self.projectiles.count_owner(OWNER_PLAYER) if self.projectiles is not None else 0)
+        return {'all_sprites': len(self.all_sprites), 'mobs': len(self.mobs), 'bullets': bullets, 'mob_bullets': self.mob_bullet_count(), 'powerups': len(self.powerups)}
+
+    # 화면의 적 총알 수 (스프라이트 + 투사체 엔진)
+    def mob_bullet_count(self):
+        return len(self.mob_bullets) + (self.projectiles.count_owner(OWNER_ENEMY) if self.projectiles is not None else 0)
+
+    # 마지막 두 시뮬레이션 스텝 사이를 alpha(0~1) 비율로 보간한 위치에 스프라이트를 그립니다.
+    # 이번 스텝에 생성되었거나 순간 이동(숨기기 등)한 스프라이트는 현재 위치에 그대로 그립니다.
+    def draw_sprites(self, surf, alpha):
+        if self.atlas is not None and self.atlas.version != assets.version: self.atlas.sync(assets) # 새로 생긴 이미지를 아틀라스에 추가
+        return self.all_sprites.draw_batched(surf, self.atlas, alpha, self.renderer.enabled) # 그린 영역 목록 반환 (더티 렉트 사용 시)
+
+    # 새 총알 n발을 투사체 엔진에 넣을지. 화면의 총알(엔진 + 스프라이트)이 engine_threshold 이상이 될 때만 엔진을 사용합니다.
+    def use_engine(self, n=1):
+        return self.projectiles is not None and len(self.bullets) + len(self.mob_bullets) + self.projectiles.count + n > self.engine_threshold
 
     def spawn_bullet(self, x, y, color, angle_offset=0):
-        self.all_sprites.add(Bullet(x,y,color,angle_offset))
-        self.bullets.add(self.all_sprites.sprites()[-1])
+        if self.use_engine(): # Bullet 생성 시와 같이 한 스텝 이동한 위치에서 시작
+            image = Bullet.get_image(color)
+            vx, vy = Bullet.velocity(angle_offset)
+            half_w, half_h = image.get_width() // 2, image.get_height() // 2
+            left, top = round_half_away(round_half_away(x) - half_w + vx), round_half_away(round_half_away(y) - half_h + vy)
+            self.projectiles.spawn(left + half_w, top + half_h, vx, vy, image, OWNER_PLAYER)
+            return
+        bullet = self.bullet_pool.acquire(x, y, color, angle_offset) # 풀에서 재사용
+        self.all_sprites.add(bullet)
+        self.bullets.add(bullet)
     
     # Game 클래스 내부에 추가 (기존 주석 처리된 부분 교체)
     def spawn_mob_bullet(self, x, y, target=None, speed=6):
-        bullet = MobBullet(self, x, y, target, speed) # MobBullet 생성 시 game 인스턴스 전달
+        if self.use_engine():
+            center = (round_half_away(x), round_half_away(y))
+            vx, vy = MobBullet.velocity(center, target, speed)
+            self.projectiles.spawn(center[0], center[1], vx, vy, MobBullet.get_image(), OWNER_ENEMY, MobBullet.RADIUS)
+            return
+        bullet = self.mob_bullet_pool.acquire(x, y, target, speed) # 풀에서 재사용
         self.all_sprites.add(bullet)
         self.mob_bullets.add(bullet)
 
+    # 적 총알 여러 발을 한 번에 추가합니다. (보스 탄막 패턴) xs, ys는 정수 중심 좌표, vxs, vys는 스텝당 속도
+    def spawn_mob_bullets(self, xs, ys, vxs, vys):
+        if self.use_engine(len(xs)):
+            self.projectiles.spawn_many(xs, ys, vxs, vys, MobBullet.get_image(), OWNER_ENEMY, MobBullet.RADIUS)
+            return
+        bullets = [self.mob_bullet_pool.acquire(x, y, velocity=(vx, vy)) for x, y, vx, vy in zip(xs, ys, vxs, vys)]
+        self.all_sprites.add(bullets)
+        self.mob_bullets.add(bullets)
+
     # Game 클래스 내부에 추가 (보스 스폰 함수)
     def spawn_boss(self):
         self.boss = Boss(self) # 보스 객체 생성
@@ -411,297 +531,18 @@ class Game:
         # BGM 변경 또는 보스 등장 효과음 재생 등 추가할 수 있습니다.
         self.player.show_pop_up("보스 등장!")
 
-    def show_start_screen(self):
-        self.background = Background(self) # 배경 업데이트를 위해 Background 인스턴스 사용
+    # 버튼들을 그리고 그린 영역을 렌더러에 기록합니다.
+    def draw_buttons(self, buttons):
+        for btn in buttons: self.renderer.add(btn.draw(self.screen))
 
-        if self.menu_bgm_loaded: 
-            try: pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, 'menu_bgm.ogg'))
-            except: pass
-            pygame.mixer.music.play(loops=-1)
+    # 버튼 색상(마우스 오버)이 바뀌었는지 반환합니다. 정적 화면은 바뀐 경우에만 다시 그립니다.
+    def update_button_colors(self, buttons, mouse_pos):
+        changed = False
+        for btn in buttons:
+            before = btn.current_color; btn.update_color(mouse_pos)
+            changed = changed or before != btn.current_color
+        return changed
 
-        # --- 버튼들을 while 루프 밖에서 미리 생성합니다. ---
-        button_width, button_height = 220, 60
-        button_font = pygame.font.Font(self.font_name, 32)
-        
-        start_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT * 0.60, button_width, button_height, "새로운 게임", button_font, BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        how_to_play_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT * 0.72, button_width, button_height, "게임 방법", button_font, BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        exit_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT * 0.84, button_width, button_height, "게임 종료", button_font, BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-
-        self.start_buttons = [start_button, how_to_play_button, exit_button]
-        start_button.callback = lambda: setattr(self, 'playing', True)
-        how_to_play_button.callback = self.show_how_to_play_screen
-        exit_button.callback = lambda: setattr(self, 'running', False)
-
-        # 크레딧 버튼도 이 시점에 생성합니다.
-        credits_button_size = (100, 30)
-        self.credits_button = Button(SCREEN_WIDTH - credits_button_size[0] - 10, SCREEN_HEIGHT - credits_button_size[1] - 10, credits_button_size[0], credits_button_size[1], "Credits", pygame.font.Font(self.font_name, 18), (80,80,80), (120,120,120), WHITE, border_radius=5)
-        self.credits_button.callback = self.show_credits_screen # 크레딧 화면 표시 함수 연결
-        # ----------------------------------------------------------------------------------
-
-        waiting = True
-        while waiting:
-            self.clock.tick(FPS)
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: waiting, self.running = False, False
-                if event.type == pygame.MOUSEMOTION:
-                    for btn in self.start_buttons: btn.update_color(mouse_pos)
-                    self.credits_button.update_color(mouse_pos) 
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    is_button_clicked = False
-                    for btn in self.start_buttons:
-                        if btn.handle_event(event, btn.callback):
-                            if btn == start_button: # "새로운 게임" 버튼
-                                if self.bgm_loaded: pygame.mixer.music.fadeout(500)
-                                waiting = False
-                            elif btn == exit_button: # "게임 종료" 버튼
-                                waiting = False
-                                self.running = False
-                            is_button_clicked = True
-                            break
-                    if not is_button_clicked and self.credits_button.handle_event(event, self.credits_button.callback):
-                        pass
-            
-            self.background.update_and_draw(self.screen) # 별/구름 배경 그리기
-            
-            # 메인 제목
-            self.draw_text(self.screen, "FLY DRAGON", 72, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4 - 50, YELLOW, shadow=True) # 제목을 더 위로
-            self.draw_text(self.screen, "우주로 날아오른 용의 전설", 28, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4 + 20, WHITE, shadow=True) # 소제목 위치 조정
-            self.draw_text(self.screen, f"최고 점수: {self.highscore}", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20, WHITE)
-
-            # 미리 생성된 버튼들을 그리기만 합니다.
-            for btn in self.start_buttons: btn.draw(self.screen)
-            self.credits_button.draw(self.screen) # 크레딧 버튼 그리기
-            
-            pygame.display.flip()
-
-    def show_go_screen(self):
-        if not self.running: return # 게임이 이미 종료 중이면 실행하지 않음
-
-        if self.score > self.highscore:
-            self.highscore = self.score
-            with open(HIGHSCORE_FILE, 'w') as f: f.write(str(self.highscore))
-
-        # 배경을 다시 그리기
-        self.background.update_and_draw(self.screen)
-        
-        # 반투명 오버레이
-        go_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        go_overlay.fill(DARK_GREY)
-        self.screen.blit(go_overlay, (0,0))
-
-        self.draw_text(self.screen, "게임 오버", 64, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4, RED, shadow=True)
-        self.draw_text(self.screen, f"점수: {self.score}", 28, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, WHITE)
-        self.draw_text(self.screen, f"최고 점수: {self.highscore}", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4 - 30, WHITE)
-        
-        button_width, button_height = 180, 50
-        restart_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT * 0.75, button_width, button_height, "재시작", pygame.font.Font(self.font_name, 30), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        main_menu_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT * 0.85, button_width, button_height, "메인 메뉴", pygame.font.Font(self.font_name, 30), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        
-        self.go_buttons = [restart_button, main_menu_button]
-        restart_button.callback = lambda: setattr(self, 'playing', True) # 재시작 콜백
-        main_menu_button.callback = self.show_start_screen # 메인 메뉴 콜백
-
-        if self.menu_bgm_loaded: 
-            try: pygame.mixer.music.load(os.path.join(IMAGE_FOLDER, 'menu_bgm.ogg'))
-            except: pass
-            pygame.mixer.music.play(loops=-1)
-
-        waiting = True
-        while waiting:
-            self.clock.tick(FPS)
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: waiting, self.running = False, False
-                if event.type == pygame.KEYUP and event.key == pygame.K_SPACE: # 스페이스바 재시작
-                    if self.bgm_loaded: pygame.mixer.music.fadeout(500)
-                    waiting = False
-                if event.type == pygame.MOUSEMOTION:
-                    for btn in self.go_buttons: btn.update_color(mouse_pos)
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    for btn in self.go_buttons:
-                        if btn.handle_event(event, btn.callback):
-                            if btn == restart_button: # 재시작
-                                if self.bgm_loaded: pygame.mixer.music.fadeout(500)
-                            elif btn == main_menu_button: # 메인 메뉴로
-                                pass # show_start_screen에서 음악 처리
-                            waiting = False
-                            break
-            
-            # 여기서 배경과 오버레이를 다시 그려야 버튼 위에 다른 UI가 겹치지 않음
-            self.background.update_and_draw(self.screen)
-            self.screen.blit(go_overlay, (0,0))
-            self.draw_text(self.screen, "게임 오버", 64, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4, RED, shadow=True)
-            self.draw_text(self.screen, f"점수: {self.score}", 28, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, WHITE)
-            self.draw_text(self.screen, f"최고 점수: {self.highscore}", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4 - 30, WHITE)
-
-            for btn in self.go_buttons: btn.draw(self.screen)
-            pygame.display.flip()
-
-    def show_pause_menu(self):
-        self._paused_flag = True
-        
-        pause_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        pause_overlay.fill(DARK_GREY) # 반투명 회색 오버레이
-
-        button_width, button_height = 200, 60
-        resume_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT / 2 - 100, button_width, button_height, "계속하기", pygame.font.Font(self.font_name, 35), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        restart_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT / 2, button_width, button_height, "재시작", pygame.font.Font(self.font_name, 35), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        main_menu_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT / 2 + 100, button_width, button_height, "메인 메뉴", pygame.font.Font(self.font_name, 35), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        
-        self.pause_buttons = [resume_button, restart_button, main_menu_button]
-
-        # 콜백 함수 정의
-        def resume_game(): self.paused, self._paused_flag = False, False
-        def restart_game(): 
-            self.paused, self.playing, self._paused_flag = False, False, False 
-            if self.bgm_loaded: pygame.mixer.music.fadeout(500)
-        def go_to_main_menu(): 
-            self.paused, self.playing, self.running, self._paused_flag = False, False, False, False 
-            if self.bgm_loaded: pygame.mixer.music.fadeout(500)
-
-        resume_button.callback = resume_game
-        restart_button.callback = restart_game
-        main_menu_button.callback = go_to_main_menu
-
-        while self._paused_flag and self.paused:
-            self.clock.tick(FPS)
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: self.running, self.playing, self._paused_flag = False, False, False
-                if event.type == pygame.KEYUP and event.key == pygame.K_p: # P키로 일시정지 해제
-                    resume_game()
-                    break
-                if event.type == pygame.MOUSEMOTION:
-                    for btn in self.pause_buttons: btn.update_color(mouse_pos)
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    for btn in self.pause_buttons:
-                        if btn.handle_event(event, btn.callback):
-                            break
-            
-            self.draw() # 기존 게임 화면 그리기
-            self.screen.blit(pause_overlay, (0, 0)) # 반투명 오버레이 덮기
-            self.draw_text(self.screen, "PAUSED", 72, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 200, WHITE, shadow=True)
-            for btn in self.pause_buttons: btn.draw(self.screen)
-            pygame.display.flip()
-        
-        if not self.paused and self.bgm_loaded:
-             pygame.mixer.music.unpause()
-
-
-    def show_how_to_play_screen(self):
-        self._how_to_play_active = True # 상태 플래그
-        
-        button_width, button_height = 150, 50
-        back_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT - 70, button_width, button_height, "뒤로 가기", pygame.font.Font(self.font_name, 25), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        self.how_to_play_buttons = [back_button]
-        back_button.callback = lambda: setattr(self, '_how_to_play_active', False)
-        
-        while self._how_to_play_active:
-            self.clock.tick(FPS)
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: self.running, self._how_to_play_active = False, False
-                if event.type == pygame.MOUSEMOTION:
-                    for btn in self.how_to_play_buttons: btn.update_color(mouse_pos)
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    for btn in self.how_to_play_buttons:
-                        if btn.handle_event(event, btn.callback): break
-            
-            self.screen.fill(BLACK)
-            self.draw_text(self.screen, "게임 방법", 60, SCREEN_WIDTH / 2, 40, WHITE, shadow=True)
-
-            text_start_x_left = 50 # 왼쪽 섹션 시작 X 좌표
-            text_start_x_right = SCREEN_WIDTH * 0.5 + 50 # 오른쪽 섹션 시작 X 좌표
-    
-
-            # 조작법 (왼쪽 정렬)
-            self.draw_text(self.screen, "--- 조작법 ---", 32, text_start_x_left, 120, YELLOW, align="topleft", shadow=True)
-            self.draw_text(self.screen, "이동: ← → ↑ ↓ (방향키)", 25, text_start_x_left, 170, WHITE, align="topleft")
-            self.draw_text(self.screen, "총알 발사: 자동", 25, text_start_x_left, 200, WHITE, align="topleft")
-            self.draw_text(self.screen, "일시정지: P", 25, text_start_x_left, 230, WHITE, align="topleft")
-            self.draw_text(self.screen, "폭탄 사용: Space Bar (아이템 획득 시)", 25, text_start_x_left, 260, WHITE, align="topleft")
-
-
-            # 아이템 설명 (오른쪽 정렬)
-            self.draw_text(self.screen, "--- 아이템 ---", 32, text_start_x_right, 120, YELLOW, align="topleft", shadow=True)
-
-            item_y_start = 170
-            item_line_height = 40 # 간격 좀 더 넓게
-            item_icon_size = (30, 30) # 아이콘 크기 통일
-
-            items_info = [
-                ('shield', "쉴드: 피격 방어 (최대 3회)", GREEN),
-                ('gun', "총알 강화: 총알 파워 증가 (최대 3단계)", BLUE),
-                ('speed', "속도 증가: 플레이어 이동 속도 증가", CYAN),
-                ('hp', "HP: 생명 1 증가 (최대 5)", RED),
-                ('bomb', "폭탄: 모든 적, 총알 제거 (보스에게 큰 피해)", ORANGE),
-                ('magnet', "자석: 주변 아이템 자동 획득", PURPLE)
-            ]
-            
-            # 아이템 설명 그리기
-            for item_type, desc, text_color in items_info:
-                # Powerup 클래스의 generate_fallback_image 메서드를 사용하여 이미지 생성
-                temp_powerup = Powerup(self, (0,0)) # game 인스턴스 전달 (임시용)
-                temp_powerup.type = item_type 
-                icon_image = temp_powerup.generate_fallback_image(item_icon_size)
-                
-                # 단, 제공된 이미지가 있을 경우 해당 이미지를 사용하도록 다시 로직 추가
-                if item_type == 'bomb' and self.bomb_img.get_width() > 0: icon_image = self.bomb_img
-                elif item_type == 'magnet' and self.magnet_img.get_width() > 0: icon_image = self.magnet_img
-                elif item_type == 'shield' and self.shield_img.get_width() > 0: icon_image = self.shield_img
-                elif item_type == 'gun' and self.twin_shot_img.get_width() > 0: icon_image = self.twin_shot_img
-                elif item_type == 'speed' and self.speed_img.get_width() > 0: icon_image = self.speed_img
-                elif item_type == 'hp' and self.hp_img.get_width() > 0: icon_image = self.hp_img
-
-                icon_rect = icon_image.get_rect(midleft=(text_start_x_right, item_y_start + item_line_height / 2)) # X 위치 조정
-                self.screen.blit(icon_image, icon_rect)
-                self.draw_text(self.screen, desc, 20, text_start_x_right + item_icon_size[0] + 10, item_y_start + 5, text_color, align="topleft") # 텍스트 X 위치 조정
-                item_y_start += item_line_height
-
-
-            for btn in self.how_to_play_buttons: btn.draw(self.screen)
-            pygame.display.flip()
-
-    def show_credits_screen(self):
-        self._credits_active = True
-        
-        button_width, button_height = 150, 50
-        back_button = Button(SCREEN_WIDTH / 2 - button_width / 2, SCREEN_HEIGHT - 70, button_width, button_height, "뒤로 가기", pygame.font.Font(self.font_name, 25), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
-        self.credits_buttons = [back_button] # 이 화면 전용 버튼 리스트
-        back_button.callback = lambda: setattr(self, '_credits_active', False)
-        
-        while self._credits_active:
-            self.clock.tick(FPS)
-            mouse_pos = pygame.mouse.get_pos()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: self.running, self._credits_active = False, False
-                if event.type == pygame.MOUSEMOTION:
-                    for btn in self.credits_buttons: btn.update_color(mouse_pos)
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    for btn in self.credits_buttons:
-                        if btn.handle_event(event, btn.callback): break
-            
-            self.screen.fill(BLACK)
-            self.draw_text(self.screen, "Credits", 60, SCREEN_WIDTH / 2, 80, WHITE, shadow=True)
-
-            # 크레딧 내용
-            credit_y = 200
-            line_height = 35
-            self.draw_text(self.screen, "개발:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
-            self.draw_text(self.screen, "김민철", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
-            
-            credit_y += line_height * 2
-            self.draw_text(self.screen, "코드 및 이미지 생성 도움:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
-            self.draw_text(self.screen, "ChatGPT (Python Code)", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
-            self.draw_text(self.screen, "DALL-E (Image Generation)", 25, SCREEN_WIDTH / 2, credit_y + line_height * 2, WHITE)
-
-            credit_y += line_height * 3.5
-            self.draw_text(self.screen, "음악 및 효과음:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
-            self.draw_text(self.screen, "OpenGameArt.org (비상업적 용도)", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
-
-            for btn in self.credits_buttons: btn.draw(self.screen)
-            pygame.display.flip()
     # Game 클래스 내부에 추가 (보스 체력 바 그리는 유틸리티 함수)
     def draw_boss_hp_bar(self, surf, boss):
         if boss.hp < 0: boss.hp = 0 # 체력이 0보다 낮아지지 않도록
@@ -713,13 +554,48 @@ class Game:
         pygame.draw.rect(surf, RED, fill_rect)
         pygame.draw.rect(surf, WHITE, outline_rect, 2)
         self.draw_text(surf, f"BOSS HP: {boss.hp}", 18, boss.rect.centerx, boss.rect.top - 28, WHITE, shadow=True)
+        return outline_rect # 그린 영역
         
 # --- 게임 실행 ---
-g = Game()
-g.show_start_screen()
-while g.running:
-    g.new() # 게임 시작 (new() 안에서 run()을 호출)
-    if not g.playing and g.running: # 게임 오버 후 메인 메뉴로 돌아가지 않고 실행 중일 때만
-        g.show_go_screen()
-        
-pygame.quit(); sys.exit()
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--headless', action='store_true', help="창/오디오 없이 시뮬레이션만 실행 (CI 소크 테스트)")
+    parser.add_argument('--frames', type=int, default=10000, help="헤드리스 모드에서 실행할 프레임 수")
+    parser.add_argument('--seed', type=int, default=None, help="헤드리스 무작위 입력의 시드")
+    parser.add_argument('--profile', metavar='CSV', help="프레임 단계별 프로파일러를 켜고, 종료 시 CSV로 저장")
+    parser.add_argument('--record', metavar='FILE', help="마지막 게임의 입력을 리플레이 파일로 저장")
+    parser.add_argument('--replay', metavar='FILE', help="리플레이 파일을 재생 (--headless와 함께 쓰면 최대 속도로 재생)")
+    parser.add_argument('--stress', action='store_true', help="보스 탄막 스트레스 모드 (발사마다 총알 수를 크게 늘림)")
+    args = parser.parse_args()
+    if args.stress and (args.record or args.replay): parser.error("--stress는 리플레이에 기록되지 않으므로 --record/--replay와 함께 쓸 수 없습니다")
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        g = Game(headless=args.headless, input_source=ReplayInput(replay), profile=bool(args.profile))
+        if args.headless:
+            result = g.run_headless(replay.frames, restart=False, seed=replay.seed)
+            print(f"replay: {result['frames']} frames, {result['seconds']:.2f}s ({result['fps']:.0f} FPS), score {g.score}")
+            checksum = result['checksum']
+        else:
+            g.quit_on_game_over = True
+            g.new(seed=replay.seed); g.run(); checksum = state_checksum(g)
+        if replay.checksum is not None: print("replay: state matches recording" if checksum == replay.checksum else "replay: state DIFFERS from recording")
+        if args.profile: print(f"Profile saved: {g.profiler.dump_csv(args.profile)}")
+        pygame.quit(); return
+
+    if args.headless:
+        g = Game(headless=True, input_source=RandomInput(args.seed), profile=bool(args.profile), seed=args.seed, record=args.record, stress=args.stress)
+        result = g.run_headless(args.frames)
+        print(f"headless: {result['frames']} frames, {result['games']} games, {result['seconds']:.2f}s ({result['fps']:.0f} FPS)")
+        if args.profile: print(f"Profile saved: {g.profiler.dump_csv(args.profile)}")
+        pygame.quit(); return
+
+    g = Game(profile=bool(args.profile), record=args.record, stress=args.stress)
+    g.show_scene(StartScene)
+    g.run()
+    g.scores.close() # 남은 점수 기록 쓰기를 마침
+    if args.profile: print(f"Profile saved: {g.profiler.dump_csv(args.profile)}")
+    pygame.quit(); sys.exit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import pygame
+
+# --- 스프라이트 오브젝트 풀 ---
+# 총알/폭발처럼 자주 생기고 사라지는 스프라이트를 재사용하여 매 프레임의 할당과 GC 멈춤을 줄입니다.
+# 풀에서 꺼낸 스프라이트는 reset(...)으로 초기화되고, kill() 되면(그룹에서 모두 빠지면) 자동으로 풀에 반납됩니다.
+# 따라서 all_sprites / bullets / mob_bullets 그룹 입장에서는 일반 스프라이트와 차이가 없습니다.
+
+class PooledSprite(pygame.sprite.Sprite):
+    # 풀에서 관리되는 스프라이트의 기본 클래스. 하위 클래스는 reset(...)을 구현해야 합니다.
+    pool = None # 이 스프라이트를 소유한 SpritePool (풀 밖에서 만들면 None)
+    in_pool = False # 현재 풀에 반납된 상태인지
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None: self.pool.release(self)
+
+class SpritePool:
+    def __init__(self, factory, capacity=0):
+        self.factory = factory # 인자 없이 새 스프라이트를 만드는 함수
+        self.free = []
+        self.hits, self.misses, self.releases = 0, 0, 0 # 재사용 / 새로 생성 / 반납 횟수
+        for _ in range(capacity): self.free.append(self._create(in_pool=True)) # 미리 할당
+
+    def _create(self, in_pool):
+        sprite = self.factory()
+        sprite.pool, sprite.in_pool = self, in_pool
+        return sprite
+
+    def acquire(self, *args, **kwargs):
+        if self.free: sprite = self.free.pop(); sprite.in_pool = False; self.hits += 1
+        else: sprite = self._create(in_pool=False); self.misses += 1
+        sprite.reset(*args, **kwargs)
+        return sprite
+
+    def release(self, sprite):
+        if sprite.in_pool: return # 이미 반납됨 (kill()이 여러 번 불린 경우)
+        sprite.in_pool = True; self.releases += 1
+        self.free.append(sprite)
+
+    def stats(self): return {'hits': self.hits, 'misses': self.misses, 'releases': self.releases, 'free': len(self.free)}
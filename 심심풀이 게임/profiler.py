@@ -0,0 +1,74 @@
+import pygame
+import time
+import csv
+from collections import deque
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 프레임 단계별 프로파일러 ---
+# 게임 코드 곳곳에서 mark(단계 이름)를 호출하면, 직전 mark 이후 흐른 시간이 그 단계에 더해집니다.
+# 한 프레임이 끝나면(end_frame) 장면 이름, 단계별 시간, 그룹별 개체 수를 링 버퍼에 한 줄로 기록하고, CSV로 저장할 수 있습니다.
+# scene.update/scene.draw는 장면의 update/draw 중 더 세분화된 단계로 잡히지 않은 나머지 시간입니다. (메뉴 화면 등)
+# 꺼져 있을 때 mark()는 enabled 확인 한 번만 하고 바로 반환합니다.
+PHASES = ('events', 'update.sprites', 'update.spawn', 'update.collide_bullets', 'update.collide_mob_bullets', 'update.collide_mobs',
+          'update.collide_powerups', 'draw.background', 'draw.sprites', 'draw.hud', 'draw.overlay', 'flip', 'scene.update', 'scene.draw')
+COUNTS = ('all_sprites', 'mobs', 'bullets', 'mob_bullets', 'powerups')
+
+class FrameProfiler:
+    def __init__(self, history=PROFILER_HISTORY, enabled=False):
+        self.enabled = enabled
+        self.rows = deque(maxlen=history) # (장면 이름, 프레임 전체 ms, 단계별 ms..., 개체 수...) 링 버퍼
+        self.phase_ms = dict.fromkeys(PHASES, 0.0) # 이번 프레임의 단계별 누적 시간
+        self.frame_start = self.last = 0.0
+        self.panel = None # 오버레이 반투명 배경 (처음 그릴 때 생성)
+        self.frames = 0 # 기록한 프레임 수
+        self.lines, self.lines_frame = [], -PROFILER_OVERLAY_REFRESH # 오버레이에 표시할 문자열 (주기적으로 갱신)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.rows.clear(); self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled: return
+        for phase in self.phase_ms: self.phase_ms[phase] = 0.0
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        if not self.enabled: return
+        now = time.perf_counter()
+        self.phase_ms[phase] += (now - self.last) * 1000 # 한 프레임에 여러 번 실행되는 단계(고정 스텝 update 등)는 합산
+        self.last = now
+
+    # counts_fn은 {그룹 이름: 개체 수} 를 반환하는 함수 (꺼져 있을 때는 호출하지 않음), scene은 이번 프레임의 장면 이름
+    def end_frame(self, counts_fn, scene='headless'):
+        if not self.enabled: return
+        counts = counts_fn(); self.frames += 1
+        self.rows.append((scene, (self.last - self.frame_start) * 1000) + tuple(self.phase_ms[p] for p in PHASES) + tuple(counts.get(c, 0) for c in COUNTS))
+
+    def dump_csv(self, path=None):
+        path = path or time.strftime('profile_%Y%m%d_%H%M%S.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('scene', 'frame_ms') + tuple(f"{p}_ms" for p in PHASES) + COUNTS)
+            writer.writerows([round(v, 4) if isinstance(v, float) else v for v in row] for row in self.rows)
+        return path
+
+    # 최근 PROFILER_OVERLAY_REFRESH 프레임의 평균/최대를 화면 좌측에 표시하고, 그린 영역을 반환합니다.
+    # 숫자가 매 프레임 바뀌면 텍스트 캐시가 소용없으므로 표시 내용은 일정 간격으로만 갱신합니다.
+    def draw(self, surf, text_cache):
+        if not self.enabled or not self.rows: return None
+        if self.frames - self.lines_frame >= PROFILER_OVERLAY_REFRESH:
+            self.lines_frame = self.frames
+            recent = [row[1:] for row in list(self.rows)[-PROFILER_OVERLAY_REFRESH:]] # 장면 이름을 뺀 숫자들
+            avg = [sum(col) / len(recent) for col in zip(*recent)]
+            worst = max(row[0] for row in recent)
+            self.lines = [("scene", self.rows[-1][0]), ("frame ms (max)", f"{avg[0]:.2f} ({worst:.2f})")] # (이름, 값) 쌍
+            self.lines += [(p, f"{avg[i + 1]:.2f}") for i, p in enumerate(PHASES)]
+            self.lines += [(c, f"{avg[len(PHASES) + 1 + i]:.0f}") for i, c in enumerate(COUNTS)]
+        if self.panel is None:
+            self.panel = pygame.Surface((250, 14 * (2 + len(PHASES) + len(COUNTS)) + 10), pygame.SRCALPHA); self.panel.fill(DARK_GREY)
+        rect = surf.blit(self.panel, (10, 70))
+        for i, (name, value) in enumerate(self.lines):
+            surf.blit(text_cache.render(name, 13, WHITE)[0], (15, 75 + i * 14))
+            text = text_cache.render(value, 13, YELLOW)[0]
+            surf.blit(text, text.get_rect(topright=(rect.right - 5, 75 + i * 14))) # 값은 오른쪽 정렬
+        return rect
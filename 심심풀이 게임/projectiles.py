@@ -0,0 +1,154 @@
+import math
+import pygame
+from settings import * # settings.py의 상수들을 사용합니다.
+from hitshapes import HIT_RECT, hit_shape, hits_rect, hits_circle
+
+try: import numpy as np # 선택 의존성: 없으면 Game은 기존 Bullet/MobBullet 스프라이트를 사용합니다.
+except ImportError: np = None
+
+OWNER_PLAYER, OWNER_ENEMY = 0, 1 # 발사 주체
+
+# pygame.Rect에 실수를 더할 때와 같은 반올림 (0.5는 0에서 먼 쪽으로)
+def round_half_away(value): return math.floor(value + 0.5) if value >= 0 else -math.floor(-value + 0.5)
+
+# --- NumPy 구조체 배열(SoA) 투사체 엔진 ---
+# 총알 하나하나를 Sprite로 만들지 않고, 위치/속도/크기/주인을 배열에 모아 한 번에 이동, 화면 밖 제거, 충돌 검사를 합니다.
+# 위치(x, y)는 총알 rect의 left/top 정수 좌표이며, 이동할 때 pygame.Rect와 똑같이 반올림하므로
+# 이동 궤적과 충돌 결과가 기존 Bullet/MobBullet 스프라이트와 같습니다.
+#  - 플레이어 총알 vs 몹: 플레이어 총알을 격자 칸에 등록한 뒤, 몹마다 같은 칸의 총알만 rect 겹침과 몹의 히트 모양으로 확인 (먼저 검사한 몹이 총알을 가져감, groupcollide와 동일)
+#  - 적 총알 vs 플레이어: 원이 플레이어 rect에 닿는지 배열로 검사한 뒤, 후보만 플레이어의 히트 모양으로 확인
+class ProjectileSystem:
+    FIELDS = ('x', 'y', 'vx', 'vy', 'w', 'h', 'radius', 'owner', 'kind')
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        self.count = 0
+        self.capacity = 0
+        self.images = [] # kind 번호 -> Surface
+        self.kinds = {} # Surface -> kind 번호
+        self.x = self.y = self.vx = self.vy = self.w = self.h = self.radius = None
+        self.owner = self.kind = None
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name in self.FIELDS:
+            dtype = np.int16 if name in ('owner', 'kind') else np.float64
+            new = np.zeros(capacity, dtype)
+            old = getattr(self, name)
+            if old is not None: new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def kind_for(self, image):
+        kind = self.kinds.get(image)
+        if kind is None:
+            kind = self.kinds[image] = len(self.images); self.images.append(image)
+        return kind
+
+    # 같은 이미지/주인의 투사체 여러 개를 한 번에 추가합니다.
+    # centers_x, centers_y는 rect 중심 좌표, vxs, vys는 스텝당 속도 (배열 또는 스칼라)
+    def spawn_many(self, centers_x, centers_y, vxs, vys, image, owner, radius=0):
+        centers_x = np.atleast_1d(np.asarray(centers_x, dtype=np.float64)); n = len(centers_x)
+        if n == 0: return
+        if self.count + n > self.capacity: self._grow(max(self.capacity * 2, self.count + n))
+        kind = self.kind_for(image)
+        w, h = image.get_width(), image.get_height()
+        s = slice(self.count, self.count + n)
+        self.x[s] = self._round(centers_x) - w // 2 # rect.center = (cx, cy) 와 같은 계산
+        self.y[s] = self._round(np.asarray(centers_y, dtype=np.float64)) - h // 2
+        self.vx[s], self.vy[s], self.w[s], self.h[s] = vxs, vys, w, h
+        self.radius[s], self.owner[s], self.kind[s] = radius, owner, kind
+        self.count += n
+
+    def spawn(self, center_x, center_y, vx, vy, image, owner, radius=0): self.spawn_many((center_x,), (center_y,), (vx,), (vy,), image, owner, radius)
+
+    @staticmethod
+    def _round(values): return np.trunc(values + np.copysign(0.5, values)) # round_half_away의 배열 버전
+
+    # keep 마스크가 True인 투사체만 남기고 배열 앞쪽으로 모읍니다.
+    def _compact(self, keep):
+        n = self.count; kept = int(np.count_nonzero(keep))
+        if kept == n: return
+        for name in self.FIELDS:
+            arr = getattr(self, name); arr[:kept] = arr[:n][keep]
+        self.count = kept
+
+    def clear(self, owner=None):
+        if owner is None: self.count = 0
+        else: self._compact(self.owner[:self.count] != owner)
+
+    def count_owner(self, owner): return int(np.count_nonzero(self.owner[:self.count] == owner))
+
+    # 시뮬레이션 한 스텝: 이동 후 화면 밖 투사체 제거 (기존 스프라이트와 같은 조건)
+    #  - 플레이어 총알: bottom < 0, right < 0, left > 화면 폭 이면 제거
+    #  - 적 총알: 화면을 사방 25px 넓힌 사각형과 겹치지 않으면 제거
+    def step(self):
+        n = self.count
+        if n == 0: return
+        x, y, w, h = self.x[:n], self.y[:n], self.w[:n], self.h[:n]
+        x[:] = self._round(x + self.vx[:n]); y[:] = self._round(y + self.vy[:n])
+        enemy = self.owner[:n] == OWNER_ENEMY
+        keep_enemy = (x + w > -25) & (x < SCREEN_WIDTH + 25) & (y + h > -25) & (y < SCREEN_HEIGHT + 25)
+        keep_player = (y + h >= 0) & (x + w >= 0) & (x <= SCREEN_WIDTH)
+        self._compact(np.where(enemy, keep_enemy, keep_player))
+
+    # 플레이어 총알 vs 몹. {몹: 맞은 총알 수} 를 반환하고 맞은 총알은 제거합니다.
+    def collide_mobs(self, mobs):
+        n = self.count
+        if n == 0 or not mobs: return {}
+        idx = np.flatnonzero(self.owner[:n] == OWNER_PLAYER) # 플레이어 총알만 (적 총알이 수천 발이어도 비용에 영향 없음)
+        if len(idx) == 0: return {}
+        left, top, w, h = (arr[idx].astype(np.int64).tolist() for arr in (self.x, self.y, self.w, self.h))
+        # broadphase: 총알을 SPATIAL_CELL_SIZE 칸에 등록 (SpatialHash와 같은 칸 계산)
+        size, cells = SPATIAL_CELL_SIZE, {}
+        for j in range(len(idx)):
+            for cx in range(left[j] // size, (left[j] + w[j] - 1) // size + 1):
+                for cy in range(top[j] // size, (top[j] + h[j] - 1) // size + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None: cells[(cx, cy)] = [j]
+                    else: bucket.append(j)
+        taken = set() # 이미 앞선 몹에 맞은 총알
+        hits = {}
+        for mob in mobs: # 몹 그룹 순서대로 검사하므로 먼저 검사한 몹이 총알을 가져감
+            rect = mob.rect
+            candidates = set()
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket: candidates.update(bucket)
+            if not candidates: continue
+            shape, count = hit_shape(mob), 0
+            for j in sorted(candidates - taken):
+                if not (rect.left < left[j] + w[j] and left[j] < rect.right and rect.top < top[j] + h[j] and top[j] < rect.bottom): continue
+                if shape != HIT_RECT and not hits_rect(mob, pygame.Rect(left[j], top[j], w[j], h[j])): continue # 몹의 히트 모양(원/마스크)으로 다시 확인
+                taken.add(j); count += 1
+            if count: hits[mob] = count
+        if not taken: return {}
+        keep = np.ones(n, bool); keep[idx[sorted(taken)]] = False
+        self._compact(keep)
+        return hits
+
+    # 적 총알 vs 플레이어. 맞은 총알 수를 반환하고 제거합니다.
+    def collide_player(self, player):
+        n = self.count
+        if n == 0: return 0
+        rect = player.rect
+        bx, by, radius = self.x[:n] + self.w[:n] // 2, self.y[:n] + self.h[:n] // 2, self.radius[:n] # 총알 원의 중심과 반지름
+        dx = bx - np.clip(bx, rect.left, rect.right); dy = by - np.clip(by, rect.top, rect.bottom)
+        hit = (self.owner[:n] == OWNER_ENEMY) & (dx * dx + dy * dy <= radius * radius) # 플레이어 rect에 닿는 총알 (히트 모양은 모두 rect 안에 있음)
+        if hit.any() and hit_shape(player) != HIT_RECT:
+            for j in np.flatnonzero(hit).tolist():
+                if not hits_circle(player, float(bx[j]), float(by[j]), float(radius[j])): hit[j] = False
+        hits = int(np.count_nonzero(hit))
+        if hits: self._compact(~hit)
+        return hits
+
+    # 모든 투사체를 Surface.blits 한 번으로 그리고 그린 영역 목록을 반환합니다.
+    # alpha는 렌더링 보간 비율입니다 (이전 스텝 위치 ≈ 현재 - 속도).
+    def draw(self, surf, alpha=1.0):
+        n = self.count
+        if n == 0: return []
+        back = 1.0 - alpha
+        left = self.x[:n] - self.vx[:n] * back
+        top = self.y[:n] - self.vy[:n] * back
+        images = self.images
+        return surf.blits(zip([images[k] for k in self.kind[:n].tolist()], np.column_stack((left, top)).tolist()))
@@ -0,0 +1,29 @@
+import pygame
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 더티 렉트 렌더러 ---
+# 화면 Surface는 매 프레임 배경(검정)부터 다시 그리므로, 화면에 보내야 하는 부분은
+# "이번 프레임에 그린 영역 + 지난 프레임에 그린 영역(지워져야 할 자리)" 뿐입니다.
+# 그리기 코드가 add()로 그린 영역을 알려주면 present()가 display.update(rects)로 그 부분만 화면에 보냅니다.
+# 꺼져 있거나 invalidate()가 호출된 프레임은 display.flip()으로 전체를 보냅니다.
+class DirtyRectRenderer:
+    def __init__(self, enabled=USE_DIRTY_RECTS, headless=False):
+        self.enabled, self.headless = enabled, headless
+        self.rects, self.prev_rects = [], []
+        self.full = True # 다음 present()에서 전체 화면을 보낼지
+
+    def add(self, rect):
+        if self.enabled and rect: self.rects.append(rect) # None(그린 것 없음)은 무시
+
+    def add_many(self, rects):
+        if self.enabled: self.rects.extend(rects)
+
+    # 화면 전체가 바뀌었을 때 (화면 전환, 오버레이 등)
+    def invalidate(self): self.full = True
+
+    def present(self):
+        if not self.headless:
+            if not self.enabled or self.full: pygame.display.flip()
+            else: pygame.display.update(self.prev_rects + self.rects)
+        self.full = False
+        self.prev_rects, self.rects = self.rects, []
@@ -0,0 +1,67 @@
+import json
+import zlib
+from input_sources import GAME_KEYS, KeyState
+
+# --- 리플레이 기록/재생 ---
+# 게임 로직의 무작위 요소는 모두 Game.rng(시드 고정)를 사용하고, 시뮬레이션은 고정 스텝이므로
+# "시작 시드 + 스텝마다의 키 입력"만 있으면 같은 게임을 그대로 다시 실행할 수 있습니다.
+# 키 입력은 GAME_KEYS 순서의 비트마스크로 바꾸고, 같은 값이 이어지는 구간을 [마스크, 스텝 수]로 묶어(RLE) 저장합니다.
+REPLAY_VERSION = 5 # 2: 폭발음 선택이 게임 RNG를 쓰지 않음, 3: 히트 모양 충돌 판정, 4: 스테이지 웨이브 스케줄러, 5: 보스 탄막 패턴 (게임 진행이 달라져 이전 리플레이와 호환되지 않음)
+
+def keys_to_mask(keys): return sum(1 << i for i, key in enumerate(GAME_KEYS) if keys[key])
+def mask_to_keys(mask): return KeyState(key for i, key in enumerate(GAME_KEYS) if mask >> i & 1)
+
+class InputRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.seed, self.frames, self.runs = None, 0, []
+
+    # 새 게임이 시작될 때 (Game.reset) 기록을 처음부터 다시 시작합니다.
+    def start(self, seed): self.seed, self.frames, self.runs = seed, 0, []
+
+    def record(self, keys):
+        mask = keys_to_mask(keys); self.frames += 1
+        if self.runs and self.runs[-1][0] == mask: self.runs[-1][1] += 1
+        else: self.runs.append([mask, 1])
+
+    # checksum은 기록이 끝난 시점의 게임 상태 (재생 결과가 같은지 확인용)
+    def save(self, checksum=None):
+        data = {'version': REPLAY_VERSION, 'seed': self.seed, 'frames': self.frames, 'checksum': checksum, 'runs': self.runs}
+        with open(self.path, 'w', encoding='utf-8') as f: json.dump(data, f, separators=(',', ':'))
+        return self.path
+
+class Replay:
+    def __init__(self, seed, frames, runs, checksum=None):
+        self.seed, self.frames, self.runs, self.checksum = seed, frames, runs, checksum
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f: data = json.load(f)
+        if data.get('version') != REPLAY_VERSION: raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        return cls(data['seed'], data['frames'], data['runs'], data.get('checksum'))
+
+class ReplayInput:
+    # 리플레이의 키 입력을 스텝마다 순서대로 돌려주는 입력 소스. 마지막 기록 스텝을 돌려주면 finished가 True가 되고, 그 뒤로는 아무 키도 누르지 않습니다.
+    def __init__(self, replay):
+        self.runs, self.run_index, self.remaining = replay.runs, 0, 0
+        self.state, self.finished = KeyState(), False
+        self.states = {} # 마스크 -> KeyState (같은 입력은 같은 객체 재사용)
+
+    def poll(self):
+        while self.remaining <= 0:
+            if self.run_index >= len(self.runs):
+                self.state, self.finished = KeyState(), True
+                return self.state
+            mask, self.remaining = self.runs[self.run_index]; self.run_index += 1
+            if mask not in self.states: self.states[mask] = mask_to_keys(mask)
+            self.state = self.states[mask]
+        self.remaining -= 1
+        self.finished = self.remaining == 0 and self.run_index >= len(self.runs) # 마지막 기록 스텝을 돌려줌
+        return self.state
+
+# 게임 상태 요약값 (리플레이 재생 결과가 기록과 같은지 비교)
+def state_checksum(game):
+    player = game.player
+    state = (game.sim_clock.frame, game.score, player.lives, player.shield, player.power, tuple(player.rect),
+             len(game.mobs), game.boss.hp if game.boss else None, game.rng.getstate())
+    return zlib.crc32(repr(state).encode())
@@ -0,0 +1,294 @@
+import pygame
+from settings import * # settings.py의 상수들을 사용합니다.
+from ui_elements import Button
+from background_module import Background
+from sprites import Powerup
+
+# --- 장면(Scene) 스택 ---
+# 시작 화면, 게임, 일시정지, 게임 오버, 게임 방법, 크레딧 화면은 각각 하나의 장면입니다.
+# Game.run()의 단일 루프가 스택 맨 위 장면에만 이벤트를 전달하고(handle_event), update/draw를 실행합니다.
+# 화면 전환은 push(위에 쌓기, 돌아올 수 있음) / pop(이전 장면으로) / replace(스택을 비우고 새 장면으로)로 합니다.
+class SceneStack:
+    def __init__(self): self.scenes = []
+
+    @property
+    def top(self): return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        self.scenes.append(scene); scene.enter()
+
+    def pop(self):
+        scene = self.scenes.pop(); scene.exit()
+        if self.scenes: self.scenes[-1].resume() # 아래 장면으로 돌아감
+        return scene
+
+    def replace(self, scene):
+        while self.scenes: self.scenes.pop().exit()
+        self.push(scene)
+
+# 장면 기본 클래스. 장면 객체는 Game.get_scene()에서 종류별로 한 번만 만들어 재사용하므로,
+# 버튼 등은 __init__에서 만들고 다시 들어올 때마다 초기화할 상태는 enter()에서 설정합니다.
+class Scene:
+    def __init__(self, game):
+        self.game = game
+        self.buttons = [] # 이 장면의 버튼 (클릭/마우스 오버 처리)
+        self.needs_redraw = True # 정적 화면은 처음과 버튼 상태가 바뀔 때만 다시 그림
+
+    def enter(self): self.refresh()
+    def resume(self): self.refresh()
+    def exit(self): pass
+
+    # 화면 전체를 다시 그리도록 하고, 버튼 색상을 현재 마우스 위치에 맞춥니다.
+    def refresh(self):
+        self.needs_redraw = True
+        self.game.update_button_colors(self.buttons, pygame.mouse.get_pos())
+        self.game.renderer.invalidate()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            if self.game.update_button_colors(self.buttons, event.pos): self.needs_redraw = True
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for btn in self.buttons:
+                if btn.handle_event(event, btn.callback): break
+
+    def update(self, real_ms): pass
+    def draw(self): pass
+
+# 화면 가운데 정렬 버튼 (메뉴 화면 공통)
+def centered_button(game, y, width, height, text, font_size, callback):
+    button = Button(SCREEN_WIDTH / 2 - width / 2, y, width, height, text, game.text_cache.get_font(font_size), BUTTON_NORMAL, BUTTON_HOVER, WHITE)
+    button.callback = callback
+    return button
+
+class StartScene(Scene):
+    def __init__(self, game):
+        super().__init__(game)
+        button_width, button_height = 220, 60
+        self.buttons = [
+            centered_button(game, SCREEN_HEIGHT * 0.60, button_width, button_height, "새로운 게임", 32, game.new),
+            centered_button(game, SCREEN_HEIGHT * 0.72, button_width, button_height, "게임 방법", 32, lambda: game.push_scene(HowToPlayScene)),
+            centered_button(game, SCREEN_HEIGHT * 0.84, button_width, button_height, "게임 종료", 32, lambda: setattr(game, 'running', False)),
+        ]
+        # 크레딧 버튼 (오른쪽 아래)
+        credits_button_size = (100, 30)
+        credits_button = Button(SCREEN_WIDTH - credits_button_size[0] - 10, SCREEN_HEIGHT - credits_button_size[1] - 10, credits_button_size[0], credits_button_size[1], "Credits", game.text_cache.get_font(18), (80,80,80), (120,120,120), WHITE, border_radius=5)
+        credits_button.callback = lambda: game.push_scene(CreditsScene)
+        self.buttons.append(credits_button)
+
+    def enter(self):
+        self.game.background = Background(self.game) # 배경 업데이트를 위해 Background 인스턴스 사용
+        self.game.play_music('menu_bgm.ogg', self.game.menu_bgm_loaded)
+        super().enter()
+
+    def draw(self):
+        g = self.game
+        g.renderer.add_many(g.background.update_and_draw(g.screen, g.renderer.enabled)) # 별/구름 배경 그리기
+        # 메인 제목
+        g.draw_text(g.screen, "FLY DRAGON", 72, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4 - 50, YELLOW, shadow=True)
+        g.draw_text(g.screen, "우주로 날아오른 용의 전설", 28, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4 + 20, WHITE, shadow=True)
+        g.draw_text(g.screen, f"최고 점수: {g.highscore}", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20, WHITE)
+        g.draw_buttons(self.buttons)
+        g.renderer.present()
+
+class GameScene(Scene):
+    def handle_event(self, event):
+        if event.type == pygame.KEYUP and event.key == pygame.K_p: self.game.push_scene(PauseScene) # 일시정지 메뉴
+
+    def update(self, real_ms):
+        g = self.game
+        # 흐른 실제 시간만큼 고정 스텝으로 시뮬레이션 (프레임이 떨어져도 게임 속도 유지)
+        for _ in range(g.sim_clock.advance(real_ms)):
+            g.step()
+            if getattr(g.input, 'finished', False): g.playing = False # 리플레이 재생이 끝남
+            if not g.playing: break
+        if not g.playing:
+            g.finish_game()
+            if g.quit_on_game_over: g.running = False # 리플레이 재생은 한 판으로 끝
+            else: g.show_scene(GameOverScene)
+
+    def draw(self): self.game.draw() # 화면 그리기 (스텝 사이 위치를 보간)
+
+# 멈춘 게임 화면 위에 메뉴를 띄우는 장면 (일시정지, 게임 오버)
+# 들어올 때 화면을 한 번 복사해 반투명 오버레이와 고정된 글자까지 미리 합성해 두고,
+# 이후에는 처음과 버튼 상태가 바뀔 때만 그 위에 버튼을 그립니다. (게임/배경을 다시 그리지 않음)
+class FrozenScene(Scene):
+    def __init__(self, game):
+        super().__init__(game)
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill(DARK_GREY) # 반투명 회색 오버레이
+        self.snapshot = None # 오버레이까지 합성된 화면 (Surface는 재사용)
+
+    def capture(self):
+        if self.snapshot is None: self.snapshot = self.game.screen.copy()
+        else: self.snapshot.blit(self.game.screen, (0, 0))
+        self.snapshot.blit(self.overlay, (0, 0))
+        self.draw_static(self.snapshot)
+
+    def draw_static(self, surf): pass # 오버레이 위의 고정된 글자
+
+    def draw(self):
+        if not self.needs_redraw: return
+        self.needs_redraw = False
+        g = self.game
+        g.screen.blit(self.snapshot, (0, 0))
+        g.draw_buttons(self.buttons)
+        g.renderer.invalidate(); g.renderer.present()
+
+class PauseScene(FrozenScene):
+    def __init__(self, game):
+        super().__init__(game)
+        button_width, button_height = 200, 60
+        self.buttons = [
+            centered_button(game, SCREEN_HEIGHT / 2 - 100, button_width, button_height, "계속하기", 35, self.resume_game),
+            centered_button(game, SCREEN_HEIGHT / 2, button_width, button_height, "재시작", 35, self.restart_game),
+            centered_button(game, SCREEN_HEIGHT / 2 + 100, button_width, button_height, "메인 메뉴", 35, self.go_to_main_menu),
+        ]
+
+    def enter(self):
+        if pygame.mixer.get_init() and pygame.mixer.music.get_busy(): pygame.mixer.music.pause()
+        self.capture() # 화면에는 마지막으로 그린 게임 프레임이 남아 있음
+        super().enter()
+
+    def resume_game(self):
+        if pygame.mixer.get_init(): pygame.mixer.music.unpause()
+        self.game.scenes.pop()
+
+    def restart_game(self):
+        self.game.finish_game(); self.game.new()
+
+    def go_to_main_menu(self):
+        self.game.finish_game(); self.game.show_scene(StartScene)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYUP and event.key == pygame.K_p: self.resume_game() # P키로 일시정지 해제
+        else: super().handle_event(event)
+
+    def draw_static(self, surf):
+        self.game.draw_text(surf, "PAUSED", 72, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 200, WHITE, shadow=True)
+
+class GameOverScene(FrozenScene):
+    def __init__(self, game):
+        super().__init__(game)
+        button_width, button_height = 180, 50
+        self.buttons = [
+            centered_button(game, SCREEN_HEIGHT * 0.75, button_width, button_height, "재시작", 30, game.new),
+            centered_button(game, SCREEN_HEIGHT * 0.85, button_width, button_height, "메인 메뉴", 30, lambda: game.show_scene(StartScene)),
+        ]
+        self.rank = None
+
+    def enter(self):
+        g = self.game
+        # 결과 기록 (파일 쓰기는 백그라운드 스레드에서), 상위 기록 안이면 순위 표시
+        self.rank = g.scores.submit(g.score, g.stage, g.sim_clock.get_ticks() / 1000, g.seed)
+        g.highscore = g.scores.best()
+        g.play_music('menu_bgm.ogg', g.menu_bgm_loaded)
+        self.capture() # 마지막 게임 프레임 위에 결과를 합성
+        super().enter()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYUP and event.key == pygame.K_SPACE: self.game.new() # 스페이스바 재시작
+        else: super().handle_event(event)
+
+    def draw_static(self, surf):
+        g = self.game
+        g.draw_text(surf, "게임 오버", 64, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 4, RED, shadow=True)
+        g.draw_text(surf, f"점수: {g.score}", 28, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, WHITE)
+        if self.rank is not None: g.draw_text(surf, f"순위: {self.rank + 1}위", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 40, YELLOW)
+        g.draw_text(surf, f"최고 점수: {g.highscore}", 24, SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4 - 30, WHITE)
+
+# 내용이 바뀌지 않는 화면 (게임 방법, 크레딧)
+# 처음 들어올 때 페이지 전체(글자, 아이콘)를 Surface 하나에 합성해 두고, 들어올 때는 그 페이지를 한 번 그린 뒤
+# 이후에는 마우스 오버가 바뀐 버튼 자리만 페이지에서 복구하고 버튼을 다시 그립니다.
+class StaticPageScene(Scene):
+    def __init__(self, game):
+        super().__init__(game)
+        self.buttons = [centered_button(game, SCREEN_HEIGHT - 70, 150, 50, "뒤로 가기", 25, game.scenes.pop)]
+        self.page = None # 합성된 페이지 (처음 들어올 때 생성)
+        self.full_redraw = True # 다음 draw에서 페이지 전체를 그릴지
+
+    def enter(self):
+        if self.page is None:
+            self.page = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); self.page.fill(BLACK)
+            self.compose(self.page)
+        super().enter()
+
+    def refresh(self):
+        self.full_redraw = True
+        super().refresh()
+
+    def compose(self, surf): pass # 페이지 내용 그리기 (한 번만 실행)
+
+    def draw(self):
+        if not self.needs_redraw: return
+        self.needs_redraw = False
+        g = self.game
+        if self.full_redraw:
+            self.full_redraw = False
+            g.screen.blit(self.page, (0, 0)); g.renderer.invalidate()
+        else:
+            for btn in self.buttons: g.screen.blit(self.page, btn.rect, btn.rect) # 버튼 자리만 복구
+        g.draw_buttons(self.buttons)
+        g.renderer.present()
+
+class HowToPlayScene(StaticPageScene):
+    def enter(self):
+        self.game.ensure_loaded() # 아이템 아이콘에 게임 이미지를 사용
+        super().enter()
+
+    def compose(self, surf):
+        g = self.game
+        g.draw_text(surf, "게임 방법", 60, SCREEN_WIDTH / 2, 40, WHITE, shadow=True)
+
+        text_start_x_left = 50 # 왼쪽 섹션 시작 X 좌표
+        text_start_x_right = SCREEN_WIDTH * 0.5 + 50 # 오른쪽 섹션 시작 X 좌표
+
+        # 조작법 (왼쪽 정렬)
+        g.draw_text(surf, "--- 조작법 ---", 32, text_start_x_left, 120, YELLOW, align="topleft", shadow=True)
+        g.draw_text(surf, "이동: ← → ↑ ↓ (방향키)", 25, text_start_x_left, 170, WHITE, align="topleft")
+        g.draw_text(surf, "총알 발사: 자동", 25, text_start_x_left, 200, WHITE, align="topleft")
+        g.draw_text(surf, "일시정지: P", 25, text_start_x_left, 230, WHITE, align="topleft")
+        g.draw_text(surf, "폭탄 사용: Space Bar (아이템 획득 시)", 25, text_start_x_left, 260, WHITE, align="topleft")
+
+        # 아이템 설명 (오른쪽 정렬)
+        g.draw_text(surf, "--- 아이템 ---", 32, text_start_x_right, 120, YELLOW, align="topleft", shadow=True)
+
+        item_y_start = 170
+        item_line_height = 40 # 간격 좀 더 넓게
+        item_icon_size = (30, 30) # 아이콘 크기 통일
+
+        items_info = [
+            ('shield', "쉴드: 피격 방어 (최대 3회)", GREEN),
+            ('gun', "총알 강화: 총알 파워 증가 (최대 3단계)", BLUE),
+            ('speed', "속도 증가: 플레이어 이동 속도 증가", CYAN),
+            ('hp', "HP: 생명 1 증가 (최대 5)", RED),
+            ('bomb', "폭탄: 모든 적, 총알 제거 (보스에게 큰 피해)", ORANGE),
+            ('magnet', "자석: 주변 아이템 자동 획득", PURPLE)
+        ]
+
+        # 아이템 설명 그리기 (아이콘은 게임 중 아이템과 같은 공유 이미지)
+        for item_type, desc, text_color in items_info:
+            icon_image = Powerup.get_image(g, item_type, item_icon_size)
+            icon_rect = icon_image.get_rect(midleft=(text_start_x_right, item_y_start + item_line_height / 2)) # X 위치 조정
+            surf.blit(icon_image, icon_rect)
+            g.draw_text(surf, desc, 20, text_start_x_right + item_icon_size[0] + 10, item_y_start + 5, text_color, align="topleft") # 텍스트 X 위치 조정
+            item_y_start += item_line_height
+
+class CreditsScene(StaticPageScene):
+    def compose(self, surf):
+        g = self.game
+        g.draw_text(surf, "Credits", 60, SCREEN_WIDTH / 2, 80, WHITE, shadow=True)
+
+        # 크레딧 내용
+        credit_y = 200
+        line_height = 35
+        g.draw_text(surf, "개발:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
+        g.draw_text(surf, "김민철", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
+
+        credit_y += line_height * 2
+        g.draw_text(surf, "코드 및 이미지 생성 도움:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
+        g.draw_text(surf, "ChatGPT (Python Code)", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
+        g.draw_text(surf, "DALL-E (Image Generation)", 25, SCREEN_WIDTH / 2, credit_y + line_height * 2, WHITE)
+
+        credit_y += line_height * 3.5
+        g.draw_text(surf, "음악 및 효과음:", 30, SCREEN_WIDTH / 2, credit_y, YELLOW, shadow=True)
+        g.draw_text(surf, "OpenGameArt.org (비상업적 용도)", 25, SCREEN_WIDTH / 2, credit_y + line_height, WHITE)
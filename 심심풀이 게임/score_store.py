@@ -0,0 +1,107 @@
+import os
+import time
+import json
+import queue
+import threading
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 점수 기록 저장소 ---
+# 게임 한 판의 결과(점수, 스테이지, 플레이 시간, 시각, 시드)를 기록 파일 끝에 한 줄씩 추가만 합니다. (탭 구분)
+# 상위 SCORE_TOP_N개는 따로 작은 인덱스 파일(JSON)에 저장해 두어, 기록이 아무리 많아도 시작할 때 인덱스만 읽습니다.
+# 파일 쓰기는 백그라운드 스레드 하나가 순서대로 처리하므로 게임 오버 화면 전환이 디스크를 기다리지 않습니다.
+#  - 기록: 한 줄 전체를 한 번의 write로 추가하고 flush/fsync (중간에 끊긴 마지막 줄은 읽을 때 무시)
+#  - 인덱스: 임시 파일에 쓴 뒤 os.replace로 교체 (항상 완전한 파일만 보임)
+# 인덱스에는 그 시점의 기록 파일 크기를 함께 저장하고, 크기가 다르면(인덱스 저장 전에 종료 등) 기록 파일에서 다시 만듭니다.
+FIELDS = ('score', 'stage', 'duration', 'timestamp', 'seed') # 기록 파일 한 줄의 순서
+
+def _parse(line):
+    parts = line.rstrip('\n').split('\t')
+    if len(parts) != len(FIELDS): return None
+    try: return [int(parts[0]), int(parts[1]) if parts[1] else None, float(parts[2]), float(parts[3]), int(parts[4]) if parts[4] else None]
+    except ValueError: return None
+
+def _format(record): return '\t'.join('' if value is None else str(value) for value in record) + '\n'
+
+class ScoreStore:
+    # log_path가 None이면 파일 없이 메모리에서만 동작합니다. (헤드리스 소크 테스트 등)
+    def __init__(self, log_path=SCORE_LOG_FILE, index_path=SCORE_INDEX_FILE, top_n=SCORE_TOP_N):
+        self.log_path, self.index_path, self.top_n = log_path, index_path, top_n
+        self.top = [] # 상위 기록 [score, stage, duration, timestamp, seed] (점수 내림차순)
+        self.count = 0 # 전체 기록 수
+        self.queue, self.thread = None, None
+        if log_path is None: return
+        self._load()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._writer, name='score-store', daemon=True)
+        self.thread.start()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f: index = json.load(f)
+            if index['log_size'] == os.path.getsize(self.log_path):
+                self.top, self.count = index['top'], index['count']; return
+        except (OSError, ValueError, KeyError): pass
+        if os.path.isfile(self.log_path): self._rebuild()
+        elif os.path.isfile(HIGHSCORE_FILE): self._migrate()
+
+    # 기록 파일 전체를 읽어 인덱스를 다시 만듭니다. (인덱스가 없거나 오래된 경우에만)
+    def _rebuild(self):
+        self.top, self.count, line = [], 0, '\n'
+        with open(self.log_path, encoding='utf-8') as f:
+            for line in f:
+                record = _parse(line)
+                if record is not None: self._insert(record); self.count += 1
+        if not line.endswith('\n'): # 쓰다 끊긴 마지막 줄은 닫아서 다음 기록과 섞이지 않게 함
+            with open(self.log_path, 'a', encoding='utf-8') as f: f.write('\n')
+        self._write_index(self.top, self.count)
+
+    # 예전 highscore.txt의 최고 점수를 첫 기록으로 옮깁니다. (스테이지/시드는 알 수 없으므로 비워 둠)
+    def _migrate(self):
+        try:
+            with open(HIGHSCORE_FILE, encoding='utf-8') as f: score = int(f.read())
+        except (OSError, ValueError): return
+        record = [score, None, 0.0, os.path.getmtime(HIGHSCORE_FILE), None]
+        self._append(record); self._insert(record); self.count = 1
+        self._write_index(self.top, self.count)
+        print(f"Migrated high score {score} from '{HIGHSCORE_FILE}' to '{self.log_path}'")
+
+    def _insert(self, record):
+        if len(self.top) >= self.top_n and record[0] <= self.top[-1][0]: return None
+        rank = next((i for i, other in enumerate(self.top) if record[0] > other[0]), len(self.top)) # 같은 점수는 먼저 기록된 것이 위
+        self.top.insert(rank, record); del self.top[self.top_n:]
+        return rank
+
+    def _append(self, record):
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(_format(record)); f.flush(); os.fsync(f.fileno())
+
+    def _write_index(self, top, count):
+        index = {'count': count, 'log_size': os.path.getsize(self.log_path), 'top': top}
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(index, f, separators=(',', ':')); f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+    def _writer(self):
+        while True:
+            item = self.queue.get()
+            if item is None: self.queue.task_done(); return
+            record, top, count = item # top/count는 이 기록까지 반영된 시점의 복사본
+            try:
+                self._append(record)
+                self._write_index(top, count)
+            except OSError as e: print(f"Warning: could not save score: {e}")
+            self.queue.task_done()
+
+    # 한 판의 결과를 기록합니다. 상위 목록은 바로 갱신되고 파일 쓰기는 백그라운드에서 합니다. 상위 N위 안이면 순위(0부터)를 반환합니다.
+    def submit(self, score, stage=None, duration=0.0, seed=None):
+        record = [score, stage, round(duration, 2), round(time.time(), 3), seed]
+        rank = self._insert(record); self.count += 1
+        if self.queue is not None: self.queue.put((record, [list(r) for r in self.top], self.count))
+        return rank
+
+    def best(self): return self.top[0][0] if self.top else 0
+
+    # 대기 중인 쓰기를 모두 마치고 스레드를 종료합니다. (게임 종료 시)
+    def close(self):
+        if self.thread is None: return
+        self.queue.put(None); self.thread.join(); self.thread = None
@@ -2,8 +2,90 @@
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+SIM_STEP_MS = 1000 / FPS # 고정 시뮬레이션 스텝 길이 (ms), 렌더링 FPS와 무관하게 게임 속도를 결정
+SIM_MAX_STEPS = 5 # 한 렌더 프레임에서 최대로 따라잡을 시뮬레이션 스텝 수
+INTERP_MAX_JUMP = 100 # 한 스텝에 이보다 많이 움직인 스프라이트는 보간하지 않음 (순간 이동)
 TITLE = "FLY DRAGON" # 게임 제목
-HIGHSCORE_FILE = "highscore.txt"
+HIGHSCORE_FILE = "highscore.txt" # 예전 최고 점수 파일 (점수 기록 파일이 없을 때 한 번 옮겨 옴)
+SCORE_LOG_FILE = "scores.log" # 게임마다의 결과를 한 줄씩 추가하는 기록 파일
+SCORE_INDEX_FILE = "scores_index.json" # 상위 기록 인덱스 (시작/게임 오버 화면은 이 파일만 읽음)
+SCORE_TOP_N = 10 # 인덱스에 보관할 상위 기록 수
+TEXT_CACHE_SIZE = 256 # 렌더링된 텍스트 Surface를 최대 몇 개까지 캐시할지
+FONT_NAME = 'malgungothic' # UI 글꼴 (시스템 글꼴 이름)
+FONT_CACHE_FILE = "font_cache.txt" # 찾은 글꼴 경로를 저장해 두어 다음 실행부터 시스템 글꼴 검색을 건너뜀
+ASSET_WORKERS = 4 # 시작할 때 이미지/사운드를 디코딩하는 워커 스레드 수
+STARTUP_LOG_FILE = "startup_timing.log" # 에셋별 로딩 시간 기록
+
+# --- 오브젝트 풀 (미리 할당해 둘 개수) ---
+BULLET_POOL_SIZE = 64
+MOB_BULLET_POOL_SIZE = 128
+EXPLOSION_POOL_SIZE = 32
+# 폭발 애니메이션 크기 종류: 이름 -> (첫 프레임 크기 px, 프레임마다 커지는 크기 px). 종류를 추가하면 시작할 때 한 번 만들어 공유함
+EXPLOSION_SIZES = {'lg': (30, 15), 'sm': (15, 8)}
+EXPLOSION_FRAMES = 9
+
+SPATIAL_CELL_SIZE = 64 # 충돌 검사용 공간 해시의 칸 크기 (px)
+USE_PROJECTILE_ENGINE = True # 총알이 많을 때 NumPy 배열 기반 엔진으로 처리 (NumPy가 없으면 항상 스프라이트 사용)
+PROJECTILE_ENGINE_THRESHOLD = 24 # 화면의 총알이 이 수 이상일 때만 새 총알을 엔진에 추가 (적을 때는 배열 연산 고정 비용 때문에 스프라이트가 더 빠름)
+PROJECTILE_CAPACITY = 1024 # 투사체 배열의 초기 크기 (부족하면 자동으로 늘어남)
+STAR_COUNT = 200 # 구름 이미지가 없을 때 쓰는 별 배경의 별 개수 (밀도)
+CLOUD_LAYERS = [(1, 5), (2, 5)] # 구름 패럴랙스 레이어: (프레임당 속도 px, 구름 개수), 느린 레이어가 뒤에 그려짐
+PROFILER_HISTORY = 600 # 프로파일러 링 버퍼에 보관할 프레임 수 (CSV로 저장되는 범위)
+PROFILER_OVERLAY_REFRESH = 15 # 프로파일러 오버레이 숫자를 몇 프레임마다 갱신할지 (최근 이만큼의 평균)
+USE_ATLAS = True # 스프라이트 이미지를 텍스처 아틀라스 하나에 모아 한 번의 blits로 그림
+ATLAS_SIZE = (1024, 1024) # 아틀라스 Surface 크기 (넘치는 이미지는 원본으로 그림)
+# 스프라이트 그리기 순서 (숫자가 클수록 위에 그려짐)
+LAYER_POWERUPS, LAYER_MOBS, LAYER_BULLETS, LAYER_PLAYER, LAYER_EXPLOSIONS = 1, 2, 3, 4, 5
+USE_DIRTY_RECTS = False # True면 바뀐 영역만 화면에 보냄 (display.update(rects)), False면 매 프레임 전체 flip
+
+# --- 사운드 ---
+SOUND_CATEGORIES = {'player': 2, 'enemy': 3, 'explosion': 4, 'alert': 2, 'boss': 2} # 카테고리 -> 예약 채널 수
+SOUND_COALESCE_MS = 60 # 같은 사운드가 이 시간 안에 다시 요청되면 한 번만 재생
+SOUND_PRIORITY_ALWAYS = 2 # 이 우선순위 이상인 사운드는 항상 재생 (채널이 모자라면 낮은 우선순위 소리를 끊음)
+SOUNDS = { # 이름: (파일 목록(변형 중 무작위), 카테고리, 최대 동시 재생 수, 우선순위)
+    'shoot': (['shoot.wav'], 'player', 2, 0),
+    'powerup': (['powerup.wav'], 'player', 1, 1),
+    'explosion': (['expl1.wav', 'expl2.wav'], 'explosion', 3, 0),
+    'enemy_shoot': (['enemy_shoot.wav'], 'enemy', 2, 0),
+    'bomb': (['bomb.wav'], 'alert', 1, 1),
+    'player_hit': (['player_hit.wav'], 'alert', 1, 2),
+    'boss_hit': (['boss_hit.wav'], 'boss', 2, 2),
+}
+
+# --- 몹 종류 / 스테이지 웨이브 ---
+MOB_TYPES = { # 종류: (이미지 파일, 크기, 세로 속도 범위, 가로 속도 범위, HP, 처치 점수) (속도 범위는 randrange 인자)
+    'normal': ('mob.png', (40, 40), (2, 6), (-2, 2), 1, 50),
+    'fast': ('mob_fast.png', (30, 30), (6, 9), (-1, 2), 1, 80),
+    'heavy': ('mob.png', (56, 56), (1, 3), (0, 1), 4, 200),
+}
+# 웨이브: (대형, 몹 종류, 마리 수, 한 번에 내보낼 수, 내보내는 간격 ms, 앞 웨이브가 끝난 뒤 대기 ms)
+# 대형: 'random'(화면 위 무작위 위치), 'line'(가로 한 줄), 'v'(V자), 'column'(세로 한 줄)
+# 스테이지: (보스 등장 점수(스테이지 시작 후 얻은 점수), 화면의 최대 몹 수, 웨이브 목록(보스가 나올 때까지 반복))
+STAGES = [
+    (2000, 8, [('random', 'normal', 10, 1, 1000, 0), ('line', 'normal', 6, 6, 0, 1500), ('random', 'fast', 4, 1, 600, 1000)]),
+    (4000, 40, [('v', 'normal', 9, 9, 0, 800), ('random', 'fast', 12, 2, 400, 500), ('column', 'heavy', 4, 1, 700, 800),
+                ('line', 'normal', 10, 10, 0, 600)]),
+    (8000, 300, [('random', 'normal', 200, 20, 250, 500), ('line', 'fast', 12, 12, 0, 300), ('random', 'heavy', 30, 5, 400, 300),
+                 ('v', 'normal', 15, 15, 0, 300)]), # 수백 마리 물량 스테이지 (마지막 스테이지가 계속 반복됨)
+]
+
+# --- 보스 탄막 패턴 ---
+BULLET_ANGLE_STEPS = 720 # 각도 표 해상도 (한 바퀴를 몇 칸으로 나눌지, 720이면 0.5도 단위)
+BOSS_MAX_BULLETS = 1500 # 화면에 동시에 있을 수 있는 적 총알 수 상한 (넘치는 총알은 발사하지 않음)
+BOSS_BURST_GAP = 100 # 연사(burst) 안에서 발사 사이 간격 (ms)
+BOSS_STRESS_SCALE = 16 # 스트레스 모드: 발사마다 총알 수 배율
+BOSS_STRESS_MAX_BULLETS = 6000 # 스트레스 모드의 적 총알 상한
+BOSS_GUNS = ((-50, -20), (50, -20)) # 보스 총구 위치 (보스 rect의 (centerx, bottom) 기준)
+BOSS_CORE = ((0, -20),) # 보스 중앙 총구
+# 패턴: (모양, 총구 목록, 발사 간격 ms, 총알 수, 속도, 퍼짐 각도, 발사마다 회전 각도, 연사 수)
+# 모양: 'aimed'(플레이어 방향 중심의 부채꼴), 'fan'(아래 방향 중심의 부채꼴), 'ring'(한 바퀴 고르게), 'spiral'(발사마다 회전하는 ring)
+# 페이즈: (보스 HP 비율이 이 값 이하일 때 시작, 패턴 목록)
+BOSS_PHASES = [
+    (1.0, [('aimed', BOSS_GUNS, 800, 1, 6, 0, 0, 1)]), # 두 총구에서 플레이어 조준 사격
+    (0.7, [('aimed', BOSS_GUNS, 1200, 3, 6, 20, 0, 3), ('ring', BOSS_CORE, 1500, 24, 3, 360, 7.5, 1)]),
+    (0.35, [('spiral', BOSS_CORE, 80, 4, 4, 360, 11, 1), ('fan', BOSS_GUNS, 1400, 9, 5, 80, 0, 1),
+            ('aimed', BOSS_GUNS, 1000, 5, 7, 30, 0, 2)]),
+]
 
 # --- 색상 정의 ---
 BLACK = (0, 0, 0)
@@ -0,0 +1,34 @@
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 고정 스텝 시뮬레이션 시계 ---
+# 모든 쿨다운/타이머는 pygame.time.get_ticks() 대신 이 시계의 get_ticks()를 사용합니다.
+# 시뮬레이션 시간은 update() 한 번마다 step_ms 만큼만 흐르므로, 렌더링이 느려져도 게임 속도와 타이머는 변하지 않습니다.
+class SimClock:
+    def __init__(self, step_ms=SIM_STEP_MS, max_steps=SIM_MAX_STEPS):
+        self.step_ms = step_ms
+        self.max_steps = max_steps # 한 렌더 프레임에서 따라잡을 최대 스텝 수 (너무 느릴 때 무한히 밀리지 않도록)
+        self.reset()
+
+    def reset(self):
+        self.now = 0.0 # 시뮬레이션 시간 (ms)
+        self.frame = 0 # 진행된 스텝 수
+        self.accumulator = 0.0 # 아직 시뮬레이션하지 않은 실제 시간 (ms)
+
+    def get_ticks(self): return int(self.now) # pygame.time.get_ticks()와 같은 형태로 사용
+
+    # 시뮬레이션을 한 스텝 진행 (Game.update 직전에 호출)
+    def step(self):
+        self.now += self.step_ms; self.frame += 1
+
+    # 실제 경과 시간(ms)을 누적하고, 이번 렌더 프레임에 실행할 스텝 수를 반환합니다.
+    def advance(self, real_ms):
+        self.accumulator += real_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps: # 따라잡지 못하는 시간은 버림
+            steps, self.accumulator = self.max_steps, 0.0
+        else: self.accumulator -= steps * self.step_ms
+        return steps
+
+    # 마지막 스텝과 다음 스텝 사이의 위치 (0~1), 렌더링 보간에 사용
+    @property
+    def alpha(self): return min(self.accumulator / self.step_ms, 1.0)
@@ -0,0 +1,59 @@
+import pygame
+import random
+from settings import * # settings.py의 상수들을 사용합니다.
+from assets import assets
+
+# 사운드 파일이 없거나 오디오를 쓰지 않을 때 대신 사용하는 객체 (play()만 있음)
+class DummySound:
+    def play(self): pass
+
+# --- 사운드 매니저 ---
+# 카테고리마다 채널을 예약해 두고(SOUND_CATEGORIES), 사운드를 이름으로 재생합니다. (SOUNDS 표)
+#  - 같은 사운드가 SOUND_COALESCE_MS 안에 다시 요청되면 한 번만 재생 (폭탄으로 몹 수십 마리가 동시에 터질 때 등)
+#  - 사운드마다 동시에 재생되는 수를 제한
+#  - 우선순위가 SOUND_PRIORITY_ALWAYS 이상인 사운드(보스 피격, 플레이어 피격 등)는 합치기/동시 재생 제한 없이 항상 재생하고,
+#    채널이 모자라면 같은 카테고리에서 우선순위가 가장 낮고 가장 오래된 소리를 끊고 재생
+# 변형 사운드(폭발 1/2 등) 선택에는 게임 RNG가 아닌 자체 RNG를 사용하므로 리플레이 재현에 영향을 주지 않습니다.
+class SoundManager:
+    def __init__(self, enabled=True):
+        self.enabled = enabled and pygame.mixer.get_init() is not None
+        self.rng = random.Random()
+        self.defs = {} # 이름 -> (변형 Sound 목록, 카테고리, 최대 동시 재생 수, 우선순위)
+        self.slots = {} # 카테고리 -> [[채널, 재생 중인 사운드 이름, 우선순위, 시작 시각], ...]
+        self.last_played = {} # 이름 -> 마지막 재생 시각 (ms)
+        self.stats = {'played': 0, 'coalesced': 0, 'capped': 0, 'stolen': 0, 'dropped': 0}
+        if self.enabled:
+            total = sum(SOUND_CATEGORIES.values())
+            if pygame.mixer.get_num_channels() < total: pygame.mixer.set_num_channels(total)
+            pygame.mixer.set_reserved(total) # 예약 채널은 Sound.play()의 자동 채널 선택에 쓰이지 않음
+            index = 0
+            for category, count in SOUND_CATEGORIES.items():
+                self.slots[category] = [[pygame.mixer.Channel(index + i), None, 0, 0] for i in range(count)]
+                index += count
+
+    # SOUNDS 표의 사운드를 모두 등록합니다. 없는 파일은 빠지고, 변형이 하나도 없으면 DummySound를 사용합니다.
+    def load_all(self, table=SOUNDS):
+        for name, (files, category, max_voices, priority) in table.items():
+            variants = [sound for sound in (assets.load_sound(f) for f in files) if sound is not None] if self.enabled else []
+            self.defs[name] = (variants or [DummySound()], category, max_voices, priority)
+
+    def play(self, name):
+        entry = self.defs.get(name)
+        if entry is None: return
+        variants, category, max_voices, priority = entry
+        if isinstance(variants[0], DummySound): variants[0].play(); return
+        now = pygame.time.get_ticks()
+        always = priority >= SOUND_PRIORITY_ALWAYS
+        if not always and now - self.last_played.get(name, -SOUND_COALESCE_MS) < SOUND_COALESCE_MS: self.stats['coalesced'] += 1; return
+        slots = self.slots[category]
+        if not always and sum(1 for slot in slots if slot[1] == name and slot[0].get_busy()) >= max_voices:
+            self.stats['capped'] += 1; return
+        slot = next((slot for slot in slots if not slot[0].get_busy()), None)
+        if slot is None:
+            if not always: self.stats['dropped'] += 1; return
+            slot = min(slots, key=lambda slot: (slot[2], slot[3])) # 우선순위가 가장 낮고 가장 오래된 소리를 끊음
+            slot[0].stop(); self.stats['stolen'] += 1
+        slot[0].play(variants[0] if len(variants) == 1 else self.rng.choice(variants))
+        slot[1], slot[2], slot[3] = name, priority, now
+        self.last_played[name] = now
+        self.stats['played'] += 1
@@ -0,0 +1,74 @@
+import pygame
+import math
+from settings import * # settings.py의 상수들을 사용합니다.
+
+# --- 균일 격자 공간 해시 (충돌 검사 broadphase) ---
+# 스프라이트를 cell_size 크기의 칸에 등록해 두고, 겹칠 수 있는 칸에 있는 후보만 정밀 검사합니다.
+# 정밀 검사는 pygame과 동일하게 rect 충돌 또는 collided 함수(collide_circle 등)를 사용하므로 결과가 같습니다.
+
+def _bounds(sprite, circle):
+    # 충돌 가능 영역: rect, 그리고 원 충돌이면 원을 감싸는 사각형까지 포함
+    # (radius가 없으면 pygame.sprite.collide_circle처럼 rect 대각선의 절반을 반지름으로 사용)
+    rect = sprite.rect
+    if not circle: return rect
+    radius = getattr(sprite, 'radius', None)
+    if radius is None: radius = 0.5 * math.hypot(rect.width, rect.height)
+    r, (cx, cy) = math.ceil(radius) + 1, rect.center
+    return rect.union((cx - r, cy - r, r * 2, r * 2))
+
+class SpatialHash:
+    # circle=True 이면 collide_circle로 검사할 그룹이므로 원 영역까지 칸에 등록합니다.
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE, circle=False):
+        self.cell_size, self.circle = cell_size, circle
+        self.cells = {} # (칸 x, 칸 y) -> 스프라이트 리스트
+        self.order = {} # 스프라이트 -> 등록 순서 (그룹 순회 순서와 같은 결과 순서를 위해)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return range(rect.left // size, (rect.right - 1) // size + 1), range(rect.top // size, (rect.bottom - 1) // size + 1)
+
+    def clear(self): self.cells.clear(); self.order.clear()
+
+    def insert(self, sprite):
+        self.order[sprite] = len(self.order)
+        xs, ys = self._cell_range(_bounds(sprite, self.circle))
+        cells = self.cells
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket is None: cells[(cx, cy)] = [sprite]
+                else: bucket.append(sprite)
+
+    # 매 스텝 그룹 전체로 다시 구성합니다.
+    def build(self, sprites):
+        self.clear()
+        for sprite in sprites: self.insert(sprite)
+
+    # rect와 겹칠 수 있는 후보 스프라이트 (중복 없이, 등록 순서대로)
+    def query(self, rect):
+        xs, ys = self._cell_range(rect)
+        cells, found = self.cells, set()
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket: found.update(bucket)
+        if len(found) > 1: return sorted(found, key=self.order.__getitem__)
+        return list(found)
+
+    # pygame.sprite.spritecollide와 같은 의미 (이미 kill된 후보는 제외)
+    def spritecollide(self, sprite, dokill, collided=None):
+        hits = []
+        for other in self.query(_bounds(sprite, self.circle)):
+            if not other.alive(): continue
+            if collided(sprite, other) if collided else sprite.rect.colliderect(other.rect):
+                hits.append(other)
+                if dokill: other.kill()
+        return hits
+
+    # pygame.sprite.groupcollide(group, <이 해시의 그룹>, False, dokill)과 같은 의미
+    def groupcollide(self, group, dokill, collided=None):
+        result = {}
+        for sprite in group:
+            hits = self.spritecollide(sprite, dokill, collided)
+            if hits: result[sprite] = hits
+        return result
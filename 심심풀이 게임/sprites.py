@@ -4,19 +4,15 @@ import math
 import os
 from settings import * # settings.py의 상수들을 사용합니다.
 
-# 리소스 로드 함수 (Fallback 처리 포함)
-# 이 함수는 스프라이트 클래스들에서 이미지를 로드할 때 사용됩니다.
-def load_image(filename, size):
-    full_path = os.path.join(IMAGE_FOLDER, filename) # settings.py의 IMAGE_FOLDER 사용
-    try:
-        image = pygame.image.load(full_path).convert_alpha()
-        return pygame.transform.scale(image, size)
-    except (pygame.error, FileNotFoundError):
-        print(f"Warning: Image '{filename}' not found or could not be loaded. Using fallback.")
-        return pygame.Surface(size, pygame.SRCALPHA) # 투명한 Surface 반환
+from assets import assets, load_image # 이미지는 에셋 레지스트리를 통해 한 번만 로드하여 공유합니다.
+from pools import PooledSprite # 총알/폭발은 오브젝트 풀에서 재사용됩니다.
+from hitshapes import HIT_RECT, HIT_CIRCLE, HIT_MASK # 충돌 판정 모양 (hit_shape)
+from bullet_patterns import BulletPatterns # 보스 탄막 패턴
 
 # --- 스프라이트 클래스 정의 ---
 class Player(pygame.sprite.Sprite):
+    _layer = LAYER_PLAYER # 그리기 순서 (RenderGroup)
+    hit_shape = HIT_MASK # 용 모양 그대로 판정
     def __init__(self, game):
         super().__init__(); self.game = game; self.player_size = (60, 50)
         
@@ -24,23 +20,27 @@ class Player(pygame.sprite.Sprite):
         self.animation_frames = [load_image(f'player_fly{i}.png', self.player_size) for i in range(1, 4)]
         if all(img.get_width() == 0 for img in self.animation_frames):
             print("Warning: Player animation images not found. Using default player shape.")
-            default_surf = pygame.Surface(self.player_size, pygame.SRCALPHA)
-            pygame.draw.polygon(default_surf, GREEN, [(30, 0), (0, 45), (60, 45)]); pygame.draw.polygon(default_surf, YELLOW, [(30, 20), (15, 40), (45, 40)])
+            default_surf = assets.fallback(('player', self.player_size), self.build_default_image)
             self.animation_frames = [default_surf] * 3 # 3개의 동일한 프레임으로 대체
 
-        self.current_frame, self.last_update, self.frame_rate = 0, pygame.time.get_ticks(), 100
+        self.current_frame, self.last_update, self.frame_rate = 0, self.game.sim_clock.get_ticks(), 100
         self.image = self.animation_frames[self.current_frame]
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT - 60))
         self.radius = int(self.rect.width * 0.8 / 2); self.lives, self.shield = 3, 1
-        self.hidden, self.hide_timer = False, pygame.time.get_ticks()
-        self.power, self.power_time = 1, pygame.time.get_ticks() # 총알 파워업 (1단계)
-        self.shoot_delay, self.last_shot = 200, pygame.time.get_ticks()
-        self.is_magnet_active, self.magnet_timer, self.magnet_duration = False, pygame.time.get_ticks(), 7000 # 자석 아이템
+        self.hidden, self.hide_timer = False, self.game.sim_clock.get_ticks()
+        self.power, self.power_time = 1, self.game.sim_clock.get_ticks() # 총알 파워업 (1단계)
+        self.shoot_delay, self.last_shot = 200, self.game.sim_clock.get_ticks()
+        self.is_magnet_active, self.magnet_timer, self.magnet_duration = False, self.game.sim_clock.get_ticks(), 7000 # 자석 아이템
         self.speed = 8 # 플레이어 이동 속도
         self.pop_up_message, self.pop_up_timer, self.pop_up_duration = "", 0, 1500 # 팝업 메시지
 
+    def build_default_image(self):
+        default_surf = pygame.Surface(self.player_size, pygame.SRCALPHA)
+        pygame.draw.polygon(default_surf, GREEN, [(30, 0), (0, 45), (60, 45)]); pygame.draw.polygon(default_surf, YELLOW, [(30, 20), (15, 40), (45, 40)])
+        return default_surf
+
     def update(self):
-        now = pygame.time.get_ticks()
+        now = self.game.sim_clock.get_ticks()
         # 애니메이션 업데이트
         if now - self.last_update > self.frame_rate: self.last_update, self.current_frame, self.image = now, (self.current_frame + 1) % len(self.animation_frames), self.animation_frames[self.current_frame]
         # 숨기기 상태 해제
@@ -53,7 +53,7 @@ class Player(pygame.sprite.Sprite):
         if self.pop_up_message and now - self.pop_up_timer > self.pop_up_duration: self.pop_up_message = ""
         
         # 키 입력 처리 (이동)
-        keystate = pygame.key.get_pressed()
+        keystate = self.game.keys # Game.update에서 입력 소스로부터 읽은 키 상태
         if keystate[pygame.K_LEFT]: self.rect.x -= self.speed
         if keystate[pygame.K_RIGHT]: self.rect.x += self.speed
         if keystate[pygame.K_UP]: self.rect.y -= self.speed
@@ -74,7 +74,7 @@ class Player(pygame.sprite.Sprite):
         if not self.hidden: self.shoot()
 
     def shoot(self):
-        now = pygame.time.get_ticks()
+        now = self.game.sim_clock.get_ticks()
         if now - self.last_shot > self.shoot_delay:
             self.last_shot = now
             colors = {1: YELLOW, 2: BLUE, 3: RED}; bullet_color = colors.get(self.power, RED)
@@ -86,129 +86,183 @@ class Player(pygame.sprite.Sprite):
                 self.game.spawn_bullet(self.rect.centerx, self.rect.top, bullet_color)
                 self.game.spawn_bullet(self.rect.left + 10, self.rect.centery, bullet_color, -15)
                 self.game.spawn_bullet(self.rect.right - 10, self.rect.centery, bullet_color, 15)
-            self.game.shoot_sound.play() # 사운드 재생
+            self.game.sounds.play('shoot') # 사운드 재생
 
     def powerup(self, type):
         msg = ""
         if type == 'shield': self.shield, msg = min(self.shield + 1, 3), "쉴드 획득!"
-        elif type == 'gun': self.power, self.power_time, msg = min(self.power + 1, 3), pygame.time.get_ticks(), "총알 강화!"
+        elif type == 'gun': self.power, self.power_time, msg = min(self.power + 1, 3), self.game.sim_clock.get_ticks(), "총알 강화!"
         elif type == 'speed': self.speed, msg = min(self.speed + 2, 14), "속도 증가!"
         elif type == 'hp': self.lives, msg = min(self.lives + 1, 5), "체력 회복!"
         elif type == 'bomb': # 폭탄 아이템 획득 시 플레이어에게 플래그 설정
             self.game.player_has_bomb = True
             msg = "폭탄 획득! (Space Bar)"
         elif type == 'magnet':
-            self.is_magnet_active = True; self.magnet_timer = pygame.time.get_ticks()
+            self.is_magnet_active = True; self.magnet_timer = self.game.sim_clock.get_ticks()
             msg = "자석 효과 활성화!"
 
         if msg: self.show_pop_up(msg)
-        self.game.powerup_sound.play() # 사운드 재생
+        self.game.sounds.play('powerup') # 사운드 재생
         
-    def show_pop_up(self, message): self.pop_up_message, self.pop_up_timer = message, pygame.time.get_ticks()
-    def hide(self): self.hidden, self.hide_timer, self.rect.center = True, pygame.time.get_ticks(), (SCREEN_WIDTH / 2, SCREEN_HEIGHT + 200) # 화면 밖으로 숨김
+    def show_pop_up(self, message): self.pop_up_message, self.pop_up_timer = message, self.game.sim_clock.get_ticks()
+    def hide(self): self.hidden, self.hide_timer, self.rect.center = True, self.game.sim_clock.get_ticks(), (SCREEN_WIDTH / 2, SCREEN_HEIGHT + 200) # 화면 밖으로 숨김
     def draw_magnet_aura(self, surf):
         if self.is_magnet_active:
             # 자석 효과 시 빛나는 효과 추가
-            glow_radius = 80 + (pygame.time.get_ticks() // 10 % 10) * 2 # 시간에 따라 반지름 변화
-            alpha = 150 - (pygame.time.get_ticks() // 10 % 10) * 10 # 시간에 따라 투명도 변화
+            glow_radius = 80 + (self.game.sim_clock.get_ticks() // 10 % 10) * 2 # 시간에 따라 반지름 변화
+            alpha = 150 - (self.game.sim_clock.get_ticks() // 10 % 10) * 10 # 시간에 따라 투명도 변화
             aura_color = (LIGHT_BLUE[0], LIGHT_BLUE[1], LIGHT_BLUE[2], max(50, alpha))
-            pygame.draw.circle(surf, aura_color, self.rect.center, glow_radius, 0) # 채워진 원으로 빛 표현
-            pygame.draw.circle(surf, LIGHT_BLUE, self.rect.center, 80, 2) # 테두리
+            dirty = pygame.draw.circle(surf, aura_color, self.rect.center, glow_radius, 0) # 채워진 원으로 빛 표현
+            return dirty.union(pygame.draw.circle(surf, LIGHT_BLUE, self.rect.center, 80, 2)) # 테두리 (그린 영역 반환)
 
 class Mob(pygame.sprite.Sprite):
-    def __init__(self, game):
-        super().__init__(); self.game = game
-        self.original_image = self.game.mob_img_normal # 일반 몹 이미지 사용
-        
+    _layer = LAYER_MOBS
+    hit_shape = HIT_CIRCLE
+    # kind는 MOB_TYPES의 몹 종류. center/speed(가로, 세로)를 주지 않으면 화면 위 무작위 위치와 종류별 무작위 속도를 사용합니다.
+    def __init__(self, game, kind='normal', center=None, speed=None):
+        super().__init__(); self.game = game; self.kind = kind
+        _, size, speedy_range, speedx_range, self.hp, self.points = MOB_TYPES[kind] # HP, 처치 점수
+        self.original_image = self.game.mob_images[kind] # 종류별 공유 이미지 사용
+
         # 몹 이미지가 없을 경우, 기본 도형으로 생성
         if self.original_image.get_width() == 0:
-            size = (40,40)
-            self.original_image = pygame.Surface(size, pygame.SRCALPHA); pygame.draw.circle(self.original_image, RED, (size[0]//2, size[1]//2), size[0]//2)
+            self.original_image = assets.fallback(('mob', size), lambda: self.build_default_image(size))
+
+        self.image = self.original_image # 공유 이미지 사용 (인스턴스마다 복사하지 않음)
+        rng = self.game.rng # 게임의 시드 고정 RNG (리플레이 재현)
+        if center is None: center = (rng.randrange(40, SCREEN_WIDTH - 40), rng.randrange(-150, -100))
+        self.rect = self.image.get_rect(center=center)
+        self.radius = int(self.rect.width * .85 / 2)
+        if speed is None: self.speedy = rng.randrange(*speedy_range); self.speedx = rng.randrange(*speedx_range)
+        else: self.speedx, self.speedy = speed
 
-        self.image = self.original_image.copy()
-        self.rect = self.image.get_rect(center=(random.randrange(40, SCREEN_WIDTH - 40), random.randrange(-150, -100)))
-        self.radius = int(self.rect.width * .85 / 2); self.speedy = random.randrange(2, 6); self.speedx = random.randrange(-2, 2)
-        self.hp = 1 # 몹 HP
+    @staticmethod
+    def build_default_image(size=(40, 40)):
+        image = pygame.Surface(size, pygame.SRCALPHA); pygame.draw.circle(image, RED, (size[0]//2, size[1]//2), size[0]//2)
+        return image
 
     def update(self):
         self.rect.x += self.speedx; self.rect.y += self.speedy
         # 화면 밖으로 나가면 제거
         if self.rect.top > SCREEN_HEIGHT + 10 or self.rect.left < -25 or self.rect.right > SCREEN_WIDTH + 20: self.kill()
     
-class Bullet(pygame.sprite.Sprite):
+class Bullet(PooledSprite):
+    _layer = LAYER_BULLETS
+    hit_shape = HIT_RECT
     def __init__(self, x, y, color, angle_offset=0):
         super().__init__()
+        self.reset(x, y, color, angle_offset)
+
+    # 풀에서 다시 꺼낼 때도 이 메서드로 초기화합니다.
+    def reset(self, x, y, color, angle_offset=0):
+        self.image = self.get_image(color)
+        self.rect = self.image.get_rect(center=(x, y)); self.prev_pos = None
+        self.speed = 10
+        self.speedx, self.speedy = self.velocity(angle_offset, self.speed)
+        self.rect.x += self.speedx; self.rect.y += self.speedy
+
+    @staticmethod
+    def velocity(angle_offset=0, speed=10):
+        angle_rad = math.radians(-90 + angle_offset) # 위로 발사
+        return speed * math.cos(angle_rad), speed * math.sin(angle_rad)
+
+    # 총알 이미지 (투사체 엔진과 공유)
+    @staticmethod
+    def get_image(color):
         bullet_size = (15, 30) # 원하는 총알 이미지 크기 (bullet.png 크기에 맞춰 조절 가능)
 
         # bullet.png 이미지를 로드합니다. 파일이 없으면 기존 사각형으로 Fallback
-        self.image = load_image('bullet.png', bullet_size) # sprites.py의 load_image 함수 사용
-        if self.image.get_width() == 0: # 이미지 로드 실패 시, 기본 사각형으로 대체
-            self.image = pygame.Surface(bullet_size, pygame.SRCALPHA)
-            self.image.fill(color) # 원래 총알의 색상 유지
+        image = load_image('bullet.png', bullet_size) # 에셋 레지스트리에서 공유 이미지를 가져옴 (디스크 읽기는 최초 1회)
+        if image.get_width() == 0: # 이미지 로드 실패 시, 기본 사각형으로 대체
+            image = assets.fallback(('bullet', bullet_size, color), lambda: Bullet.build_default_image(bullet_size, color)) # 원래 총알의 색상 유지
+        return image
 
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = 10
-        angle_rad = math.radians(-90 + angle_offset) # 위로 발사
-        self.speedx, self.speedy = self.speed * math.cos(angle_rad), self.speed * math.sin(angle_rad)
+    def update(self): # 시뮬레이션 스텝마다 이동
         self.rect.x += self.speedx; self.rect.y += self.speedy
-        if self.rect.bottom < 0: self.kill() # 화면 위로 나가면 제거
+        if self.rect.bottom < 0 or self.rect.right < 0 or self.rect.left > SCREEN_WIDTH: self.kill() # 화면 밖으로 나가면 제거
+
+    @staticmethod
+    def build_default_image(size, color):
+        image = pygame.Surface(size, pygame.SRCALPHA); image.fill(color)
+        return image
 
-class MobBullet(pygame.sprite.Sprite):
+class MobBullet(PooledSprite):
+    _layer = LAYER_BULLETS
+    hit_shape = HIT_CIRCLE
     def __init__(self, game, x, y, target=None, speed=6): # game 인자 추가
         super().__init__(); self.game = game # game 객체 저장
-        self.image = pygame.Surface((15, 15), pygame.SRCALPHA); pygame.draw.circle(self.image, PURPLE, (8, 8), 7)
-        self.rect = self.image.get_rect(center=(x, y)); self.radius, self.speed = 7, speed
-        
-        # 플레이어를 향해 발사 (없으면 아래로)
-        if target and target.alive(): angle_rad = math.atan2(target.rect.centery - self.rect.centery, target.rect.centerx - self.rect.centerx)
+        self.image = self.get_image() # 모든 적 총알이 같은 Surface 공유
+        self.reset(x, y, target, speed)
+
+    # velocity(가로, 세로)를 주면 target/speed 대신 그 속도를 그대로 사용 (보스 탄막 패턴)
+    def reset(self, x, y, target=None, speed=6, velocity=None):
+        self.rect = self.image.get_rect(center=(x, y)); self.radius, self.speed = self.RADIUS, speed; self.prev_pos = None
+        self.speedx, self.speedy = velocity if velocity is not None else self.velocity(self.rect.center, target, self.speed)
+
+    RADIUS = 7
+
+    # 플레이어를 향해 발사 (없으면 아래로)
+    @staticmethod
+    def velocity(origin, target=None, speed=6):
+        if target and target.alive(): angle_rad = math.atan2(target.rect.centery - origin[1], target.rect.centerx - origin[0])
         else: angle_rad = math.radians(90) # 기본적으로 아래로
-        self.speedx, self.speedy = self.speed * math.cos(angle_rad), self.speed * math.sin(angle_rad)
+        return speed * math.cos(angle_rad), speed * math.sin(angle_rad)
+
+    @staticmethod
+    def get_image(): return assets.fallback(('mob_bullet', (15, 15)), MobBullet.build_default_image)
+
+    @staticmethod
+    def build_default_image():
+        image = pygame.Surface((15, 15), pygame.SRCALPHA); pygame.draw.circle(image, PURPLE, (8, 8), 7)
+        return image
+
     def update(self):
         self.rect.x += self.speedx; self.rect.y += self.speedy
-        # 화면 밖으로 나가면 제거
-        if not self.rect.colliderect(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT).inflate(50,50)): self.kill()
+        # 화면을 사방 25px 넓힌 영역을 벗어나면 제거 (ProjectileSystem.step과 같은 조건, 매 프레임 Rect를 만들지 않음)
+        rect = self.rect
+        if rect.right <= -25 or rect.left >= SCREEN_WIDTH + 25 or rect.bottom <= -25 or rect.top >= SCREEN_HEIGHT + 25: self.kill()
 
 
 class Powerup(pygame.sprite.Sprite):
+    _layer = LAYER_POWERUPS
+    hit_shape = HIT_RECT
+    # 아이템 종류 -> game.ensure_loaded에서 로드된 이미지 속성 이름
+    IMAGE_ATTRS = {'shield': 'shield_img', 'gun': 'twin_shot_img', 'speed': 'speed_img', 'hp': 'hp_img', 'bomb': 'bomb_img', 'magnet': 'magnet_img'}
+
     def __init__(self, game, center): # game 인자 추가
         super().__init__(); self.game = game # game 객체 저장
-        self.type = random.choice(['shield', 'gun', 'speed', 'hp', 'bomb', 'magnet'])
-        size = (30,30) # 기본 크기
-
-        # game.load_data에서 이미 로드된 이미지를 활용 (혹은 Fallback)
-        image_map = {
-            'shield': self.game.shield_img,
-            'gun': self.game.twin_shot_img,
-            'speed': self.game.speed_img,
-            'hp': self.game.hp_img,
-            'bomb': self.game.bomb_img,
-            'magnet': self.game.magnet_img
-        }
-        self.image = image_map.get(self.type)
-        if self.image is None or self.image.get_width() == 0: # 이미지 로드 실패 시 Fallback
-            self.image = self.generate_fallback_image(size)
-
+        self.type = self.game.rng.choice(['shield', 'gun', 'speed', 'hp', 'bomb', 'magnet'])
+        self.image = Powerup.get_image(game, self.type)
         self.rect = self.image.get_rect(center=center); self.speedy, self.speedx = 5, 0
 
+    # 아이템 종류의 이미지 (로드된 이미지를 활용하고, 없으면 종류별로 한 번만 만든 Fallback). 게임 방법 화면의 아이콘도 이 이미지를 사용
+    @staticmethod
+    def get_image(game, kind, size=(30, 30)):
+        image = getattr(game, Powerup.IMAGE_ATTRS[kind], None)
+        if image is None or image.get_width() == 0: # 이미지 로드 실패 시 Fallback
+            image = assets.fallback(('powerup', kind, size), lambda: Powerup.generate_fallback_image(kind, size))
+        return image
+
     # Fallback 이미지를 생성하는 메서드
-    def generate_fallback_image(self, size):
+    @staticmethod
+    def generate_fallback_image(kind, size):
         fallback_surf = pygame.Surface(size, pygame.SRCALPHA)
-        if self.type == 'shield': # 쉴드
+        if kind == 'shield': # 쉴드
             pygame.draw.circle(fallback_surf, GREEN, (size[0]//2, size[1]//2), size[0]//2 - 2, 2)
             pygame.draw.circle(fallback_surf, GREEN, (size[0]//2, size[1]//2), size[0]//2 - 7, 2)
-        elif self.type == 'gun': # 총알 강화
+        elif kind == 'gun': # 총알 강화
             pygame.draw.rect(fallback_surf, BLUE, (5,10,20,10))
             pygame.draw.rect(fallback_surf, BLUE, (10,5,10,20))
-        elif self.type == 'speed': # 속도 증가
+        elif kind == 'speed': # 속도 증가
             pygame.draw.polygon(fallback_surf, WHITE, [(size[0]//2,0),(0,size[1]),(size[0],size[1])])
-        elif self.type == 'hp': # 체력 회복
+        elif kind == 'hp': # 체력 회복
             pygame.draw.circle(fallback_surf, RED, (size[0]//2 - 5, size[1]//2 - 5), size[0]//4)
             pygame.draw.circle(fallback_surf, RED, (size[0]//2 + 5, size[1]//2 - 5), size[0]//4)
             pygame.draw.polygon(fallback_surf, RED, [(size[0]//4,size[1]//2-2),(size[0]*3//4,size[1]//2-2),(size[0]//2,size[1]*3//4)])
-        elif self.type == 'bomb': # 폭탄 (제공된 bomb.png 사용됨)
+        elif kind == 'bomb': # 폭탄 (제공된 bomb.png 사용됨)
             pygame.draw.circle(fallback_surf, BLACK, (size[0]//2, size[1]//2), size[0]//2 - 2)
             pygame.draw.rect(fallback_surf, YELLOW, (size[0]//2 - 2, 0, 4, 10))
-        elif self.type == 'magnet': # 자석 (제공된 magnet.png 사용됨)
+        elif kind == 'magnet': # 자석 (제공된 magnet.png 사용됨)
             pygame.draw.arc(fallback_surf, BLUE, (5,5,size[0]-10,size[1]-10), math.pi, math.pi*2, 5) # U자형 자석
             pygame.draw.line(fallback_surf, BLUE, (5, (size[1]-10)//2 + 5), (5, size[1]-5), 5)
             pygame.draw.line(fallback_surf, BLUE, (size[0]-5, (size[1]-10)//2 + 5), (size[0]-5, size[1]-5), 5)
@@ -230,54 +284,40 @@ class Powerup(pygame.sprite.Sprite):
         if self.rect.top > SCREEN_HEIGHT: self.kill() # 화면 아래로 나가면 제거
 
 
-class Explosion(pygame.sprite.Sprite):
+class Explosion(PooledSprite):
+    _layer = LAYER_EXPLOSIONS
     def __init__(self, game, center, size): # game 인자 추가
-        super().__init__(); self.game = game; self.size = size;
-        
-        # 폭발 애니메이션 로드 또는 Fallback (game.explosion_anim에서 가져옴)
-        if len(self.game.explosion_anim[self.size]) == 0 or self.game.explosion_anim[self.size][0].get_width() == 0:
-            self.fallback_active = True
-            # 폭발 애니메이션 이미지가 없는 경우, 동그란 도형으로 Fallback 생성
-            self.fallback_frames = []
-            for i in range(9):
-                img = pygame.Surface((i*15 + 30, i*15 + 30), pygame.SRCALPHA)
-                pygame.draw.circle(img, YELLOW, (img.get_width()//2, img.get_height()//2), i*7 + 15)
-                self.fallback_frames.append(img)
-            self.image = self.fallback_frames[0]
-        else:
-            self.fallback_active = False
-            self.image = self.game.explosion_anim[self.size][0]
+        super().__init__(); self.game = game
+        self.reset(center, size)
 
-        self.rect = self.image.get_rect(center=center)
-        self.frame, self.last_update, self.frame_rate = 0, pygame.time.get_ticks(), 75
+    def reset(self, center, size):
+        self.size = size
+        # 크기 종류별로 미리 만들어 둔 공유 프레임 사용 (인스턴스마다 Surface를 만들지 않음)
+        self.frames = self.game.explosion_anim.get(size) or assets.explosion_frames(size)
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect(center=center); self.prev_pos = None
+        self.frame, self.last_update, self.frame_rate = 0, self.game.sim_clock.get_ticks(), 75
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = self.game.sim_clock.get_ticks()
         if now - self.last_update > self.frame_rate:
             self.last_update, self.frame = now, self.frame + 1
-            if (self.fallback_active and self.frame == len(self.fallback_frames)) or \
-               (not self.fallback_active and self.frame == len(self.game.explosion_anim[self.size])):
-                self.kill() # 애니메이션이 끝나면 제거
+            if self.frame == len(self.frames): self.kill() # 애니메이션이 끝나면 제거
             else:
-                if self.fallback_active: self.image = self.fallback_frames[self.frame]
-                else: self.image = self.game.explosion_anim[self.size][self.frame]
+                self.image = self.frames[self.frame]
                 self.rect = self.image.get_rect(center=self.rect.center)
 
 # sprites.py 파일의 맨 아래, 다른 클래스들 다음에 이 코드를 추가하세요.
 
 class Boss(pygame.sprite.Sprite):
+    _layer = LAYER_MOBS
+    hit_shape = HIT_MASK # 200x150 rect 전체가 아니라 보스 그림 모양으로 판정
     def __init__(self, game):
         super().__init__()
         self.game = game
         self.image = self.game.boss_img  # main.py에서 로드된 보스 이미지 사용
         if self.image.get_width() == 0:  # 이미지 없으면 Fallback 도형 생성
-            size = (200, 150) # 보스 기본 크기
-            self.image = pygame.Surface(size, pygame.SRCALPHA)
-            # Fallback 보스 그리기 (색상 및 모양 조정)
-            pygame.draw.circle(self.image, (100, 0, 100), (size[0] // 2, size[1] // 2), size[0] // 2 - 10)
-            pygame.draw.circle(self.image, (200, 0, 200), (size[0] // 2 - 40, size[1] // 2 - 30), 15) # 왼쪽 눈
-            pygame.draw.circle(self.image, (200, 0, 200), (size[0] // 2 + 40, size[1] // 2 - 30), 15) # 오른쪽 눈
-            pygame.draw.arc(self.image, (200, 0, 200), (size[0] // 2 - 50, size[1] // 2 + 20, 100, 50), math.pi, 0, 5) # 입
+            self.image = assets.fallback(('boss', (200, 150)), self.build_default_image)
 
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH / 2, -100)) # 화면 상단 밖에서 시작
         self.hp = 200 # 보스 체력 (원하는 값으로 조절)
@@ -285,8 +325,17 @@ class Boss(pygame.sprite.Sprite):
         self.speedy = 1 # 등장 속도
         self.speedx = 2 # 좌우 이동 속도
         self.is_active = False # 화면에 완전히 등장하기 전까지는 공격하지 않음
-        self.shoot_delay = 800 # 보스 총알 발사 딜레이 (ms)
-        self.last_shot_time = pygame.time.get_ticks()
+        self.patterns = BulletPatterns(self, stress=self.game.stress) # HP 비율에 따라 페이즈가 바뀌는 탄막 패턴
+
+    @staticmethod
+    def build_default_image(size=(200, 150)): # 보스 기본 크기
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        # Fallback 보스 그리기 (색상 및 모양 조정)
+        pygame.draw.circle(image, (100, 0, 100), (size[0] // 2, size[1] // 2), size[0] // 2 - 10)
+        pygame.draw.circle(image, (200, 0, 200), (size[0] // 2 - 40, size[1] // 2 - 30), 15) # 왼쪽 눈
+        pygame.draw.circle(image, (200, 0, 200), (size[0] // 2 + 40, size[1] // 2 - 30), 15) # 오른쪽 눈
+        pygame.draw.arc(image, (200, 0, 200), (size[0] // 2 - 50, size[1] // 2 + 20, 100, 50), math.pi, 0, 5) # 입
+        return image
 
     def update(self):
         if not self.is_active: # 화면에 등장하는 중
@@ -300,15 +349,8 @@ class Boss(pygame.sprite.Sprite):
             if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
                 self.speedx *= -1 # 벽에 닿으면 반대 방향으로 이동
 
-            # 총알 발사
-            now = pygame.time.get_ticks()
-            if now - self.last_shot_time > self.shoot_delay:
-                self.last_shot_time = now
-                # 보스 총알 스폰 로직 (두 발 동시 발사)
-                self.game.spawn_mob_bullet(self.rect.centerx - 50, self.rect.bottom - 20, self.game.player)
-                self.game.spawn_mob_bullet(self.rect.centerx + 50, self.rect.bottom - 20, self.game.player)
-                if self.game.enemy_shoot_sound: # 사운드 존재 여부 확인
-                    self.game.enemy_shoot_sound.play()
+            # 총알 발사 (이번 스텝에 발사할 패턴의 총알을 한 번에 추가)
+            self.patterns.update(self.game.sim_clock.get_ticks())
 
         # 보스 체력 바 그리기 (보스 스프라이트 위에 직접 그림)
         if self.is_active and self.hp > 0: # 보스가 활성화되고 살아있을 때만 그립니다.
@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+import pytest
+
+# 게임 모듈은 상위 폴더에 평평하게 있고, 이미지/사운드도 실행 폴더 기준으로 찾으므로 그 폴더를 기준으로 테스트합니다.
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_DIR)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy'); os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+@pytest.fixture(autouse=True)
+def game_dir(monkeypatch):
+    monkeypatch.chdir(GAME_DIR)
+    pygame.init()
+    return GAME_DIR
+
+# --- 충돌 테스트용 시드 고정 배치 ---
+class Target(pygame.sprite.Sprite):
+    def __init__(self, image, center, shape):
+        super().__init__()
+        self.image, self.rect, self.hit_shape = image, image.get_rect(center=center), shape
+        self.radius = int(self.rect.width * .85 / 2)
+
+class Shot(pygame.sprite.Sprite):
+    def __init__(self, image, topleft):
+        super().__init__()
+        self.image, self.rect = image, image.get_rect(topleft=topleft)
+
+def circle_image(size):
+    image = pygame.Surface((size, size), pygame.SRCALPHA); pygame.draw.circle(image, (255, 0, 0), (size // 2, size // 2), size // 2)
+    return image
+
+# (몹 목록, 총알 이미지, 총알 topleft 목록)을 만드는 함수. 몹은 크기 3종, 히트 모양 3종(rect/원/마스크)이 섞여 있습니다.
+@pytest.fixture
+def collision_scene():
+    from hitshapes import HIT_RECT, HIT_CIRCLE, HIT_MASK
+    def make(seed, mobs=40, shots=300):
+        rng = random.Random(seed)
+        images = {size: circle_image(size) for size in (30, 40, 56)}
+        targets = [Target(images[rng.choice(list(images))], (rng.randrange(800), rng.randrange(600)), rng.choice((HIT_RECT, HIT_CIRCLE, HIT_MASK)))
+                   for _ in range(mobs)]
+        positions = [(rng.randrange(-10, 800), rng.randrange(-20, 600)) for _ in range(shots)]
+        return targets, pygame.Surface((5, 15)), positions
+    return make
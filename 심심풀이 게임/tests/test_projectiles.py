@@ -0,0 +1,22 @@
+import pygame
+import pytest
+from conftest import Shot
+from hitshapes import collide
+from projectiles import ProjectileSystem, OWNER_PLAYER, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="NumPy가 없으면 투사체 엔진을 쓰지 않음")
+
+# ProjectileSystem.collide_mobs가 스프라이트 경로(pygame.sprite.groupcollide)와 같은 {몹: 맞은 총알 수}를 내는지 확인합니다.
+@pytest.mark.parametrize('seed', range(5))
+def test_collide_mobs_matches_sprites(collision_scene, seed):
+    targets, shot_image, positions = collision_scene(seed)
+    shots = pygame.sprite.Group(Shot(shot_image, p) for p in positions)
+    expected = pygame.sprite.groupcollide(pygame.sprite.Group(targets), shots, False, True, collide)
+    assert expected
+    engine = ProjectileSystem(16)
+    w, h = shot_image.get_size()
+    engine.spawn_many([x + w // 2 for x, _ in positions], [y + h // 2 for _, y in positions], 0, 0, shot_image, OWNER_PLAYER)
+    hits = engine.collide_mobs(pygame.sprite.Group(targets))
+    assert hits == {t: len(v) for t, v in expected.items()}
+    assert list(hits) == list(expected) # 몹 그룹 순서 유지
+    assert engine.count == len(shots) # 맞은 총알만 제거됨
@@ -0,0 +1,21 @@
+import random
+import pytest
+from main import Game
+from input_sources import RandomInput
+from replay import Replay, ReplayInput
+
+# 시드 고정 헤드리스 게임을 기록한 뒤 재생하면 상태 체크섬이 같아야 합니다.
+# 기록과 재생 사이에 전역 random 상태를 다르게 두어, 게임 로직이 Game.rng 대신 전역 random을 쓰면 실패하도록 합니다.
+@pytest.mark.parametrize('seed', [1, 7])
+def test_replay_reproduces_recorded_game(tmp_path, seed):
+    path = str(tmp_path / 'replay.json')
+    random.seed(1000 + seed)
+    game = Game(headless=True, input_source=RandomInput(seed, bomb_chance=0.05), seed=seed, record=path)
+    recorded = game.run_headless(3000, restart=False)
+
+    replay = Replay.load(path)
+    assert replay.seed == game.seed and replay.checksum == recorded['checksum']
+    random.seed(2000 + seed)
+    replayed = Game(headless=True, input_source=ReplayInput(replay)).run_headless(replay.frames, restart=False, seed=replay.seed)
+    assert replayed['frames'] == replay.frames
+    assert replayed['checksum'] == replay.checksum
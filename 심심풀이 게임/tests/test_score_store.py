@@ -0,0 +1,43 @@
+import os
+import pytest
+from score_store import ScoreStore
+
+# 기록 파일/인덱스/예전 highscore.txt는 모두 tmp_path 안에서만 만듭니다. (HIGHSCORE_FILE은 실행 폴더 기준)
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / 'scores.log'), str(tmp_path / 'scores_index.json')
+
+def test_rebuilds_index_from_log(paths):
+    log, index = paths
+    store = ScoreStore(log, index, top_n=3)
+    for score, stage in [(120, 1), (900, 2), (300, 1), (900, 3), (50, 1)]: store.submit(score, stage, 10.0, 42)
+    store.close()
+    with open(log, 'a', encoding='utf-8') as f: f.write('777\t2\t1.0') # 쓰다 끊긴 마지막 줄
+    os.remove(index)
+
+    store = ScoreStore(log, index, top_n=3)
+    assert store.best() == 900
+    assert [(r[0], r[1]) for r in store.top] == [(900, 2), (900, 3), (300, 1)] # 같은 점수는 먼저 기록된 것이 위
+    assert store.count == 5
+    assert os.path.isfile(index)
+    store.submit(400, 2); store.close() # 끊긴 줄은 닫혀 있어 새 기록과 섞이지 않음
+
+    store = ScoreStore(log, index, top_n=3)
+    assert [r[0] for r in store.top] == [900, 900, 400] and store.count == 6
+    os.remove(index)
+    assert ScoreStore(log, index, top_n=3).count == 6
+
+def test_migrates_legacy_highscore_once(paths):
+    log, index = paths
+    with open('highscore.txt', 'w', encoding='utf-8') as f: f.write('1500')
+    store = ScoreStore(log, index)
+    assert store.best() == 1500 and store.count == 1
+    store.close()
+
+    for reopen_without_index in (False, True): # 인덱스가 있을 때도, 기록 파일에서 다시 만들 때도 다시 옮기지 않음
+        if reopen_without_index: os.remove(index)
+        store = ScoreStore(log, index)
+        assert store.best() == 1500 and store.count == 1
+        store.close()
+    with open(log, encoding='utf-8') as f: assert len(f.readlines()) == 1
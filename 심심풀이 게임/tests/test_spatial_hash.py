@@ -0,0 +1,18 @@
+import pygame
+import pytest
+from conftest import Shot
+from hitshapes import collide
+from spatial_hash import SpatialHash
+
+# SpatialHash.groupcollide가 pygame.sprite.groupcollide와 같은 충돌 결과(먼저 검사한 몹이 총알을 가져감)를 내는지 확인합니다.
+@pytest.mark.parametrize('seed', range(5))
+def test_groupcollide_matches_pygame(collision_scene, seed):
+    targets, shot_image, positions = collision_scene(seed)
+    expected_shots = pygame.sprite.Group(Shot(shot_image, p) for p in positions)
+    shots = pygame.sprite.Group(Shot(shot_image, p) for p in positions)
+    expected = pygame.sprite.groupcollide(pygame.sprite.Group(targets), expected_shots, False, True, collide)
+    assert expected # 배치가 충돌을 실제로 만들어 내는지
+    grid = SpatialHash(); grid.build(shots)
+    hits = grid.groupcollide(pygame.sprite.Group(targets), True, collide)
+    assert {t: [s.rect.topleft for s in v] for t, v in hits.items()} == {t: [s.rect.topleft for s in v] for t, v in expected.items()}
+    assert len(shots) == len(expected_shots)
@@ -1,7 +1,43 @@
 import pygame
+from collections import OrderedDict
 from settings import * # settings.py에서 정의된 색상 상수를 사용합니다.
 
+# --- 텍스트 렌더링 캐시 ---
+# Font 객체는 크기별로 한 번만 만들고, 렌더링된 텍스트(+그림자) Surface는 LRU로 보관합니다.
+# 같은 (텍스트, 크기, 색상, 그림자) 조합은 다시 render 하지 않으므로 값이 바뀔 때만 새로 그려집니다.
+class TextCache:
+    def __init__(self, font_name, max_entries=TEXT_CACHE_SIZE):
+        self.font_name = font_name
+        self.max_entries = max_entries
+        self.fonts = {} # 크기 -> pygame.font.Font
+        self.surfaces = OrderedDict() # (text, size, color, shadow) -> (text_surf, shadow_surf)
+        self.hits, self.misses = 0, 0 # 캐시 적중/미스 횟수 (프로파일링용)
+
+    def get_font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(self.font_name, size)
+        return font
+
+    def render(self, text, size, color, shadow=False):
+        key = (text, size, color, shadow)
+        entry = self.surfaces.get(key)
+        if entry is not None:
+            self.surfaces.move_to_end(key); self.hits += 1
+            return entry
+        self.misses += 1
+        font = self.get_font(size)
+        entry = (font.render(text, True, color), font.render(text, True, SHADOW) if shadow else None)
+        self.surfaces[key] = entry
+        if len(self.surfaces) > self.max_entries: self.surfaces.popitem(last=False) # 가장 오래 안 쓴 항목 제거
+        return entry
+
+    def clear(self):
+        self.surfaces.clear()
+
 # --- UI 버튼 클래스 (디자인 개선) ---
+# 보통/마우스 오버 상태의 모습(본체 + 글자 그림자 + 글자)을 처음 그릴 때 Surface로 한 번씩만 만들어 두고, 이후에는 blit만 합니다.
+# 글자, 글꼴, 크기가 바뀌면 다음 draw에서 다시 만듭니다.
 class Button:
     def __init__(self, x, y, width, height, text, font, normal_color, hover_color, text_color, border_radius=12, shadow_offset=4):
         self.rect = pygame.Rect(x, y, width, height)
@@ -11,20 +47,29 @@ class Button:
         self.border_radius = border_radius
         self.shadow_offset = shadow_offset
         self.shadow_color = (30, 30, 30, 150) # 버튼 그림자 색상 (투명도 추가)
+        self.surfaces, self.surfaces_key = {}, None # 배경 색상 -> 미리 그린 버튼 Surface, 만들 때의 (글자, 글꼴, 크기)
 
-    def draw(self, surf):
+    def render_state(self, color):
+        button_surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local_rect = button_surf.get_rect()
         # 버튼 본체 그리기
-        pygame.draw.rect(surf, self.current_color, self.rect, border_radius=self.border_radius)
+        pygame.draw.rect(button_surf, color, local_rect, border_radius=self.border_radius)
         
         # 텍스트 그림자
         text_surf = self.font.render(self.text, True, SHADOW) # settings.py의 SHADOW 사용
-        text_rect = text_surf.get_rect(center=(self.rect.centerx + 2, self.rect.centery + 2))
-        surf.blit(text_surf, text_rect)
+        button_surf.blit(text_surf, text_surf.get_rect(center=(local_rect.centerx + 2, local_rect.centery + 2)))
         
         # 텍스트
         text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        surf.blit(text_surf, text_rect)
+        button_surf.blit(text_surf, text_surf.get_rect(center=local_rect.center))
+        return button_surf.convert_alpha() if pygame.display.get_surface() is not None else button_surf
+
+    def draw(self, surf):
+        key = (self.text, self.font, self.rect.size)
+        if key != self.surfaces_key: self.surfaces, self.surfaces_key = {}, key # 글자/글꼴/크기가 바뀌면 다시 만듦
+        button_surf = self.surfaces.get(self.current_color)
+        if button_surf is None: button_surf = self.surfaces[self.current_color] = self.render_state(self.current_color)
+        return surf.blit(button_surf, self.rect) # 그린 영역
 
     def is_hovered(self, mouse_pos): return self.rect.collidepoint(mouse_pos)
     def update_color(self, mouse_pos): self.current_color = self.hover_color if self.is_hovered(mouse_pos) else self.normal_color
@@ -0,0 +1,79 @@
+from settings import * # settings.py의 상수들을 사용합니다.
+from sprites import Mob
+
+# --- 웨이브 스케줄러 ---
+# 스테이지 표(STAGES)에 따라 몹 웨이브를 내보냅니다. 웨이브는 보스가 나올 때까지 순서대로 반복됩니다.
+# 웨이브의 몹은 한 웨이브 앞서 미리 만들어 두고(Mob 생성, 대형 위치 계산), 때가 되면 묶음(batch) 단위로 그룹에 한 번에 추가합니다.
+# 따라서 수백 마리가 나오는 웨이브도 스폰하는 스텝에서는 그룹에 넣는 일만 합니다.
+# 몹 위치/속도는 모두 Game.rng를 사용하므로 리플레이에서도 같은 웨이브가 나옵니다.
+FORMATION_SPACING = 50 # 대형에서 몹 사이 간격 (px)
+
+class WaveScheduler:
+    def __init__(self, game):
+        self.game = game
+        self.start_stage(1)
+
+    # 스테이지 n을 시작합니다. STAGES보다 큰 스테이지는 마지막 스테이지 표를 반복 사용합니다.
+    def start_stage(self, n):
+        g = self.game
+        self.boss_points, g.max_mobs, self.waves = STAGES[min(n, len(STAGES)) - 1]
+        g.stage, self.stage_start_score = n, g.score
+        self.wave_index = -1
+        self.batches, self.interval = [], 0 # 현재 웨이브에서 아직 내보내지 않은 묶음들 (뒤에서부터 꺼냄)
+        self.next_batches = None # 미리 만들어 둔 다음 웨이브
+        self.next_time = g.sim_clock.get_ticks()
+        self._next_wave()
+
+    # 보스가 나올 점수에 도달했는지
+    def boss_due(self): return self.game.score - self.stage_start_score >= self.boss_points
+
+    def _next_wave(self):
+        self.wave_index = (self.wave_index + 1) % len(self.waves)
+        formation, kind, count, batch, interval, delay = self.waves[self.wave_index]
+        self.batches = self.next_batches if self.next_batches is not None else self._build(self.wave_index)
+        self.interval = interval
+        self.next_time += delay
+        self.next_batches = self._build((self.wave_index + 1) % len(self.waves)) # 다음 웨이브를 미리 만들어 둠
+
+    # 웨이브 하나의 몹을 모두 만들고 묶음으로 나눕니다. (내보내는 순서의 역순으로 저장)
+    def _build(self, index):
+        formation, kind, count, batch, interval, delay = self.waves[index]
+        mobs = self.formation(formation, kind, count)
+        batches = [mobs[i:i + batch] for i in range(0, count, batch)]
+        batches.reverse()
+        return batches
+
+    def formation(self, formation, kind, count):
+        g = self.game
+        if formation == 'random': return [Mob(g, kind) for _ in range(count)]
+        rng = g.rng
+        size = MOB_TYPES[kind][1]
+        speedy_range, speedx_range = MOB_TYPES[kind][2], MOB_TYPES[kind][3]
+        speed = (0, rng.randrange(*speedy_range)) # 대형이 흩어지지 않도록 모두 같은 속도로 똑바로 내려옴
+        if formation == 'line':
+            step = (SCREEN_WIDTH - 80) / max(1, count - 1)
+            centers = [(40 + step * i if count > 1 else SCREEN_WIDTH / 2, -size[1]) for i in range(count)]
+        elif formation == 'v':
+            mid = (count - 1) / 2
+            spacing = min(FORMATION_SPACING, (SCREEN_WIDTH / 2 - 40) / max(1, mid))
+            half = round(mid * spacing) # V자 전체가 화면 안에 들어가도록 중심 범위를 정함
+            cx = rng.randrange(40 + half, SCREEN_WIDTH - 40 - half + 1)
+            centers = [(cx + (i - mid) * spacing, -size[1] - abs(i - mid) * FORMATION_SPACING) for i in range(count)]
+        else: # 'column'
+            cx = rng.randrange(40, SCREEN_WIDTH - 40)
+            centers = [(cx, -size[1] - i * FORMATION_SPACING) for i in range(count)]
+            speed = (rng.randrange(*speedx_range), speed[1]) # 세로 한 줄은 함께 비스듬히 내려와도 모양이 유지됨
+        return [Mob(g, kind, (round(x), round(y)), speed) for x, y in centers]
+
+    # 때가 된 묶음을 그룹에 추가합니다. 묶음 전체가 max_mobs 안에 들어갈 자리가 날 때까지 기다립니다.
+    # (묶음이 max_mobs보다 크면 들어갈 만큼만 내보내고 나머지는 다음 차례에 내보냄)
+    def update(self, now):
+        g = self.game
+        while now >= self.next_time:
+            if not self.batches: self._next_wave(); continue
+            room, batch = g.max_mobs - len(g.mobs), self.batches[-1]
+            if room <= 0 or (len(batch) > room and len(batch) <= g.max_mobs): return
+            if len(batch) > room: self.batches[-1], batch = batch[room:], batch[:room]
+            else: self.batches.pop()
+            g.all_sprites.add(batch); g.mobs.add(batch)
+            self.next_time = now + self.interval